@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Early-Abort Connection Reuse Benchmark
+
+Fetches the XVideos video fixture page repeatedly from the replay server
+with the streaming download of the resolvers (area51/page_stream.py) and
+compares two ways of ending a download the scanner cut off:
+- close: the socket is closed, the next request opens a new connection
+- drain: the unread rest of up to DRAIN_LIMIT bytes is read in the
+  background, the connection goes back to the pool
+
+The page is padded after the player sources to show the trade-off: the
+drained bytes cost bandwidth and keep the connection busy, a new
+connection costs the handshake delay. Fetches follow each other after
+--gap-ms, the time between two resolves (next playback, pre-resolve); a
+fetch starting while the previous connection is still draining opens a
+new one.
+
+Usage:
+    python3 benchmarks/bench_page_stream.py --server-dir /path/to/streamingserver [--handshake-ms 60] [--bandwidth-kbps 8000]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import threading
+from http.server import ThreadingHTTPServer
+
+import requests
+
+import bench_parsers
+from harness import FIXTURE_DIR, FixtureStore
+from replay_server import ReplayConfig, ReplaySite, make_handler
+
+# Site whose video page is fetched
+PROVIDER = "XVideos"
+
+
+def video_url(store: FixtureStore) -> str:
+    """Return the page URL of the first resolve call of the fixtures"""
+    for call in store.manifest["calls"]:
+        if call["call"] == "resolve_url":
+            return call["args"]["url"]
+    raise SystemExit(f"{PROVIDER}: no resolve_url call in the manifest")
+
+
+def run(session: requests.Session, url: str, drain_limit: int, args, scanner_class, stream_text) -> list[float]:
+    timings = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        response = session.get(url, stream=True, timeout=30)
+        stream_text(response, scanner_class(), drain_limit)
+        timings.append((time.perf_counter() - start) * 1000)
+        time.sleep(args.gap_ms / 1000)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server-dir", default=os.environ.get("STREAMINGSERVER_DIR"), help="StreamingServer directory with the host modules")
+    parser.add_argument("--port", type=int, default=8101, help="Port of the replay server")
+    parser.add_argument("--handshake-ms", type=float, default=60, help="Delay on every new connection")
+    parser.add_argument("--latency-ms", type=float, default=30, help="Delay before every response")
+    parser.add_argument("--bandwidth-kbps", type=float, default=8000, help="Body transfer rate per request, 0 = unlimited")
+    parser.add_argument("--pad-kb", default="0,128,256,1024", help="Comma separated KB appended after the player sources")
+    parser.add_argument("--requests", type=int, default=20, help="Fetches per page size and mode (median is reported)")
+    parser.add_argument("--gap-ms", type=float, default=300, help="Pause between two fetches")
+    args = parser.parse_args()
+    if not args.server_dir:
+        parser.error("--server-dir or STREAMINGSERVER_DIR is required")
+
+    bench_parsers.setup_imports(args.server_dir)
+    from providers.area51.page_stream import DRAIN_LIMIT, stream_text
+    from providers.area51.html5player import SourceScanner
+
+    store = FixtureStore(os.path.join(FIXTURE_DIR, PROVIDER))
+    site = ReplaySite(store, args.port)
+    url = video_url(store)
+    entry = store.lookup(url)
+    page, etag = site.body(entry)
+    config = ReplayConfig(argparse.Namespace(
+        latency_ms=args.latency_ms, handshake_ms=args.handshake_ms, jitter_ms=0, bandwidth_kbps=args.bandwidth_kbps,
+        error_rate=0, error_codes="503", seed=None,
+    ))
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(PROVIDER, site, config, quiet=True))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    local_url = url.replace(f"https://{site.site_host}", site.origin)
+
+    print(f"{args.handshake_ms:.0f} ms handshake, {args.latency_ms:.0f} ms latency, {args.bandwidth_kbps:.0f} kbit/s, "
+          f"{args.gap_ms:.0f} ms gap, DRAIN_LIMIT {DRAIN_LIMIT // 1024} KB")
+    print(f"{'page KB':>7} {'mode':6} {'median ms':>9} {'connections':>11}")
+    for pad_kb in (int(value) for value in args.pad_kb.split(",")):
+        padding = b"<!-- " + b"x" * (pad_kb * 1024) + b" -->" if pad_kb else b""
+        site.bodies[entry["file"]] = (page + padding, etag)
+        for mode, drain_limit in (("close", -1), ("drain", DRAIN_LIMIT)):
+            with requests.Session() as session:
+                before = config.connections[PROVIDER]
+                timings = run(session, local_url, drain_limit, args, SourceScanner, stream_text)
+                connections = config.connections[PROVIDER] - before
+            print(f"{(len(page) + len(padding)) // 1024:7d} {mode:6} {statistics.median(timings):9.1f} {connections:11d}")
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
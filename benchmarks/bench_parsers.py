@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+HTML Parser Backend Benchmark
+
+Runs the BeautifulSoup based extraction of the providers with every
+installed parser backend (see area51/soup.py), reports the parse and
+extraction times and checks that all backends extract identical results.
+
+Usage:
+    python3 benchmarks/bench_parsers.py --server-dir /path/to/streamingserver [--repeat N]
+
+--server-dir is the StreamingServer directory with the host modules the
+providers import (debug, auth_utils, constants, ...), it defaults to
+$STREAMINGSERVER_DIR. The pages are the fixtures of harness.py,
+benchmarks/fixtures/<provider>/<kind>-*.html with kind "listing" or "video".
+test_parsers.py runs the same check as a unit test.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import glob
+import time
+import logging
+import argparse
+import statistics
+from types import SimpleNamespace
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROVIDERS_PARENT = os.path.join(ROOT_DIR, "src", "Area-51")
+FIXTURE_DIR = os.path.join(ROOT_DIR, "benchmarks", "fixtures")
+
+
+class FixtureResponse:
+    """Minimal requests response serving a recorded page"""
+
+    def __init__(self, html: str):
+        self.status_code = 200
+        self.text = html
+        self.content = html.encode("utf-8")
+        self.encoding = "utf-8"
+        self.headers = {"Content-Type": "text/html; charset=utf-8"}
+
+    def raise_for_status(self):
+        pass
+
+
+class FixtureSession:
+    """Session answering every request with the same page"""
+
+    def __init__(self, html: str):
+        self.html = html
+
+    def get(self, *_args, **_kwargs) -> FixtureResponse:
+        return FixtureResponse(self.html)
+
+
+def xnxx_listing(html: str):
+    from providers.XNXX.video import Video
+    provider = SimpleNamespace(session=FixtureSession(html), base_url="https://www.xnxx.com/", provider_id="xnxx")
+    # The page itself, get_media_items() would serve the next runs from the page cache
+    return Video(provider)._fetch_page("https://www.xnxx.com/best", 1, "https://www.xnxx.com/best")["videos"]
+
+
+def xnxx_video(html: str):
+    from providers.XNXX.resolver import Resolver
+    resolver = Resolver.__new__(Resolver)  # Only the DOM extraction is run, no fetch
+    resolver.url = "https://www.xnxx.com/video-abc123/title"
+    return resolver._extract_dom_sources(html)
+
+
+def xvideos_listing(html: str):
+    from providers.XVideos.video import VideoManager
+    provider = SimpleNamespace(base_url="https://www.xvideos.com/")
+    return VideoManager(FixtureSession(html), provider)._get_video_list("https://www.xvideos.com/new/1", 1)["videos"]
+
+
+# Page types: (provider, kind) -> extraction using make_soup()
+EXTRACTORS = {
+    ("XNXX", "listing"): xnxx_listing,
+    ("XNXX", "video"): xnxx_video,
+    ("XVideos", "listing"): xvideos_listing,
+}
+
+
+def load_pages() -> list[tuple[str, str, str, str]]:
+    """Return (provider, kind, name, html) for every page to benchmark"""
+    pages = []
+    for provider, kind in EXTRACTORS:
+        for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, provider, f"{kind}-*.html"))):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((provider, kind, os.path.basename(path), f.read()))
+    return pages
+
+
+def setup_imports(server_dir: str):
+    """Make the host modules and the providers package importable"""
+    if server_dir not in sys.path:
+        sys.path[:0] = [server_dir, PROVIDERS_PARENT]
+    logging.disable(logging.CRITICAL)
+
+
+def median_ms(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server-dir", default=os.environ.get("STREAMINGSERVER_DIR"), help="StreamingServer directory with the host modules")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per page and backend (median is reported)")
+    args = parser.parse_args()
+    if not args.server_dir:
+        parser.error("--server-dir or STREAMINGSERVER_DIR is required")
+
+    setup_imports(args.server_dir)
+    from providers.area51 import soup
+
+    backends = soup.available_backends()
+    print("Installed backends:", ", ".join(backends))
+    print(f"{'page':36} {'KB':>5} {'backend':12} {'parse ms':>9} {'extract ms':>10} {'items':>5} result")
+    failures = 0
+    for provider, kind, name, html in load_pages():
+        extractor = EXTRACTORS[(provider, kind)]
+        reference = None
+        for backend in reversed(backends):  # html.parser first, it is the reference
+            soup.PARSER_BACKEND = backend
+            parse_ms = median_ms(lambda: soup.make_soup(html), args.repeat)
+            extract_ms = median_ms(lambda: extractor(html), args.repeat)
+            result = extractor(html)
+            if reference is None:
+                reference, verdict = result, "reference"
+            elif result == reference:
+                verdict = "identical"
+            else:
+                verdict = "DIFFERENT"
+                failures += 1
+            print(f"{provider + '/' + kind + ' ' + name:36.36} {len(html) / 1024:5.0f} {backend:12} {parse_ms:9.2f} {extract_ms:10.2f} {len(result):5d} {verdict}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
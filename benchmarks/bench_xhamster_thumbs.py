@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+xHamster Listing Parse Benchmark
+
+Compares the former DOTALL regex extraction of xHamster/video.py
+_get_video_list() with the single-pass thumb parser (xHamster/thumbs.py) on
+listing pages, and counts the items each found with a title and a duration.
+
+Usage:
+    python3 benchmarks/bench_xhamster_thumbs.py [page.html ...] [--repeat N]
+
+Without arguments the listing pages of the benchmark fixtures are used
+(benchmarks/fixtures/xHamster/listing-*.html, see README.md), record them
+with harness.py record to benchmark the live markup.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+import statistics
+import importlib.util
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THUMBS_PATH = os.path.join(ROOT_DIR, "src", "Area-51", "providers", "xHamster", "thumbs.py")
+FIXTURE_GLOB = os.path.join(ROOT_DIR, "benchmarks", "fixtures", "xHamster", "listing-*.html")
+
+
+def load_thumbs():
+    """Load thumbs.py standalone, the provider package needs the StreamingServer modules"""
+    spec = importlib.util.spec_from_file_location("xhamster_thumbs", THUMBS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Former extraction of _get_video_list(), kept as the baseline
+LEGACY_CONTAINER_PATTERNS = [
+    r'<div[^>]*class="[^"]*thumb-list__item[^"]*"[^>]*>(.*?)</div>',
+    r'<div[^>]*class="[^"]*thumb[^"]*"[^>]*>(.*?)</div>',
+    r'<article[^>]*class="[^"]*thumb[^"]*"[^>]*>(.*?)</article>',
+    r'<div[^>]*class="[^"]*video-thumb[^"]*"[^>]*>(.*?)</div>',
+    r'<div[^>]*class="[^"]*thumb-list-item[^"]*"[^>]*>(.*?)</div>',
+]
+LEGACY_URL_PATTERNS = [
+    r'<a[^>]*href=[\'"]((?:https?://)?[^\'"\s]*(?:xhamster\.com)?[^\'"\s]*/videos/[^\'"\s]+)[\'"][^>]*>',
+    r'href=[\'"](/videos/[^\'"\s]+)[\'"]',
+    r'href=[\'"](https?://[^\'"\s]*xhamster[^\'"\s]*/videos/[^\'"\s]+)[\'"]',
+    r'data-video-url=[\'"](.*?)[\'"]',
+]
+LEGACY_TITLE_PATTERNS = [
+    r'title=[\'"](.*?)[\'"]',
+    r'alt=[\'"](.*?)[\'"]',
+    r'<a[^>]*>[^<]*<[^>]*>[^<]*</[^>]*>([^<]+)</a>',
+    r'<a[^>]*>([^<]+)</a>',
+    r'<(?:span|div)[^>]*(?:class="[^"]*title[^"]*"|title)[^>]*>([^<]+)</(?:span|div)>',
+    r'data-title=[\'"](.*?)[\'"]',
+]
+LEGACY_THUMBNAIL_PATTERN = r'(?:data-src|src)=[\'"](https?://[^\'"\s]+\.(?:jpg|jpeg|png|webp)[^\'"\s]*)[\'"]'
+LEGACY_DURATION_PATTERNS = [
+    r'(?:duration[\'"][^>]*>|<span[^>]*duration[^>]*>)([0-9:]+)',
+    r'<(?:span|div)[^>]*class="[^"]*duration[^"]*"[^>]*>([0-9:]+)',
+    r'data-duration=[\'"](.*?)[\'"]',
+    r'([0-9]+:[0-9:]+)',
+]
+
+
+def legacy_extract(html: str) -> list[dict[str, str]]:
+    """Regex extraction as done before the thumb parser (without the filtering)"""
+    for pattern in LEGACY_CONTAINER_PATTERNS:
+        items = []
+        for match in re.finditer(pattern, html, re.DOTALL | re.IGNORECASE):
+            video_html = match.group(1)
+            url_match = None
+            for url_pattern in LEGACY_URL_PATTERNS:
+                url_match = re.search(url_pattern, video_html, re.IGNORECASE)
+                if url_match:
+                    break
+            if not url_match:
+                continue
+            title = ""
+            for title_pattern in LEGACY_TITLE_PATTERNS:
+                title_match = re.search(title_pattern, video_html, re.IGNORECASE)
+                if title_match:
+                    candidate = title_match.group(1).strip()
+                    if len(candidate) > 5 and candidate.lower() not in ("video", "watch", "click"):
+                        title = candidate
+                        break
+            img_match = re.search(LEGACY_THUMBNAIL_PATTERN, video_html, re.IGNORECASE)
+            duration = ""
+            for duration_pattern in LEGACY_DURATION_PATTERNS:
+                duration_match = re.search(duration_pattern, video_html, re.IGNORECASE)
+                if duration_match:
+                    duration = duration_match.group(1).strip()
+                    break
+            items.append({
+                "url": url_match.group(1),
+                "title": title,
+                "thumbnail": img_match.group(1) if img_match else "",
+                "duration": duration,
+            })
+        if items:
+            return items
+    return []
+
+
+def measure(function, html: str, repeat: int) -> tuple[float, list[dict[str, str]]]:
+    """Return median run time in milliseconds and the result of the last run"""
+    timings = []
+    result = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(html)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", help="Listing pages (default: benchmarks/fixtures/xHamster/listing-*.html)")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per page and extractor (median is reported)")
+    args = parser.parse_args()
+
+    thumbs = load_thumbs()
+    pages = [(path, open(path, encoding="utf-8", errors="replace").read()) for path in args.pages or sorted(glob.glob(FIXTURE_GLOB))]
+    if not pages:
+        parser.error("no listing pages found")
+
+    def complete(items: list[dict[str, str]]) -> int:
+        return sum(1 for item in items if item["title"] and item["duration"])
+
+    print(f"{'page':32} {'KB':>5} {'regex ms':>9} {'items':>5} {'full':>5} {'parser ms':>9} {'items':>5} {'full':>5} {'speedup':>7}")
+    for name, html in pages:
+        legacy_ms, legacy_items = measure(legacy_extract, html, args.repeat)
+        parser_ms, parser_items = measure(thumbs.parse_thumbs, html, args.repeat)
+        print(f"{os.path.basename(name)[:32]:32} {len(html) / 1024:5.0f} {legacy_ms:9.2f} {len(legacy_items):5d} {complete(legacy_items):5d} "
+              f"{parser_ms:9.2f} {len(parser_items):5d} {complete(parser_items):5d} {legacy_ms / parser_ms:6.1f}x")
+    print("full: items with title and duration")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Offline Provider Benchmark Harness
+
+Runs the provider hot paths (get_categories, get_media_items, resolve_url)
+against recorded HTTP responses and reports wall time, CPU time, peak
+traced memory and the memory the call left allocated as JSON.
+
+Usage:
+    python3 benchmarks/harness.py run --server-dir DIR [--output result.json] [PROVIDER ...]
+    python3 benchmarks/harness.py record --server-dir DIR PROVIDER ...
+    python3 benchmarks/harness.py compare base.json new.json [--threshold 0.1]
+
+See benchmarks/README.md for the fixture layout.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import platform
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+import importlib
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROVIDERS_PARENT = os.path.join(ROOT_DIR, "src", "Area-51")
+FIXTURE_DIR = os.path.join(ROOT_DIR, "benchmarks", "fixtures")
+
+# Fixture file prefix per call, bench_parsers.py picks up listing-*.html and video-*.html
+CALL_KINDS = {
+    "get_categories": "categories",
+    "get_media_items": "listing",
+    "resolve_url": "video",
+}
+
+
+class FixtureStore:
+    """Recorded responses of one provider, keyed by request URL"""
+
+    def __init__(self, fixture_dir: str):
+        self.fixture_dir = fixture_dir
+        self.manifest_path = os.path.join(fixture_dir, "manifest.json")
+        with open(self.manifest_path, encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.manifest.setdefault("responses", {})
+        self.requests = 0
+        self.missing = []
+        self.kind = ""  # File prefix of recorded responses, see CALL_KINDS
+
+    def lookup(self, url: str) -> dict | None:
+        responses = self.manifest["responses"]
+        return responses.get(url) or responses.get(url.rstrip("/")) or responses.get(url.rstrip("/") + "/")
+
+    def read(self, entry: dict) -> bytes:
+        with open(os.path.join(self.fixture_dir, entry["file"]), "rb") as f:
+            return f.read()
+
+    def save(self, url: str, status: int, headers: dict, content: bytes):
+        name = f"{self.kind}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]}.html"
+        with open(os.path.join(self.fixture_dir, name), "wb") as f:
+            f.write(content)
+        self.manifest["responses"][url] = {
+            "file": name,
+            "status": status,
+            "headers": {key: value for key, value in headers.items() if key.lower() in ("content-type", "etag", "last-modified")},
+        }
+
+    def write_manifest(self):
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+            f.write("\n")
+
+
+class Transport:
+    """Replacement of requests' HTTPAdapter.send serving (or recording) the fixtures of the active store"""
+
+    def __init__(self, real_send):
+        self.real_send = real_send
+        self.store = None
+        self.record = False
+
+    def use(self, store: FixtureStore, record: bool = False):
+        """Serve the following requests from store, or record them into it"""
+        self.store = store
+        self.record = record
+
+    def send(self, adapter, request, **kwargs):
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        store = self.store
+        store.requests += 1
+        if self.record:
+            response = self.real_send(adapter, request, **kwargs)
+            content = response.content
+            store.save(request.url, response.status_code, response.headers, content)
+            return response
+
+        entry = store.lookup(request.url)
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        if entry is None:
+            store.missing.append(request.url)
+            response.status_code = 404
+            content = b""
+            response.headers = CaseInsensitiveDict({"Content-Type": "text/html"})
+        else:
+            response.status_code = entry.get("status", 200)
+            content = store.read(entry)
+            response.headers = CaseInsensitiveDict(entry.get("headers") or {"Content-Type": "text/html; charset=utf-8"})
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+        response.raw = io.BytesIO(content)  # Works for streamed and full reads
+        response.reason = "OK" if response.status_code < 400 else "Not Found"
+        return response
+
+
+def install_transport() -> Transport:
+    """Patch HTTPAdapter.send once, the providers then switch stores with Transport.use()"""
+    from requests.adapters import HTTPAdapter
+
+    transport = Transport(HTTPAdapter.send)
+
+    def send(adapter, request, **kwargs):
+        return transport.send(adapter, request, **kwargs)
+
+    HTTPAdapter.send = send
+    return transport
+
+
+def reset_state():
+    """Drop in-process caches so every run does the full work"""
+    from providers.area51.resolve_cache import resolve_cache
+    from providers.area51.page_cache import page_cache
+    from providers.area51.title_index import INDEX_FILE, close_title_indexes
+    from providers.area51.session_pool import STATE_DIR
+    from providers.area51.dedup import dedup_index
+    resolve_cache.clear()
+    dedup_index.clear()
+    close_title_indexes()
+    for suffix in ("", "-wal", "-shm"):  # Every call starts with an empty shared index
+        path = os.path.join(STATE_DIR, INDEX_FILE + suffix)
+        if os.path.exists(path):
+            os.remove(path)
+    page_cache.clear()
+    page_cache.prefetch_enabled = False  # Background downloads would count towards the CPU time of the call
+
+
+def make_call(package: str, call: dict, data_dir: str):
+    """Return a zero-argument function running one manifest call on a fresh provider/resolver"""
+    name = call["call"]
+    args = call.get("args", {})
+    if name == "resolve_url":
+        resolver_class = importlib.import_module(f"providers.{package}.resolver").Resolver
+        resolver = resolver_class({"provider_id": package.lower(), **args})
+        return resolver.resolve_url
+    provider_class = importlib.import_module(f"providers.{package}.provider").Provider
+    provider = provider_class({"provider_id": package.lower(), "data_dir": data_dir, **call.get("provider_args", {})})
+    if name == "get_categories":
+        return provider.get_categories
+    return lambda: provider.get_media_items(args["category"], args.get("page", 1), *([args["limit"]] if "limit" in args else []))
+
+
+def stage_means(runs: int) -> dict[str, float]:
+    """Return the mean milliseconds per call of every instrumented stage (see area51/metrics.py)"""
+    from providers.area51.metrics import metrics
+    totals = {}
+    for stage in metrics.dump_json()["stages"]:
+        totals[stage["stage"]] = totals.get(stage["stage"], 0.0) + stage["sum_ms"]
+    return {stage: round(total / runs, 3) for stage, total in sorted(totals.items())}
+
+
+def result_size(result) -> int:
+    if isinstance(result, (list, dict)):
+        return len(result)
+    return 0 if result is None else 1
+
+
+def retained_memory(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> tuple[int, int]:
+    """Return bytes and blocks allocated between two snapshots and still alive at the second one"""
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]  # The snapshots themselves
+    statistics_diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "filename")
+    return sum(stat.size_diff for stat in statistics_diff), sum(stat.count_diff for stat in statistics_diff)
+
+
+def measure_call(package: str, call: dict, store: FixtureStore, runs: int) -> dict:
+    """Run one manifest call runs times and collect its metrics"""
+    from providers.area51.metrics import metrics
+    metrics.reset()
+    walls, cpus = [], []
+    stages = {}
+    peak_kb = 0.0
+    retained = (0, 0)
+    size = 0
+    store.requests = 0
+    store.missing = []
+    for run in range(runs + 1):
+        data_dir = tempfile.mkdtemp(prefix="area51-bench-")
+        try:
+            reset_state()
+            function = make_call(package, call, data_dir)
+            if run == runs:
+                stages = stage_means(runs)
+                # Extra run under tracemalloc, it slows the call down so it is not timed
+                tracemalloc.start()
+                before = tracemalloc.take_snapshot()
+                function()
+                peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+                retained = retained_memory(before, tracemalloc.take_snapshot())
+                tracemalloc.stop()
+                continue
+            wall, cpu = time.perf_counter(), time.process_time()
+            result = function()
+            walls.append((time.perf_counter() - wall) * 1000)
+            cpus.append((time.process_time() - cpu) * 1000)
+            size = result_size(result)
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    return {
+        "provider": package,
+        "name": call.get("name", call["call"]),
+        "call": call["call"],
+        "runs": runs,
+        "items": size,
+        "wall_ms": {"cold": walls[0], "median": statistics.median(walls), "min": min(walls)},
+        "cpu_ms": {"cold": cpus[0], "median": statistics.median(cpus), "min": min(cpus)},
+        "stages_ms": stages,
+        "peak_kb": round(peak_kb, 1),
+        "retained_kb": round(retained[0] / 1024, 1),
+        "retained_blocks": retained[1],
+        "http_requests": store.requests // (runs + 1),
+        "missing_fixtures": sorted(set(store.missing)),
+    }
+
+
+def provider_dirs(fixture_dir: str, names: list[str]) -> list[str]:
+    available = sorted(
+        name for name in os.listdir(fixture_dir)
+        if os.path.exists(os.path.join(fixture_dir, name, "manifest.json"))
+    )
+    return [name for name in available if not names or name in names]
+
+
+def setup_imports(server_dir: str):
+    """Make the host modules and the providers package importable, with throwaway shared state"""
+    os.environ.setdefault("AREA51_STATE_DIR", tempfile.mkdtemp(prefix="area51-state-"))
+    os.environ.setdefault("AREA51_METRICS", "1")  # Per-stage times in the report
+    sys.path[:0] = [server_dir, PROVIDERS_PARENT]
+    logging.disable(logging.CRITICAL)
+
+
+def command_run(args) -> int:
+    setup_imports(args.server_dir)
+    from providers.area51 import soup
+
+    results = []
+    transport = install_transport()
+    for package in provider_dirs(args.fixture_dir, args.providers):
+        store = FixtureStore(os.path.join(args.fixture_dir, package))
+        if not store.manifest["responses"]:
+            print(f"{package}: no recorded responses, run the record command first", file=sys.stderr)
+            continue
+        transport.use(store)
+        for call in store.manifest.get("calls", []):
+            result = measure_call(package, call, store, args.runs)
+            results.append(result)
+            print(f"{package:10} {result['name']:28} {result['wall_ms']['median']:9.2f} ms wall {result['cpu_ms']['median']:9.2f} ms cpu "
+                  f"{result['peak_kb']:9.0f} KB peak {result['items']:4d} items"
+                  + (f"  ({len(result['missing_fixtures'])} missing fixtures)" if result["missing_fixtures"] else ""),
+                  file=sys.stderr)
+
+    report = {
+        "meta": {
+            "label": args.label,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "parser_backend": soup.PARSER_BACKEND,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+def command_record(args) -> int:
+    setup_imports(args.server_dir)
+    transport = install_transport()
+    for package in provider_dirs(args.fixture_dir, args.providers):
+        store = FixtureStore(os.path.join(args.fixture_dir, package))
+        transport.use(store, record=True)
+        for call in store.manifest.get("calls", []):
+            store.kind = CALL_KINDS[call["call"]]
+            data_dir = tempfile.mkdtemp(prefix="area51-record-")
+            try:
+                reset_state()
+                result = make_call(package, call, data_dir)()
+                print(f"{package} {call.get('name', call['call'])}: {result_size(result)} items", file=sys.stderr)
+            finally:
+                shutil.rmtree(data_dir, ignore_errors=True)
+        store.write_manifest()
+    return 0
+
+
+def command_compare(args) -> int:
+    with open(args.base, encoding="utf-8") as f:
+        base = {(r["provider"], r["name"]): r for r in json.load(f)["results"]}
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)["results"]
+
+    regressions = 0
+    print(f"{'provider':10} {'call':28} {'wall':>8} {'cpu':>8} {'peak':>8}")
+    for result in new:
+        old = base.get((result["provider"], result["name"]))
+        if not old:
+            continue
+        ratios = [
+            result["wall_ms"]["median"] / max(old["wall_ms"]["median"], 1e-6),
+            result["cpu_ms"]["median"] / max(old["cpu_ms"]["median"], 1e-6),
+            result["peak_kb"] / max(old["peak_kb"], 1e-6),
+        ]
+        flag = any(ratio > 1 + args.threshold for ratio in ratios)
+        regressions += flag
+        print(f"{result['provider']:10} {result['name']:28} " + " ".join(f"{ratio:7.2f}x" for ratio in ratios) + ("  REGRESSION" if flag else ""))
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("run", "record"):
+        command = commands.add_parser(name)
+        command.add_argument("--server-dir", default=os.environ.get("STREAMINGSERVER_DIR"), help="StreamingServer directory with the host modules")
+        command.add_argument("--fixture-dir", default=FIXTURE_DIR, help="Directory with one fixture directory per provider")
+        command.add_argument("providers", nargs="*", help="Provider directories (default: all with a manifest)")
+    commands.choices["run"].add_argument("--runs", type=int, default=5, help="Timed runs per call")
+    commands.choices["run"].add_argument("--label", default="", help="Free text stored in the report, e.g. the release")
+    commands.choices["run"].add_argument("--output", help="Write the JSON report to this file instead of stdout")
+
+    compare = commands.add_parser("compare")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown reported as regression")
+
+    args = parser.parse_args()
+    if args.command in ("run", "record") and not args.server_dir:
+        parser.error("--server-dir or STREAMINGSERVER_DIR is required")
+    return {"run": command_run, "record": command_record, "compare": command_compare}[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
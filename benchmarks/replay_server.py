@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Local Replay Server
+
+Serves the recorded fixtures of harness.py (benchmarks/fixtures/<Provider>)
+under the paths the providers request, one site per port, so the whole
+stack can run against it with a base URL override:
+
+    python3 benchmarks/replay_server.py --latency-ms 80 --bandwidth-kbps 2000
+    export AREA51_XNXX_BASE_URL=http://127.0.0.1:8001/   (printed on start)
+
+Absolute URLs of the recorded hosts are rewritten to the local server in
+the served pages, so video pages and HLS manifests linked from listings
+are fetched from it as well. Requests without a recording get a 404 and
+are logged.
+
+Options simulate a slow or unreliable site: per-request latency with
+jitter, a delay on every new connection standing in for the TCP+TLS
+handshake, bandwidth throttling and random 403/429/5xx errors. ETag and
+If-None-Match are supported, recorded ETags are served as recorded.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import Counter
+from urllib.parse import urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from harness import FIXTURE_DIR, FixtureStore, provider_dirs
+
+# Size of the chunks written when throttling
+CHUNK_SIZE = 16 * 1024
+
+# Content types whose bodies get the host rewriting
+TEXT_TYPES = ("text/", "json", "javascript", "mpegurl", "xml")
+
+
+class ReplaySite:
+    """Recorded responses of one provider, keyed by local path"""
+
+    def __init__(self, store: FixtureStore, port: int):
+        self.store = store
+        self.origin = f"http://127.0.0.1:{port}"
+        hosts = Counter(urlparse(url).netloc for url in store.manifest["responses"])
+        # The most recorded host is the site itself, other hosts (CDN) are served under /_host/<host>
+        self.site_host = hosts.most_common(1)[0][0] if hosts else ""
+        self.prefixes = {host: self._prefix(host) for host in hosts}
+        self.paths = {}
+        for url, entry in store.manifest["responses"].items():
+            parsed = urlparse(url)
+            path = self.prefixes[parsed.netloc] + (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+            self.paths[path] = entry
+        self.bodies = {}
+        self.lock = threading.Lock()
+
+    def _prefix(self, host: str) -> str:
+        return "" if host == self.site_host else f"/_host/{host}"
+
+    def lookup(self, path: str) -> dict | None:
+        base, _, query = path.partition("?")
+        query = f"?{query}" if query else ""
+        for candidate in (base, base.rstrip("/"), base.rstrip("/") + "/"):
+            entry = self.paths.get(candidate + query)
+            if entry:
+                return entry
+        return None
+
+    def body(self, entry: dict) -> tuple[bytes, str]:
+        """Return the (rewritten) body and its ETag, built once per entry"""
+        with self.lock:
+            cached = self.bodies.get(entry["file"])
+            if cached:
+                return cached
+        content = self.store.read(entry)
+        headers = {key.lower(): value for key, value in (entry.get("headers") or {}).items()}
+        if any(kind in headers.get("content-type", "text/html") for kind in TEXT_TYPES):
+            for host, prefix in self.prefixes.items():
+                local = (self.origin + prefix).encode("ascii")
+                for scheme in (b"https://", b"http://", b"//"):
+                    content = content.replace(scheme + host.encode("ascii"), local)
+        etag = headers.get("etag") or f'"{hashlib.sha1(content).hexdigest()[:16]}"'
+        with self.lock:
+            self.bodies[entry["file"]] = (content, etag)
+        return content, etag
+
+
+class ReplayConfig:
+    """Network conditions shared by all sites"""
+
+    def __init__(self, args):
+        self.latency = args.latency_ms / 1000
+        self.handshake = args.handshake_ms / 1000
+        self.jitter = args.jitter_ms / 1000
+        self.bandwidth = args.bandwidth_kbps * 1024 / 8  # Bytes per second, 0 = unlimited
+        self.error_rate = args.error_rate
+        self.error_codes = [int(code) for code in args.error_codes.split(",")]
+        self.random = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.stats = Counter()
+        self.connections = Counter()  # Site name -> connections accepted
+
+    def delay(self) -> float:
+        with self.lock:
+            return self.latency + self.random.uniform(0, self.jitter)
+
+    def injected_error(self) -> int | None:
+        with self.lock:
+            if self.error_rate and self.random.random() < self.error_rate:
+                return self.random.choice(self.error_codes)
+        return None
+
+    def count(self, name: str, status: int):
+        with self.lock:
+            self.stats[(name, status)] += 1
+
+    def connected(self, name: str):
+        with self.lock:
+            self.connections[name] += 1
+
+
+def make_handler(name: str, site: ReplaySite, config: ReplayConfig, quiet: bool):
+    """Return the request handler class of one site"""
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, like the real sites
+        server_version = "Area51Replay/1.0"
+
+        def setup(self):
+            super().setup()
+            config.connected(name)
+            if config.handshake:
+                time.sleep(config.handshake)
+
+        def do_HEAD(self):
+            self.reply(send_body=False)
+
+        def do_GET(self):
+            self.reply(send_body=True)
+
+        def reply(self, send_body: bool):
+            time.sleep(config.delay())
+            status = config.injected_error()
+            if status:
+                self.send_status(status, {"Retry-After": "1"} if status == 429 else {})
+                return
+
+            entry = site.lookup(self.path)
+            if entry is None:
+                print(f"{name}: no recording for {self.path}", file=sys.stderr)
+                self.send_status(404)
+                return
+
+            content, etag = site.body(entry)
+            headers = {key: value for key, value in (entry.get("headers") or {}).items() if key.lower() != "etag"}
+            headers.setdefault("Content-Type", "text/html; charset=utf-8")
+            headers["ETag"] = etag
+            if etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+                self.send_status(304, {"ETag": etag})
+                return
+
+            status = entry.get("status", 200)
+            config.count(name, status)
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            if send_body:
+                self.write_throttled(content)
+
+        def send_status(self, status: int, headers: dict | None = None):
+            config.count(name, status)
+            self.send_response(status)
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def write_throttled(self, content: bytes):
+            try:
+                if not config.bandwidth:
+                    self.wfile.write(content)
+                    return
+                start = time.monotonic()
+                for offset in range(0, len(content), CHUNK_SIZE):
+                    self.wfile.write(content[offset:offset + CHUNK_SIZE])
+                    ahead = (offset + CHUNK_SIZE) / config.bandwidth - (time.monotonic() - start)
+                    if ahead > 0:
+                        time.sleep(ahead)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True  # The client stopped reading early, see page_stream.py
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            if not quiet:
+                super().log_message(format, *args)
+
+    return ReplayHandler
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture-dir", default=FIXTURE_DIR, help="Directory with one fixture directory per provider")
+    parser.add_argument("--port", type=int, default=8001, help="Port of the first site, the others follow")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay before every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra delay, 0 to this value")
+    parser.add_argument("--handshake-ms", type=float, default=0, help="Delay on every new connection")
+    parser.add_argument("--bandwidth-kbps", type=float, default=0, help="Body transfer rate per request, 0 = unlimited")
+    parser.add_argument("--error-rate", type=float, default=0, help="Share of requests answered with an error, 0..1")
+    parser.add_argument("--error-codes", default="403,429,503", help="Comma separated status codes of injected errors")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible jitter and errors")
+    parser.add_argument("--quiet", action="store_true", help="Don't log every request")
+    parser.add_argument("providers", nargs="*", help="Provider directories (default: all with a manifest)")
+    args = parser.parse_args()
+
+    config = ReplayConfig(args)
+    servers = []
+    for port, name in enumerate(provider_dirs(args.fixture_dir, args.providers), args.port):
+        site = ReplaySite(FixtureStore(os.path.join(args.fixture_dir, name)), port)
+        if not site.paths:
+            print(f"{name}: no recorded responses, run harness.py record first", file=sys.stderr)
+            continue
+        server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(name, site, config, args.quiet))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name=f"replay-{name}", daemon=True).start()
+        servers.append(server)
+        print(f"export AREA51_{name.upper()}_BASE_URL={site.origin}/  # {site.site_host}, {len(site.paths)} responses")
+
+    if not servers:
+        return 1
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    for server in servers:
+        server.shutdown()
+    for (name, status), count in sorted(config.stats.items()):
+        print(f"{name:10} {status} {count:6d}", file=sys.stderr)
+    for name, count in sorted(config.connections.items()):
+        print(f"{name:10} connections {count:6d}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Fetch Method Mapping Test
+
+Fetches the video fixture page of every provider with the installed
+AuthTokens.fetch_with_fallback() and checks that the method name it reports
+maps to a direct method (area51/fetch_methods.py HOST_METHODS), so the
+per-host learning works with the real host module. Also checks that an
+unmapped name is counted and never tried directly.
+
+Usage:
+    STREAMINGSERVER_DIR=/path/to/streamingserver python3 -m unittest discover -s benchmarks -p "test_*.py"
+
+The providers import the StreamingServer host modules, the test is skipped
+without STREAMINGSERVER_DIR.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bench_parsers  # noqa: E402 pylint: disable=wrong-import-position
+import harness  # noqa: E402 pylint: disable=wrong-import-position
+
+SERVER_DIR = os.environ.get("STREAMINGSERVER_DIR")
+
+
+@unittest.skipUnless(SERVER_DIR, "STREAMINGSERVER_DIR is not set")
+class FetchMethodTest(unittest.TestCase):
+    """AuthTokens method names must map to the direct fetch methods"""
+
+    @classmethod
+    def setUpClass(cls):
+        bench_parsers.setup_imports(SERVER_DIR)
+        from auth_utils import AuthTokens  # pylint: disable=import-outside-toplevel
+        from providers.area51 import fetch_methods, metrics  # pylint: disable=import-outside-toplevel
+        cls.AuthTokens = AuthTokens
+        cls.fetch_methods = fetch_methods
+        cls.metrics = metrics
+        cls.transport = harness.install_transport()
+
+    @classmethod
+    def tearDownClass(cls):
+        from requests.adapters import HTTPAdapter  # pylint: disable=import-outside-toplevel
+        HTTPAdapter.send = cls.transport.real_send
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.stats = self.fetch_methods.FetchStats(os.path.join(self.tmp_dir.name, "fetch_methods.json"))
+        self.fetch_stats = self.fetch_methods.fetch_stats
+        self.fetch_methods.fetch_stats = self.stats
+
+    def tearDown(self):
+        self.fetch_methods.fetch_stats = self.fetch_stats
+        self.tmp_dir.cleanup()
+
+    def test_host_method_names_are_mapped(self):
+        for name in harness.provider_dirs(harness.FIXTURE_DIR, []):
+            store = harness.FixtureStore(os.path.join(harness.FIXTURE_DIR, name))
+            self.transport.use(store)
+            for call in store.manifest["calls"]:
+                if call["call"] != "resolve_url":
+                    continue
+                url = call["args"]["url"]
+                auth_tokens = self.AuthTokens()
+                parts = urlsplit(url)
+                html = auth_tokens.fetch_with_fallback(url, f"{parts.scheme}://{parts.netloc}")
+                with self.subTest(provider=name, method=auth_tokens.method):
+                    self.assertTrue(html, "fixture page not fetched")
+                    self.assertIsNotNone(self.fetch_methods.direct_method(auth_tokens.method),
+                                         f"AuthTokens method {auth_tokens.method!r} is missing in HOST_METHODS")
+
+    def test_unmapped_method_is_counted(self):
+        class UnknownMethodTokens:
+            session = None
+            method = None
+
+            def fetch_with_fallback(self, _url, _origin):
+                self.method = "some_new_method"
+                return "<html></html>"
+
+        host = "example.com"
+        self.stats.record(host, self.fetch_methods.PROBE_METHOD, False, 0.1)  # No probe, straight to the fallback
+        enabled = self.metrics.metrics.enabled
+        self.metrics.metrics.enabled = True
+        try:
+            self.metrics.metrics.reset()
+            html = self.fetch_methods.fetch_page(UnknownMethodTokens(), f"https://{host}/video", f"https://{host}")
+            counters = self.metrics.metrics.dump_json()["counters"]
+        finally:
+            self.metrics.metrics.enabled = enabled
+        self.assertEqual(html, "<html></html>")
+        self.assertIn({"name": "fetch", "labels": {"host": host, "method": "some_new_method", "result": "unmapped_method"}, "value": 1}, counters)
+        self.assertIsNone(self.stats.best_method(host))
+
+
+if __name__ == "__main__":
+    unittest.main()
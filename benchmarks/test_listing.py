@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Listing Cursor Test
+
+Checks video_id() on the video page URL forms of the providers, and pages
+a ListingCursor through a fake listing whose site pages repeat videos:
+the screens it builds and that the cursor lock is free while a batch is
+handed to the caller.
+
+Usage:
+    STREAMINGSERVER_DIR=/path/to/streamingserver python3 -m unittest discover -s benchmarks -p "test_*.py"
+
+The providers import the StreamingServer host modules, the test is skipped
+without STREAMINGSERVER_DIR.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bench_parsers  # noqa: E402 pylint: disable=wrong-import-position
+
+SERVER_DIR = os.environ.get("STREAMINGSERVER_DIR")
+# Videos per screen
+LIMIT = 4
+
+
+@unittest.skipUnless(SERVER_DIR, "STREAMINGSERVER_DIR is not set")
+class ListingCursorTest(unittest.TestCase):
+    """Screens of new videos from site pages that repeat videos"""
+
+    @classmethod
+    def setUpClass(cls):
+        bench_parsers.setup_imports(SERVER_DIR)
+        from providers.area51 import listing, pagination  # pylint: disable=import-outside-toplevel
+        cls.listing = listing
+        cls.pagination = pagination
+
+    def fetch(self, site_page: int) -> dict:
+        """Site page n holds videos 2n-2 to 2n+1, half of them repeated from page n-1"""
+        self.fetches.append(site_page)
+        videos = [{"url": f"https://www.xvideos.com/video.v{number}/title_{number}", "title": f"title {number}"} for number in range(2 * site_page - 2, 2 * site_page + 2)]
+        return {"videos": videos, "pagination": self.pagination.Pagination(site_page, 6, None)}
+
+    def setUp(self):
+        self.fetches = []
+        self.cursor = self.listing.ListingCursor()
+
+    def screen(self, page: int) -> list[str]:
+        batches = list(self.cursor.iter_screen(page, self.fetch, LIMIT))
+        return [video["title"] for batch in batches for video in batch]
+
+    def test_video_id(self):
+        urls = {
+            "https://www.xvideos.com/video.oheokld0b1/some_title": "oheokld0b1",
+            "https://www.xvideos.com/video12345678/some_title": "12345678",
+            "https://www.xnxx.com/video-1a2b3c4/some_title": "1a2b3c4",
+            "https://xhamster.com/videos/some-title-xhT4p7Q": "xhT4p7Q",
+            "https://xhamster.com/videos/other-title-xhT4p7Q/": "xhT4p7Q",
+            "https://example.com/Some/Page/": "/some/page",
+        }
+        for url, expected in urls.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.listing.video_id(url), expected)
+
+    def test_search_pager(self):
+        base = "https://xhamster.com/search/some+term"
+        links = "".join(f'<a href="/search/some+term{f"?page={page}" if page > 1 else ""}">{page}</a>' for page in (1, 2, 3, 9))
+        html = f'<nav class="pager">{links}</nav>'
+        page_number = self.pagination.page_number_parser(base, query_param="page")
+        self.assertEqual(self.pagination.parse_pagination(html, base, 1, page_number),
+                         self.pagination.Pagination(1, 9, f"{base}?page=2"))
+        self.assertEqual(self.pagination.parse_pagination(html, f"{base}?page=2", 2, page_number),
+                         self.pagination.Pagination(2, 9, f"{base}?page=3"))
+
+    def test_screens_skip_repeated_videos(self):
+        self.assertEqual(self.screen(1), ["title 0", "title 1", "title 2", "title 3"])
+        self.assertEqual(self.screen(2), ["title 4", "title 5", "title 6", "title 7"])
+        self.assertEqual(self.fetches, [1, 2, 3])
+
+    def test_skip_ahead_and_page_back(self):
+        self.assertEqual(self.screen(2), ["title 4", "title 5", "title 6", "title 7"])
+        fetches = len(self.fetches)
+        self.assertEqual(self.screen(2), ["title 4", "title 5", "title 6", "title 7"])
+        self.assertEqual(len(self.fetches), fetches, "screen 2 was downloaded again")
+
+    def test_lock_is_free_while_yielding(self):
+        for _batch in self.cursor.iter_screen(1, self.fetch, LIMIT):
+            self.assertFalse(self.cursor.lock.locked())
+        self.assertIsNone(self.cursor.builder)
+
+    def test_second_request_waits_for_the_screen(self):
+        screens = {}
+        batches = self.cursor.iter_screen(1, self.fetch, LIMIT)
+        first = next(batches)
+        thread = threading.Thread(target=lambda: screens.update(second=self.screen(2)))
+        thread.start()
+        thread.join(0.2)
+        self.assertTrue(thread.is_alive(), "screen 2 was built while screen 1 was unfinished")
+        rest = [video for batch in batches for video in batch]
+        thread.join(5)
+        self.assertEqual([video["title"] for video in first + rest], ["title 0", "title 1", "title 2", "title 3"])
+        self.assertEqual(screens["second"], ["title 4", "title 5", "title 6", "title 7"])
+
+
+if __name__ == "__main__":
+    unittest.main()
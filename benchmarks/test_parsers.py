@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+HTML Parser Backend Test
+
+Runs the XNXX and XVideos extraction of bench_parsers.py on every fixture
+page with html.parser and with lxml, and checks that both backends extract
+the same, non-empty results.
+
+Usage:
+    STREAMINGSERVER_DIR=/path/to/streamingserver python3 -m unittest discover -s benchmarks -p "test_*.py"
+
+The providers import the StreamingServer host modules, the test is skipped
+without STREAMINGSERVER_DIR, and without lxml.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bench_parsers  # noqa: E402 pylint: disable=wrong-import-position
+
+SERVER_DIR = os.environ.get("STREAMINGSERVER_DIR")
+# Reference backend first
+BACKENDS = ("html.parser", "lxml")
+
+
+@unittest.skipUnless(SERVER_DIR, "STREAMINGSERVER_DIR is not set")
+class ParserBackendTest(unittest.TestCase):
+    """Extraction results must not depend on the parser backend"""
+
+    @classmethod
+    def setUpClass(cls):
+        bench_parsers.setup_imports(SERVER_DIR)
+        from providers.area51 import soup  # pylint: disable=import-outside-toplevel
+        if "lxml" not in soup.available_backends():
+            raise unittest.SkipTest("lxml is not installed")
+        cls.soup = soup
+        cls.selected_backend = soup.PARSER_BACKEND
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.soup.PARSER_BACKEND = cls.selected_backend
+
+    def test_fixture_pages(self):
+        pages = bench_parsers.load_pages()
+        self.assertEqual({(provider, kind) for provider, kind, _name, _html in pages}, set(bench_parsers.EXTRACTORS))
+        for provider, kind, name, html in pages:
+            extractor = bench_parsers.EXTRACTORS[(provider, kind)]
+            results = []
+            for backend in BACKENDS:
+                self.soup.PARSER_BACKEND = backend
+                results.append(extractor(html))
+            with self.subTest(page=f"{provider}/{name}"):
+                self.assertTrue(results[0], "nothing extracted")
+                for backend, result in zip(BACKENDS[1:], results[1:]):
+                    self.assertEqual(result, results[0], f"{backend} differs from {BACKENDS[0]}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,6 +16,8 @@ from urllib.parse import urljoin
 from debug import get_logger
 from string_utils import sanitize_for_json
 from auth_utils import get_headers
+from ..area51.category_cache import CategoryCache, conditional_headers, response_validators
+from ..area51.metrics import span
 
 logger = get_logger(__file__)
 
@@ -26,24 +28,35 @@ class Category:
     def __init__(self, provider):
         """Initialize with reference to parent provider"""
         self.provider = provider
+        self.cache = CategoryCache(provider)
 
     def get_categories(self) -> list[dict[str, str]]:
+        """Get XNXX categories, served from the category cache when possible"""
+        return self.cache.get_categories(self._scrape_categories)
+
+    def _scrape_categories(self, validators: dict[str, str]) -> tuple[list[dict[str, str]] | None, dict[str, str]]:
         """Get XNXX categories by scraping JSON from main page"""
         try:
-            headers = get_headers("browser")
+            headers = {**get_headers("browser"), **conditional_headers(validators, self.provider.base_url)}
+            labels = {"provider": self.provider.provider_id, "call": "categories"}
 
-            response = self.provider.session.get(self.provider.base_url, headers=headers, timeout=30)
+            with span("fetch", **labels):
+                response = self.provider.session.get(self.provider.base_url, headers=headers, timeout=30)
+            if response.status_code == 304:
+                return None, validators
             response.raise_for_status()
 
-            html = response.text
+            with span("decode", **labels):
+                html = response.text
             xvideos_categories = []
 
             # XNXX has categories in JavaScript - use regex to extract individual entries
             # Find individual category entries using regex patterns
             # Pattern matches: {"label":"CategoryName","url":"/search/category","nbvids":12345...}
-            category_patterns = re.findall(
-                r'\{"label":"([^"]+)","url":"([^"]+)"[^}]*"nbvids":(\d+)[^}]*\}', html
-            )
+            with span("extract", **labels):
+                category_patterns = re.findall(
+                    r'\{"label":"([^"]+)","url":"([^"]+)"[^}]*"nbvids":(\d+)[^}]*\}', html
+                )
 
             for label, url, nbvids in category_patterns[:100]:  # Limit to reasonable number
                 # Clean up the category name and URL
@@ -86,11 +99,11 @@ class Category:
             xvideos_categories.sort(key=lambda cat: cat['name'].lower())
 
             logger.info("Found %d XNXX categories", len(xvideos_categories))
-            return xvideos_categories
+            return xvideos_categories, response_validators(self.provider.base_url, response)
 
         except Exception as e:
             logger.info("Error getting XNXX categories: %s", e)
-            return []
+            return [], {}
 
     def _extract_category_id(self, url: str) -> str:
         """Extract category ID from URL"""
@@ -14,21 +14,26 @@ This module contains the XNXX provider class that coordinates:
 from __future__ import annotations
 
 from typing import Any
+from urllib.parse import quote_plus
 from base_provider import BaseProvider
 from debug import get_logger
 from constants import MAX_VIDEOS
+from ..area51.site_mixins import SiteProvider
 from .category import Category
+from .resolver import Resolver
 from .video import Video
 
 logger = get_logger(__file__)
 
 
-class Provider(BaseProvider):
-    """XNXX provider class - modular implementation"""
+class Provider(SiteProvider, BaseProvider):
+    """XNXX provider class - modular implementation, listing wiring in SiteProvider"""
+
+    resolver_class = Resolver
 
     def __init__(self, args: dict):
         super().__init__(args)
-        self.base_url = "https://www.xnxx.com/"
+        self.setup_site("https://www.xnxx.com/", args)
 
         # Initialize modular components
         self.category_manager = Category(self)
@@ -38,6 +43,8 @@ class Provider(BaseProvider):
         """Get XNXX categories using modular category manager"""
         return self.category_manager.get_categories()
 
-    def get_media_items(self, category: dict, page: int = 1, limit: int = MAX_VIDEOS) -> list[dict[str, Any]]:
-        """Get media items using modular video manager"""
-        return self.video_manager.get_media_items(category, page, limit)
+    def search(self, query: str, page: int = 1, limit: int = MAX_VIDEOS) -> list[dict[str, Any]]:
+        """Search videos, returns one result page in the site's rank order"""
+        # Search results are listed like a category under /search/<term>
+        category = {"name": query, "url": f"{self.base_url}search/{quote_plus(query.strip())}"}
+        return self.get_media_items(category, page, limit)
@@ -12,159 +12,73 @@ This module contains the XNXX resolver class with methods for:
 
 from __future__ import annotations
 
-import re
 from typing import Any
 import json
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from base_resolver import BaseResolver
 from auth_utils import AuthTokens
 from quality_utils import select_best_source, extract_metadata_from_url
 from debug import get_logger
+from ..area51.resolve_cache import resolve_cache
+from ..area51.session_pool import session_pool
+from ..area51.fetch_methods import fetch_page, fetch_full_page
+from ..area51.site import url_origin
+from ..area51.html5player import SourceScanner, extract_sources
+from ..area51.soup import make_soup
+from ..area51.metrics import span
+from ..area51.site_mixins import SiteResolver
 
 logger = get_logger(__file__)
 
+# Tags the DOM fallback needs: JSON-LD scripts and video elements with their sources
+DOM_FALLBACK_TAGS = ["script", "video"]
 
-class Resolver(BaseResolver):
+# Labels of the stage metrics of this resolver
+METRIC_LABELS = {"provider": "xnxx", "call": "resolve"}
+
+
+class Resolver(SiteResolver, BaseResolver):
     """XNXX URL resolver"""
 
     def __init__(self, args: dict):
         super().__init__(args)
         self.auth_tokens = AuthTokens()
+        # Share the pooled per-host session: kept-alive connections and persisted cookies
+        self.auth_tokens.session = session_pool.get_session(self.url, self.auth_tokens.session)
 
-    def resolve_url(self) -> dict[str, Any] | None:
-        """
-        Resolve XNXX URL to streaming URLs using centralized auth utilities
-
-        Returns:
-            Dictionary with resolved status and streaming information
-        """
+    def _resolve_url(self) -> dict[str, Any] | None:
+        """Resolve XNXX URL to streaming URLs using centralized auth utilities, coalesced by SiteResolver.resolve_url()"""
         try:
             logger.info("Resolving XNXX URL: %s", self.url)
 
-            # Use centralized authentication with fallback methods
-            html = self.auth_tokens.fetch_with_fallback(self.url, "https://www.xnxx.com")
+            cached = resolve_cache.get(self.url, self.quality, self.av1)
+            if cached:
+                if cached.pop("alias", None):
+                    # Resolved for another listing of the video, its session and headers belong to that site
+                    cached.update(self._playback_auth())
+                logger.info("Using cached resolve result: %s", cached["resolved_url"][:100])
+                self.resolve_result.update(cached)
+                return self.resolve_result
+
+            # Try the best-known fetch method for this host, then centralized authentication with fallback methods
+            # Stream the page and stop reading once the html5player calls were seen
+            scanner = SourceScanner()
+            with span("fetch", **METRIC_LABELS):
+                html = fetch_page(self.auth_tokens, self.url, url_origin(self.url), scanner)
 
             if not html:
                 logger.error("Failed to fetch XNXX page content")
                 return None
-            soup = BeautifulSoup(html, "html.parser")
-
-            sources = []
-
-            # Method 1: Look for JavaScript video configuration
-            # XNXX typically stores video URLs in window.wpn_mobile or similar variables
-            js_patterns = [
-                # Structured patterns with quality information
-                (r'html5player\.setVideoUrlLow\(["\']([^"\']+)["\']', "360p"),
-                (r'html5player\.setVideoUrlHigh\(["\']([^"\']+)["\']', "720p"),
-                (r'html5player\.setVideoHLS\(["\']([^"\']+)["\']', "adaptive"),
-                (r'html5player\.setVideoUrl1080p\(["\']([^"\']+)["\']', "1080p"),
-                (r'html5player\.setVideoUrl720p\(["\']([^"\']+)["\']', "720p"),
-                (r'html5player\.setVideoUrl480p\(["\']([^"\']+)["\']', "480p"),
-                (r'html5player\.setVideoUrl360p\(["\']([^"\']+)["\']', "360p"),
-                (r'html5player\.setVideoUrl240p\(["\']([^"\']+)["\']', "240p"),
-                # Generic patterns
-                (r'setVideoUrl\(["\']([^"\']+)["\']', "Unknown"),
-                (r'video_url["\']?\s*[:=]\s*["\']([^"\']+)["\']', "Unknown"),
-                (r'["\']url["\']?\s*:\s*["\']([^"\']+\.mp4[^"\']*)["\']', "Unknown"),
-                (r'["\']file["\']?\s*:\s*["\']([^"\']+\.mp4[^"\']*)["\']', "Unknown"),
-                # Additional patterns to catch HLS streams
-                (r'["\']hls["\']?\s*[:=]\s*["\']([^"\']+\.m3u8[^"\']*)["\']', "adaptive"),
-                (r'["\']url["\']?\s*[:=]\s*["\']([^"\']+\.m3u8[^"\']*)["\']', "adaptive"),
-            ]
-
-            for pattern, default_quality in js_patterns:
-                matches = re.findall(pattern, html, re.IGNORECASE)
-                for match in matches:
-                    if match and ("http" in match or match.startswith("//")):
-                        # Clean up the URL
-                        clean_url = match.replace("\\/", "/").replace("\\", "")
-                        if clean_url.startswith("//"):
-                            clean_url = "https:" + clean_url
-
-                        # Extract metadata from URL
-                        metadata = extract_metadata_from_url(clean_url)
-
-                        # Use default_quality if no quality extracted and it's not "Unknown"
-                        if not metadata["quality"] and default_quality != "Unknown":
-                            metadata["quality"] = default_quality
-                        elif not metadata["quality"]:
-                            # Final fallback: adaptive for HLS, 480p for MP4
-                            if metadata["format"] == "m3u8":
-                                metadata["quality"] = "adaptive"
-                            else:
-                                metadata["quality"] = "480p"
-
-                        logger.info("Found video source: %s (%s/%s)", clean_url, metadata["quality"], metadata["format"])
-                        sources.append({"url": clean_url, **metadata})
-
-            # Method 2: Look for JSON-LD structured data
-            json_scripts = soup.find_all("script", type="application/ld+json")
-            for script in json_scripts:
-                try:
-                    data = json.loads(script.get_text())
-                    if isinstance(data, dict) and "contentUrl" in data:
-                        metadata = extract_metadata_from_url(data["contentUrl"])
-                        if not metadata["quality"]:
-                            metadata["quality"] = "480p"
-                        sources.append({"url": data["contentUrl"], **metadata})
-                except (ValueError, KeyError):
-                    pass
-
-            # Method 3: Look for HTML5 video elements
-            video_elements = soup.find_all("video")
-            for video in video_elements:
-                video_sources = video.find_all("source")
-                for source in video_sources:
-                    src = source.get("src")
-                    if src:
-                        if not src.startswith("http"):
-                            if src.startswith("//"):
-                                src = "https:" + src
-                            else:
-                                src = urljoin(self.url, src)
-
-                        # Extract metadata from URL
-                        metadata = extract_metadata_from_url(src)
-
-                        # Extract quality information from source attributes
-                        source_quality = source.get("label", "")
-                        if not source_quality:
-                            source_quality = source.get("data-res", "")
-
-                        # Normalize HLS quality labels to "adaptive"
-                        if source_quality and ("HLS" in source_quality.upper() or source_quality.upper() == "HLS"):
-                            source_quality = "adaptive"
-
-                        # Use attribute quality if available, otherwise use extracted quality
-                        if source_quality:
-                            metadata["quality"] = source_quality
-                        elif not metadata["quality"]:
-                            # Final fallback: adaptive for HLS, 480p for MP4
-                            if metadata["format"] == "m3u8":
-                                metadata["quality"] = "adaptive"
-                            else:
-                                metadata["quality"] = "480p"
-
-                        sources.append({"url": src, **metadata})
-
-            # Remove duplicates and invalid URLs
-            unique_sources = []
-            seen_urls = set()
-            for source in sources:
-                source_url = source["url"]
-                if (
-                    source_url not in seen_urls
-                    and source_url.startswith("http")
-                    and any(
-                        ext in source_url.lower()
-                        for ext in (".mp4", ".m3u8", "video", "stream")
-                    )
-                ):
-                    unique_sources.append(source)
-                    seen_urls.add(source_url)
+            unique_sources = self._find_sources(html)
+
+            if not unique_sources:
+                # The streamed part of the page may have been cut off before the sources, read all of it
+                with span("fetch", **METRIC_LABELS):
+                    html = fetch_full_page(self.auth_tokens, self.url, url_origin(self.url), scanner)
+                if html:
+                    unique_sources = self._find_sources(html)
 
             if unique_sources:
                 # Sorting is now handled internally by select_best_source()
@@ -187,7 +101,8 @@ class Resolver(BaseResolver):
                 logger.info("About to call select_best_source with quality='%s'", self.quality)
                 logger.info("Available sources for selection: %s",
                             [f"{s['quality']}/{s['format']}" for s in unique_sources])
-                best_source = select_best_source(unique_sources, self.quality, codec_aware=True, av1=self.av1)
+                with span("select", **METRIC_LABELS):
+                    best_source = select_best_source(unique_sources, self.quality, codec_aware=True, av1=self.av1)
                 resolved_url = best_source["url"] if best_source else self.url
 
                 logger.info("Selected quality: %s (requested: %s) - %s",
@@ -198,15 +113,14 @@ class Resolver(BaseResolver):
                 # Determine recorder type based on URL characteristics
                 recorder_id = self.determine_recorder_id(resolved_url)
 
-                # Create FFmpeg headers from auth tokens for M4S recorder
-                ffmpeg_headers = self.auth_tokens.get_ffmpeg_headers()
-
-                self.resolve_result.update({
+                resolved = {
                     "resolved_url": resolved_url,
-                    "session": self.auth_tokens.session,  # Include authenticated session for reuse
-                    "ffmpeg_headers": ffmpeg_headers,  # Include FFmpeg headers for M4S recorder
                     "recorder_id": recorder_id,
-                })
+                }
+                resolved.update(self._playback_auth())
+                resolve_cache.put(self.url, self.quality, self.av1, resolved)
+                session_pool.save_cookies(self.url)
+                self.resolve_result.update(resolved)
                 return self.resolve_result
 
             # No sources found
@@ -216,3 +130,126 @@ class Resolver(BaseResolver):
         except Exception as e:
             logger.error("XNXX resolution error: %s", e)
             return None
+
+    def _playback_auth(self) -> dict[str, Any]:
+        """Return the session and FFmpeg headers the player needs for the XNXX CDN"""
+        return {
+            "session": self.auth_tokens.session,  # Authenticated session for reuse
+            "ffmpeg_headers": self.auth_tokens.get_ffmpeg_headers(),  # FFmpeg headers from the auth tokens for the M4S recorder
+        }
+
+    def _find_sources(self, html: str) -> list[dict[str, Any]]:
+        """Return the usable video sources of a page"""
+        # Method 1 runs on the raw page and almost always finds the html5player sources
+        with span("extract", **METRIC_LABELS):
+            sources = self._extract_player_sources(html)
+            unique_sources = self._filter_sources(sources)
+
+        if not unique_sources:
+            # Methods 2 and 3 need the DOM, only parse it when the regex stage found nothing usable
+            logger.info("No usable html5player sources, falling back to DOM parsing")
+            unique_sources = self._filter_sources(sources + self._extract_dom_sources(html))
+        return unique_sources
+
+    def _extract_player_sources(self, html: str) -> list[dict[str, Any]]:
+        """Extract video sources from the html5player JavaScript calls"""
+        sources = []
+
+        # Method 1: Look for JavaScript video configuration
+        # XNXX stores video URLs in html5player calls, scanned in a single pass over the page
+        for candidate in extract_sources(html):
+            if candidate.kind == "json_ld":
+                continue  # Structured data is handled by Method 2
+
+            # Extract metadata from URL
+            metadata = extract_metadata_from_url(candidate.url)
+
+            # Use the quality hint of the player call if no quality extracted
+            if not metadata["quality"] and candidate.quality:
+                metadata["quality"] = candidate.quality
+            elif not metadata["quality"]:
+                # Final fallback: adaptive for HLS, 480p for MP4
+                if metadata["format"] == "m3u8":
+                    metadata["quality"] = "adaptive"
+                else:
+                    metadata["quality"] = "480p"
+
+            logger.info("Found video source: %s (%s/%s)", candidate.url, metadata["quality"], metadata["format"])
+            sources.append({"url": candidate.url, **metadata})
+        return sources
+
+    def _extract_dom_sources(self, html: str) -> list[dict[str, Any]]:
+        """Extract video sources from JSON-LD data and HTML5 video elements"""
+        # Only build the script and video subtrees, the rest of the document is not needed
+        with span("parse", **METRIC_LABELS):
+            soup = make_soup(html, SoupStrainer(DOM_FALLBACK_TAGS))
+        sources = []
+
+        # Method 2: Look for JSON-LD structured data
+        json_scripts = soup.find_all("script", type="application/ld+json")
+        for script in json_scripts:
+            try:
+                data = json.loads(script.get_text())
+                if isinstance(data, dict) and "contentUrl" in data:
+                    metadata = extract_metadata_from_url(data["contentUrl"])
+                    if not metadata["quality"]:
+                        metadata["quality"] = "480p"
+                    sources.append({"url": data["contentUrl"], **metadata})
+            except (ValueError, KeyError):
+                pass
+
+        # Method 3: Look for HTML5 video elements
+        video_elements = soup.find_all("video")
+        for video in video_elements:
+            video_sources = video.find_all("source")
+            for source in video_sources:
+                src = source.get("src")
+                if src:
+                    if not src.startswith("http"):
+                        if src.startswith("//"):
+                            src = "https:" + src
+                        else:
+                            src = urljoin(self.url, src)
+
+                    # Extract metadata from URL
+                    metadata = extract_metadata_from_url(src)
+
+                    # Extract quality information from source attributes
+                    source_quality = source.get("label", "")
+                    if not source_quality:
+                        source_quality = source.get("data-res", "")
+
+                    # Normalize HLS quality labels to "adaptive"
+                    if source_quality and ("HLS" in source_quality.upper() or source_quality.upper() == "HLS"):
+                        source_quality = "adaptive"
+
+                    # Use attribute quality if available, otherwise use extracted quality
+                    if source_quality:
+                        metadata["quality"] = source_quality
+                    elif not metadata["quality"]:
+                        # Final fallback: adaptive for HLS, 480p for MP4
+                        if metadata["format"] == "m3u8":
+                            metadata["quality"] = "adaptive"
+                        else:
+                            metadata["quality"] = "480p"
+
+                    sources.append({"url": src, **metadata})
+        return sources
+
+    def _filter_sources(self, sources: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Remove duplicates and invalid URLs"""
+        unique_sources = []
+        seen_urls = set()
+        for source in sources:
+            source_url = source["url"]
+            if (
+                source_url not in seen_urls
+                and source_url.startswith("http")
+                and any(
+                    ext in source_url.lower()
+                    for ext in (".mp4", ".m3u8", "video", "stream")
+                )
+            ):
+                unique_sources.append(source)
+                seen_urls.add(source_url)
+        return unique_sources
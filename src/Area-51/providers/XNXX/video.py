@@ -11,13 +11,17 @@ including video discovery, extraction, and metadata processing.
 
 from __future__ import annotations
 
-from typing import Any
+from functools import partial
+from typing import Any, Iterator
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
 from debug import get_logger
 from string_utils import sanitize_for_json
 from auth_utils import get_headers
 from constants import MAX_VIDEOS
+from ..area51.soup import make_soup
+from ..area51.metrics import span
+from ..area51.pagination import parse_pagination, page_number_parser
+from ..area51.page_cache import page_cache
 
 logger = get_logger(__file__)
 
@@ -29,21 +33,60 @@ class Video:
         """Initialize with reference to parent provider"""
         self.provider = provider
 
-    def get_media_items(self, category: dict, _page: int = 1, limit: int = MAX_VIDEOS) -> list[dict[str, Any]]:
-        """Get media items for a specific category"""
+    def get_media_items(self, category: dict, page: int = 1, limit: int = MAX_VIDEOS) -> list[dict[str, Any]]:
+        """Get media items for a specific category page"""
+        return [video for batch in self.iter_media_items(category, page, limit) for video in batch]
+
+    def iter_media_items(self, category: dict, page: int = 1, limit: int = MAX_VIDEOS) -> Iterator[list[dict[str, Any]]]:
+        """Yield the media items of a category page, and prefetch the next page in the background"""
         url = category.get("url", "none")
-        logger.info("Getting media items from URL: %s, limit: %d", url, limit)
+        page_url = self._page_url(url, page)
+        logger.info("Getting media items from URL: %s, page: %d, limit: %d", page_url, page, limit)
 
         try:
-            headers = get_headers("browser")
+            result = page_cache.get(page_url, partial(self._fetch_page, page=page, category_url=url))
+            videos = result["videos"]
+
+            # Have the next page ready when the user pages forward
+            if result["pagination"].has_next:
+                page_cache.prefetch(self._page_url(url, page + 1), partial(self._fetch_page, page=page + 1, category_url=url))
+
+            # Apply limit if specified
+            if limit and len(videos) > limit:
+                logger.info("Limiting results from %d to %d videos", len(videos), limit)
+                videos = videos[:limit]
+
+            logger.info("Returning %d videos (limit: %d), page %d of %s",
+                        len(videos), limit, page, result["pagination"].total_pages or "?")
+            if videos:
+                yield videos
+
+        except Exception as e:
+            logger.info("Error getting video list from XNXX: %s", e)
 
-            response = self.provider.session.get(url, headers=headers, timeout=30)
+    @staticmethod
+    def _page_url(url: str, page: int) -> str:
+        """Return the URL of a category or search page, XNXX numbers the pages from 0 as {url}/{N}"""
+        if page <= 1:
+            return url
+        base, separator, query = url.partition("?")
+        return f"{base.rstrip('/')}/{page - 1}{separator}{query}"
+
+    def _fetch_page(self, page_url: str, page: int, category_url: str) -> dict[str, Any]:
+        """Download and parse one listing page, returns its videos and pagination"""
+        headers = get_headers("browser")
+        labels = {"provider": self.provider.provider_id, "call": "listing"}
+
+        with span("fetch", **labels):
+            response = self.provider.session.get(page_url, headers=headers, timeout=30)
             response.raise_for_status()
 
+        with span("decode", **labels):
             html = response.text
-            soup = BeautifulSoup(html, "html.parser")
-            videos = []
+        with span("parse", **labels):
+            soup = make_soup(html)
 
+        with span("extract", **labels):
             # Try to find video containers - XNXX uses multiple possible structures
             containers = (
                 soup.select(".mozaique .thumb-block")
@@ -53,93 +96,91 @@ class Video:
                 or soup.select("div[class*='video']")
             )
             logger.info("Found %d containers on XNXX page", len(containers))
-
-            # Debug: Log the actual HTML structure for troubleshooting
-            if not containers:
-                logger.warning("No video containers found. Page structure may have changed.")
-                # Log first few divs to help debug structure
-                all_divs = soup.find_all('div', limit=10)
-                for i, div in enumerate(all_divs):
-                    logger.debug("Div %d classes: %s", i, div.get('class', []))
-
-            if containers:
-                logger.info("Processing %d video containers found", len(containers))
-                for i, container in enumerate(containers):
-                    try:
-                        # XNXX structure: .thumb-under p a contains the title and URL
-                        title_link = container.select_one(".thumb-under p a")
-                        if not title_link:
-                            logger.debug("No title link found in container")
-                            continue
-
-                        href = title_link.get("href", "")
-                        if not href:
-                            logger.debug("No href found in title link")
-                            continue
-
-                        if not href.startswith("http"):
-                            href = urljoin(self.provider.base_url, href)
-
-                        # Get title from title attribute or text content
-                        title = title_link.get("title", "") or title_link.get_text(strip=True)
-                        if not title:
-                            logger.debug("No title found for href: %s", href)
-                            continue
-
-                        # Get thumbnail from .thumb img with data-src attribute
-                        img = container.select_one(".thumb img")
-                        thumbnail = ""
-                        if img:
-                            thumbnail = img.get("data-src", img.get("src", ""))
-                            if thumbnail and not thumbnail.startswith("http"):
-                                thumbnail = f"https:{thumbnail}" if thumbnail.startswith("//") else thumbnail
-
-                        # Get metadata (duration, views)
-                        duration = "Unknown"
-                        views = "0"
-
-                        metadata = container.select_one(".metadata")
-                        if metadata:
-                            # Views are in .right span
-                            views_elem = metadata.select_one(".right")
-                            if views_elem:
-                                views_text = views_elem.get_text(strip=True)
-                                views = views_text.split()[0] if views_text else "0"
-
-                        # Extract video title and clean it
-                        clean_title = sanitize_for_json(title)
-
-                        # Add the video without resolving the URL
-                        video_data = {
-                            "title": clean_title,
-                            "duration": duration,
-                            "url": href,
-                            "page_url": href,           # Keep original page URL for reference
-                            "thumbnail": thumbnail,
-                            "views": views,
-                            "provider_id": self.provider.provider_id,
-                            "format": "mp4",
-                        }
-
-                        videos.append(video_data)
-                        logger.debug("Prepared video %d: %s", i + 1, video_data.get('title', 'No title'))
-
-                    except Exception as e:
-                        logger.warning("Error processing video container: %s", e, exc_info=True)
+            videos = self._parse_containers(containers)
+
+        # Debug: Log the actual HTML structure for troubleshooting
+        if not containers:
+            logger.warning("No video containers found. Page structure may have changed.")
+            # Log first few divs to help debug structure
+            all_divs = soup.find_all('div', limit=10)
+            for i, div in enumerate(all_divs):
+                logger.debug("Div %d classes: %s", i, div.get('class', []))
+
+        # Read the pager: XNXX numbers the pages from 0 as {category_url}/{N}
+        pagination = parse_pagination(html, page_url, page, page_number_parser(category_url, 1))
+        return {"videos": videos, "pagination": pagination}
+
+    def _parse_containers(self, containers: list) -> list[dict[str, Any]]:
+        """Build the media items of the video containers of a listing page"""
+        videos = []
+        if containers:
+            logger.info("Processing %d video containers found", len(containers))
+            for i, container in enumerate(containers):
+                try:
+                    # XNXX structure: .thumb-under p a contains the title and URL
+                    title_link = container.select_one(".thumb-under p a")
+                    if not title_link:
+                        logger.debug("No title link found in container")
                         continue
 
-                logger.info("Found %d videos from XNXX", len(videos))
-            else:
-                logger.info("No video containers found on XNXX page")
+                    href = title_link.get("href", "")
+                    if not href:
+                        logger.debug("No href found in title link")
+                        continue
 
-            # Apply limit if specified
-            if limit and len(videos) > limit:
-                logger.info("Limiting results from %d to %d videos", len(videos), limit)
-                videos = videos[:limit]
+                    if not href.startswith("http"):
+                        href = urljoin(self.provider.base_url, href)
 
-            logger.info("Returning %d videos (limit: %d)", len(videos), limit)
-            return videos
+                    # Get title from title attribute or text content
+                    title = title_link.get("title", "") or title_link.get_text(strip=True)
+                    if not title:
+                        logger.debug("No title found for href: %s", href)
+                        continue
 
-        except Exception as e:
-            logger.info("Error getting video list from XNXX: %s", e)
-            return []
+                    # Get thumbnail from .thumb img with data-src attribute
+                    img = container.select_one(".thumb img")
+                    thumbnail = ""
+                    if img:
+                        thumbnail = img.get("data-src", img.get("src", ""))
+                        if thumbnail and not thumbnail.startswith("http"):
+                            thumbnail = f"https:{thumbnail}" if thumbnail.startswith("//") else thumbnail
+
+                    # Get metadata (duration, views)
+                    duration = "Unknown"
+                    views = "0"
+
+                    metadata = container.select_one(".metadata")
+                    if metadata:
+                        # Views are in .right span
+                        views_elem = metadata.select_one(".right")
+                        if views_elem:
+                            views_text = views_elem.get_text(strip=True)
+                            views = views_text.split()[0] if views_text else "0"
+
+                    # Extract video title and clean it
+                    clean_title = sanitize_for_json(title)
+
+                    # Add the video without resolving the URL
+                    video_data = {
+                        "title": clean_title,
+                        "duration": duration,
+                        "url": href,
+                        "page_url": href,           # Keep original page URL for reference
+                        "thumbnail": thumbnail,
+                        "views": views,
+                        "provider_id": self.provider.provider_id,
+                        "format": "mp4",
+                    }
+
+                    videos.append(video_data)
+                    logger.debug("Prepared video %d: %s", i + 1, video_data.get('title', 'No title'))
+
+                except Exception as e:
+                    logger.warning("Error processing video container: %s", e, exc_info=True)
+                    continue
+
+            logger.info("Found %d videos from XNXX", len(videos))
+        else:
+            logger.info("No video containers found on XNXX page")
+
+        return videos
@@ -18,6 +18,8 @@ from auth_utils import get_headers
 from string_utils import sanitize_for_json
 from debug import get_logger
 from constants import MAX_CATEGORIES
+from ..area51.category_cache import CategoryCache, conditional_headers, response_validators
+from ..area51.metrics import span
 
 logger = get_logger(__file__)
 
@@ -29,24 +31,36 @@ class CategoryManager:
         """Initialize category manager with session and base provider utilities"""
         self.session = session
         self.base_provider = base_provider
-        self.base_url = "https://www.xvideos.com/"
+        self.base_url = base_provider.base_url
+        self.cache = CategoryCache(base_provider)
 
     def get_categories(self) -> list[dict[str, str]]:
+        """Get XVideos categories, served from the category cache when possible"""
+        return self.cache.get_categories(self._scrape_categories)
+
+    def _scrape_categories(self, validators: dict[str, str]) -> tuple[list[dict[str, str]] | None, dict[str, str]]:
         """Get XVideos categories by scraping multiple sources"""
         xvideos_categories = []
+        source_validators = {}
         headers = get_headers("browser")
+        labels = {"provider": self.base_provider.provider_id, "call": "categories"}
 
         # Try parsing JSON-LD data first
         try:
             # Try accessing a category page to get structured data
             for category_type in ("categories", "tags"):
                 try:
-                    url = f"{self.base_url}{category_type}"
-                    response = self.session.get(url, headers=headers, timeout=30)
-                    html = response.text
+                    page_url = f"{self.base_url}{category_type}"
+                    with span("fetch", **labels):
+                        response = self.session.get(page_url, headers={**headers, **conditional_headers(validators, page_url)}, timeout=30)
+                    if response.status_code == 304:
+                        return None, validators
+                    with span("decode", **labels):
+                        html = response.text
 
                     # Look for JSON-LD data
-                    json_ld_match = re.search(r'<script type="application/ld\+json"[^>]*>(.*?)</script>', html, re.DOTALL)
+                    with span("extract", **labels):
+                        json_ld_match = re.search(r'<script type="application/ld\+json"[^>]*>(.*?)</script>', html, re.DOTALL)
                     if json_ld_match:
                         try:
                             data = json.loads(json_ld_match.group(1))
@@ -66,14 +80,20 @@ class CategoryManager:
                             pass
 
                     if xvideos_categories:
+                        source_validators = response_validators(page_url, response)
                         break
                 except Exception:
                     continue
 
             # If still no categories, try regex parsing
             if not xvideos_categories:
-                response = self.session.get(self.base_url, headers=headers, timeout=30)
-                html = response.text
+                with span("fetch", **labels):
+                    response = self.session.get(self.base_url, headers={**headers, **conditional_headers(validators, self.base_url)}, timeout=30)
+                if response.status_code == 304:
+                    return None, validators
+                with span("decode", **labels):
+                    html = response.text
+                source_validators = response_validators(self.base_url, response)
 
                 # Regex patterns for category links
                 patterns = [
@@ -82,7 +102,8 @@ class CategoryManager:
                 ]
 
                 for pattern in patterns:
-                    matches = re.findall(pattern, html, re.IGNORECASE)
+                    with span("extract", **labels):
+                        matches = re.findall(pattern, html, re.IGNORECASE)
                     for href, name in matches:
                         if href and name and len(name.strip()) > 1:
                             # Clean up the name and URL
@@ -110,8 +131,8 @@ class CategoryManager:
             logger.info("XVideos categories loaded: %d", len(xvideos_categories))
 
             # Apply natural capping - return up to MAX_CATEGORIES if available
-            return xvideos_categories[:MAX_CATEGORIES] if len(xvideos_categories) > MAX_CATEGORIES else xvideos_categories
+            return (xvideos_categories[:MAX_CATEGORIES] if len(xvideos_categories) > MAX_CATEGORIES else xvideos_categories), source_validators
 
         except Exception as e:
             logger.info("Error getting XVideos categories: %s", e)
-            return []  # Return empty list instead of fallback
+            return [], {}  # Return empty list instead of fallback
@@ -12,21 +12,26 @@ specialized category and video managers for better code organization.
 from __future__ import annotations
 
 from typing import Any
+from urllib.parse import quote_plus
 from base_provider import BaseProvider
 from debug import get_logger
 from constants import MAX_VIDEOS
+from ..area51.site_mixins import SiteProvider
 from .category import CategoryManager
+from .resolver import Resolver
 from .video import VideoManager
 
 logger = get_logger(__file__)
 
 
-class Provider(BaseProvider):
-    """XVideos provider coordinator - delegates to specialized managers"""
+class Provider(SiteProvider, BaseProvider):
+    """XVideos provider coordinator - delegates to specialized managers, listing wiring in SiteProvider"""
+
+    resolver_class = Resolver
 
     def __init__(self, args: dict):
         super().__init__(args)
-        self.base_url = "https://www.xvideos.com/"
+        self.setup_site("https://www.xvideos.com/", args)
 
         # Initialize modular components
         self.category_manager = CategoryManager(self.session, self)
@@ -36,6 +41,8 @@ class Provider(BaseProvider):
         """Get XVideos categories - delegates to category manager"""
         return self.category_manager.get_categories()
 
-    def get_media_items(self, category: dict, page: int = 1, limit: int = MAX_VIDEOS) -> list[dict[str, Any]]:
-        """Get videos from category - delegates to video manager"""
-        return self.video_manager.get_media_items(category, page, limit)
+    def search(self, query: str, page: int = 1, limit: int = MAX_VIDEOS) -> list[dict[str, Any]]:
+        """Search videos, returns one result page in the site's rank order"""
+        # Search results are listed like a category under ?k=<term>, get_media_items() would sort them by title
+        category = {"name": query, "url": f"{self.base_url}?k={quote_plus(query.strip())}"}
+        return [video for batch in self.iter_media_items(category, page, limit) for video in batch]
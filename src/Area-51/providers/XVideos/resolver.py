@@ -12,51 +12,86 @@ This module contains the XVideos resolver class with methods for:
 
 from __future__ import annotations
 
-import re
-import json
 from typing import Any
 from auth_utils import AuthTokens
 from quality_utils import select_best_source, extract_metadata_from_url
 from debug import get_logger
 from base_resolver import BaseResolver
+from ..area51.resolve_cache import resolve_cache
+from ..area51.session_pool import session_pool
+from ..area51.fetch_methods import fetch_page, fetch_full_page
+from ..area51.site import url_origin
+from ..area51.html5player import SourceScanner, extract_sources
+from ..area51.metrics import span
+from ..area51.site_mixins import SiteResolver
 
 
 logger = get_logger(__file__)
 
+# Source kinds used by XVideos with their default quality, in priority order
+SOURCE_KINDS = (
+    ("hls", "adaptive", "HLS master playlist"),  # HLS adaptive streaming
+    ("low", "360p", "low quality MP4"),  # Typically low quality
+    ("high", "720p", "high quality MP4"),  # Typically high quality
+    ("json_ld", "720p", "JSON-LD content URL"),  # Usually high quality
+)
 
-class Resolver(BaseResolver):
+# Labels of the stage metrics of this resolver
+METRIC_LABELS = {"provider": "xvideos", "call": "resolve"}
+
+
+class Resolver(SiteResolver, BaseResolver):
     """XVideos URL resolver"""
 
     def __init__(self, args: dict):
         super().__init__(args)
         self.auth_tokens = AuthTokens()
+        # Share the pooled per-host session: kept-alive connections and persisted cookies
+        self.auth_tokens.session = session_pool.get_session(self.url, self.auth_tokens.session)
 
-    def resolve_url(self) -> dict[str, Any] | None:
-        """
-        Resolve XVideos video URL to streaming sources
-
-        Returns:
-            Dictionary with resolved status and sources list (no metadata)
-        """
+    def _resolve_url(self) -> dict[str, Any] | None:
+        """Resolve XVideos video URL to streaming sources, coalesced by SiteResolver.resolve_url()"""
         logger.info("Resolving XVideos URL: %s", self.url)
 
+        cached = resolve_cache.get(self.url, self.quality, self.av1)
+        if cached:
+            if cached.pop("alias", None):
+                # Resolved for another listing of the video, its session and headers belong to that site
+                cached.update(self._playback_auth())
+            logger.info("Using cached resolve result: %s", cached["resolved_url"][:100])
+            self.resolve_result.update(cached)
+            return self.resolve_result
+
         try:
-            # Use centralized authentication with fallback methods
-            html = self.auth_tokens.fetch_with_fallback(self.url, "https://www.xvideos.com")
+            # Try the best-known fetch method for this host, then centralized authentication with fallback methods
+            # Stream the page and stop reading once the html5player calls were seen
+            scanner = SourceScanner()
+            with span("fetch", **METRIC_LABELS):
+                html = fetch_page(self.auth_tokens, self.url, url_origin(self.url), scanner)
 
             if not html:
                 logger.error("Failed to fetch XVideos page content")
                 return None
 
             # Extract video sources from HTML
-            sources = self._extract_sources(html)
+            with span("extract", **METRIC_LABELS):
+                sources = self._extract_sources(html)
+
+            if not sources:
+                # The streamed part of the page may have been cut off before the sources, read all of it
+                with span("fetch", **METRIC_LABELS):
+                    html = fetch_full_page(self.auth_tokens, self.url, url_origin(self.url), scanner)
+                if html:
+                    with span("extract", **METRIC_LABELS):
+                        sources = self._extract_sources(html)
 
             if not sources:
                 logger.error("No video sources found")
                 return None
 
             # Select the optimal quality URL from available sources using quality and codec preferences
-            best_source = select_best_source(sources, self.quality, codec_aware=True, av1=self.av1)
+            with span("select", **METRIC_LABELS):
+                best_source = select_best_source(sources, self.quality, codec_aware=True, av1=self.av1)
             resolved_url = best_source["url"] if best_source else self.url
 
             logger.info("Selected quality: %s (requested: %s) - %s",
@@ -67,79 +102,55 @@ class Resolver(BaseResolver):
             # Determine recorder type based on URL characteristics
             recorder_id = self.determine_recorder_id(resolved_url)
 
-            # Generate FFmpeg headers for HLS recorders with proper cookie handling
-            ffmpeg_headers = self.auth_tokens.get_ffmpeg_headers()
-
-            self.resolve_result.update({
+            resolved = {
                 "resolved_url": resolved_url,
-                "ffmpeg_headers": ffmpeg_headers,  # Include FFmpeg headers for HLS recorders
-                "session": self.auth_tokens.session,  # Include authenticated session for reuse
                 "recorder_id": recorder_id,
-            })
+            }
+            resolved.update(self._playback_auth())
+            resolve_cache.put(self.url, self.quality, self.av1, resolved)
+            session_pool.save_cookies(self.url)
+            self.resolve_result.update(resolved)
             return self.resolve_result
 
         except Exception as e:
             logger.error("Error resolving XVideos URL: %s", e)
             return None
 
+    def _playback_auth(self) -> dict[str, Any]:
+        """Return the session and FFmpeg headers the player needs for the XVideos CDN"""
+        return {
+            "ffmpeg_headers": self.auth_tokens.get_ffmpeg_headers(),  # FFmpeg headers for HLS recorders, with the cookies
+            "session": self.auth_tokens.session,  # Authenticated session for reuse
+        }
+
     def _extract_sources(self, html: str) -> list[dict[str, Any]]:
         """Extract video sources from XVideos HTML"""
         sources = []
 
         try:
-            # Method 1: Extract from HTML5 player config
-            # This pattern looks for the JavaScript player initialization data
-            player_config_pattern = r'html5player\.setVideoHLS\(\'([^\']+)\'\)'
-            player_match = re.search(player_config_pattern, html)
-
-            if player_match:
-                # HLS master playlist (contains multiple qualities)
-                hls_url = player_match.group(1)
-                if hls_url:
-                    metadata = extract_metadata_from_url(hls_url)
-                    if not metadata["quality"]:
-                        metadata["quality"] = "adaptive"  # HLS adaptive streaming
-                    sources.append({"url": hls_url, **metadata})
-                    logger.info("Found HLS master playlist: %s", hls_url[:80] + "..." if len(hls_url) > 80 else hls_url)
-
-            # Method 2: Look for direct MP4 sources (multiple qualities)
-            mp4_low_pattern = r'html5player\.setVideoUrlLow\(\'([^\']+)\'\)'
-            mp4_high_pattern = r'html5player\.setVideoUrlHigh\(\'([^\']+)\'\)'
-
-            mp4_low_match = re.search(mp4_low_pattern, html)
-            if mp4_low_match and mp4_low_match.group(1):
-                mp4_low_url = mp4_low_match.group(1)
-                metadata = extract_metadata_from_url(mp4_low_url)
-                if not metadata["quality"]:
-                    metadata["quality"] = "360p"  # Typically low quality
-                sources.append({"url": mp4_low_url, **metadata})
-                logger.info("Found low quality MP4: %s", mp4_low_url[:80] + "..." if len(mp4_low_url) > 80 else mp4_low_url)
-
-            mp4_high_match = re.search(mp4_high_pattern, html)
-            if mp4_high_match and mp4_high_match.group(1):
-                mp4_high_url = mp4_high_match.group(1)
-                metadata = extract_metadata_from_url(mp4_high_url)
+            # Scan the page once for the HTML5 player calls and JSON-LD metadata,
+            # keeping the first candidate of each kind
+            candidates = {}
+            for candidate in extract_sources(html):
+                candidates.setdefault(candidate.kind, candidate)
+
+            # Method 1: HLS master playlist (contains multiple qualities)
+            # Method 2: Direct MP4 sources (multiple qualities)
+            # Method 4: JSON-LD metadata
+            for kind, default_quality, description in SOURCE_KINDS:
+                candidate = candidates.get(kind)
+                if not candidate:
+                    continue
+
+                # Only add JSON-LD URL if we don't already have this URL
+                if any(s["url"] == candidate.url for s in sources):
+                    continue
+
+                metadata = extract_metadata_from_url(candidate.url)
                 if not metadata["quality"]:
-                    metadata["quality"] = "720p"  # Typically high quality
-                sources.append({"url": mp4_high_url, **metadata})
-                logger.info("Found high quality MP4: %s", mp4_high_url[:80] + "..." if len(mp4_high_url) > 80 else mp4_high_url)
-
-            # Method 4: Extract from JSON-LD metadata
-            json_ld_pattern = r'<script type="application/ld\+json">([^<]+)</script>'
-            json_ld_match = re.search(json_ld_pattern, html)
-            if json_ld_match:
-                try:
-                    json_ld = json.loads(json_ld_match.group(1))
-                    if "contentUrl" in json_ld:
-                        content_url = json_ld["contentUrl"]
-                        # Only add if we don't already have this URL
-                        if not any(s["url"] == content_url for s in sources):
-                            metadata = extract_metadata_from_url(content_url)
-                            if not metadata["quality"]:
-                                metadata["quality"] = "720p"  # Usually high quality
-                            sources.append({"url": content_url, **metadata})
-                except json.JSONDecodeError:
-                    logger.warning("Failed to parse JSON-LD metadata")
+                    metadata["quality"] = default_quality
+                sources.append({"url": candidate.url, **metadata})
+                logger.info("Found %s: %s", description, candidate.url[:80] + "..." if len(candidate.url) > 80 else candidate.url)
 
             # Sorting is now handled internally by select_best_source()
             return sources
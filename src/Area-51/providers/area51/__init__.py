@@ -0,0 +1,4 @@
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""Shared helpers used by the Area-51 site packages."""
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Batch Resolve
+
+This module contains the batch resolution behind Provider.resolve_many(),
+used for queue playback and "play all in category":
+- The URLs are resolved concurrently, at most BATCH_CONCURRENCY at a time
+- All resolvers of a site share its pooled session (see session_pool.py),
+  so the batch reuses one set of kept-alive connections and cookies
+- Cached, coalesced and pre-resolved videos are served like single calls
+- Results are returned in input order, a failing URL only fails its own
+  entry
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from debug import get_logger
+from .session_pool import POOL_MAXSIZE
+from .metrics import count
+
+logger = get_logger(__file__)
+
+# Resolutions at the same time per batch, stays within the connections of one session pool
+BATCH_CONCURRENCY = min(4, POOL_MAXSIZE)
+
+
+def resolve_many(resolver_class: Callable[[dict], Any], provider_id: str, urls: list[str], quality: str, av1: bool = False,
+                 concurrency: int = BATCH_CONCURRENCY) -> list[dict[str, Any]]:
+    """
+    Resolve video page URLs concurrently
+
+    Args:
+        resolver_class: Resolver of the provider, called with the resolver args
+        provider_id: Provider of the URLs
+        urls: Video page URLs
+        quality: Requested quality, e.g. "1080p"
+        av1: True to prefer AV1 sources
+        concurrency: Maximum number of resolutions at the same time
+
+    Returns:
+        list: One dict per URL in input order: "url", "result" (the resolve
+            result, None on failure) and "error" (None on success)
+    """
+    def resolve(url: str) -> dict[str, Any]:
+        try:
+            result = resolver_class({"provider_id": provider_id, "url": url, "quality": quality, "av1": av1}).resolve_url()
+        except Exception as e:
+            logger.info("Batch resolve of %s failed: %s", url, e)
+            count("batch_resolve", provider=provider_id, result="error")
+            return {"url": url, "result": None, "error": str(e) or type(e).__name__}
+        if not result:
+            count("batch_resolve", provider=provider_id, result="error")
+            return {"url": url, "result": None, "error": "No playable source found"}
+        count("batch_resolve", provider=provider_id, result="ok")
+        return {"url": url, "result": result, "error": None}
+
+    if not urls:
+        return []
+    logger.info("Resolving %d %s URLs, %d at a time", len(urls), provider_id, min(concurrency, len(urls)))
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(urls))), thread_name_prefix="area51-batch") as executor:
+        results = list(executor.map(resolve, urls))
+    logger.info("Resolved %d of %d %s URLs", sum(1 for item in results if item["result"]), len(urls), provider_id)
+    return results
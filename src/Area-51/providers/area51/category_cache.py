@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Category Cache
+
+This module contains the persistent category cache shared by the providers:
+- Category lists are stored as JSON under provider.data_dir, keyed by provider_id
+- Fresh entries are served without any network round trip
+- Expired entries are served stale while a background refresh revalidates them
+  with ETag/Last-Modified conditional requests
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import threading
+from typing import Any, Callable
+from debug import get_logger
+
+logger = get_logger(__file__)
+
+# Seconds a cached category list is served before it gets revalidated
+CATEGORY_CACHE_TTL = 24 * 60 * 60
+
+
+def conditional_headers(validators: dict[str, str], url: str) -> dict[str, str]:
+    """
+    Build conditional request headers from stored validators
+
+    Args:
+        validators: Validators as returned by response_validators()
+        url: URL about to be requested, validators only apply to the URL they came from
+
+    Returns:
+        dict: If-None-Match/If-Modified-Since headers (may be empty)
+    """
+    headers = {}
+    if validators.get("url") != url:
+        return headers
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def response_validators(url: str, response) -> dict[str, str]:
+    """Extract ETag/Last-Modified validators from a response to url"""
+    return {
+        "url": url,
+        "etag": response.headers.get("ETag", ""),
+        "last_modified": response.headers.get("Last-Modified", ""),
+    }
+
+
+class CategoryCache:
+    """Persistent per-provider category cache with TTL and stale-while-revalidate"""
+
+    def __init__(self, provider, ttl: int = CATEGORY_CACHE_TTL):
+        """Initialize cache for provider, entries live in provider.data_dir if available"""
+        self.provider_id = provider.provider_id
+        self.ttl = ttl
+        self.path = os.path.join(provider.data_dir, f"categories_{self.provider_id}.json") if provider.data_dir else None
+        self.entry = None
+        self.lock = threading.Lock()
+        self.refreshing = False
+
+    def get_categories(self, loader: Callable[[dict[str, str]], tuple[list[dict[str, Any]] | None, dict[str, str]]]) -> list[dict[str, Any]]:
+        """
+        Get categories from cache, falling back to loader
+
+        Args:
+            loader: Callable receiving the stored validators and returning
+                (categories, validators); categories is None if the site
+                answered 304 Not Modified
+
+        Returns:
+            list: Category list
+        """
+        entry = self._load_entry()
+        if entry and entry.get("categories"):
+            age = time.time() - entry.get("timestamp", 0)
+            if age < self.ttl:
+                logger.info("Serving %d cached %s categories (age: %ds)", len(entry["categories"]), self.provider_id, age)
+                return list(entry["categories"])
+
+            logger.info("Cached %s categories expired (age: %ds), refreshing in background", self.provider_id, age)
+            self._refresh_in_background(loader)
+            return list(entry["categories"])
+
+        return self._refresh(loader)
+
+    def _refresh(self, loader) -> list[dict[str, Any]]:
+        """Revalidate or reload categories and store the result"""
+        entry = self._load_entry() or {}
+        categories, validators = loader(entry.get("validators", {}))
+
+        if categories is None:
+            logger.info("%s categories not modified, extending cache lifetime", self.provider_id)
+            categories = entry.get("categories", [])
+
+        # Don't cache failures, the next call should try again
+        if categories:
+            self._store(categories, validators)
+        return list(categories)
+
+    def _refresh_in_background(self, loader):
+        """Start a background refresh unless one is already running"""
+        with self.lock:
+            if self.refreshing:
+                return
+            self.refreshing = True
+
+        def refresh():
+            try:
+                self._refresh(loader)
+            except Exception as e:
+                logger.info("Background refresh of %s categories failed: %s", self.provider_id, e)
+            finally:
+                with self.lock:
+                    self.refreshing = False
+
+        threading.Thread(target=refresh, name=f"{self.provider_id}-categories", daemon=True).start()
+
+    def _load_entry(self) -> dict[str, Any] | None:
+        """Return the in-memory entry, loading it from disk on first use"""
+        with self.lock:
+            if self.entry is None and self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self.entry = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.info("Ignoring unreadable category cache %s: %s", self.path, e)
+            return self.entry
+
+    def _store(self, categories: list[dict[str, Any]], validators: dict[str, str]):
+        """Store categories in memory and atomically on disk"""
+        entry = {
+            "provider_id": self.provider_id,
+            "timestamp": time.time(),
+            "validators": validators,
+            "categories": categories,
+        }
+        with self.lock:
+            self.entry = entry
+            if not self.path:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entry, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.info("Failed to write category cache %s: %s", self.path, e)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Duplicate Detection
+
+This module contains the duplicate index of the listed and resolved videos:
+- dedup_keys() reduces a media item to the keys that identify its video:
+  the provider's video ID (xHamster slugs are reduced to their ID), the
+  media hash of the shared xvideos/xnxx CDN paths and the thumbnail stem
+- Two items sharing any key are the same video, even when listed by
+  different providers under different page URLs
+- collapse() drops duplicates from merged feeds in O(1) per item
+- The index remembers the page URL that first listed each key, so the
+  resolve cache can serve a video resolved under another provider
+  (aliases()); resolved stream URLs add their media hash too
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable
+from urllib.parse import urlsplit
+from .listing import video_id
+
+# Keys kept, least recently added dropped first
+MAX_KEYS = 20000
+# Page URLs whose keys are kept for aliases(), least recently added dropped first
+MAX_URLS = 20000
+
+# 32 hex digit media hash in xvideos/xnxx CDN paths, shared by thumbnails and streams:
+# /videos/thumbs169xnxx/ab/cd/ef/<hash>/<hash>.12.jpg, /videos/hls/ab/cd/ef/<hash>/hls.m3u8
+MEDIA_HASH_PATTERN = re.compile(r'/([0-9a-f]{32})(?:/|\.|$)', re.IGNORECASE)
+# Image extension and thumbnail index suffix removed from thumbnail paths: <stem>.12.jpg, <stem>_3.webp
+THUMB_SUFFIX_PATTERN = re.compile(r'(?:[._-]\d{1,3})?\.(?:jpe?g|png|webp|gif|avif)$', re.IGNORECASE)
+# Last path segments naming a size or frame instead of the video: 320x180, 1_160, 12
+THUMB_SIZE_SEGMENT_PATTERN = re.compile(r'/(?:\d+x\d+|\d+(?:_\d+)?)$')
+# Shorter thumbnail stems are too generic to identify a video
+MIN_STEM_LENGTH = 12
+
+
+def media_hash(url: str) -> str | None:
+    """Return the CDN media hash in url, None if it has none"""
+    match = MEDIA_HASH_PATTERN.search(urlsplit(url).path) if url else None
+    return match.group(1).lower() if match else None
+
+
+def thumbnail_stem(url: str) -> str | None:
+    """Return the thumbnail path without extension, frame index and size, None if too generic"""
+    if not url:
+        return None
+    parts = urlsplit(url)
+    stem = THUMB_SUFFIX_PATTERN.sub("", parts.path)
+    stem = THUMB_SIZE_SEGMENT_PATTERN.sub("", stem).rstrip("/")
+    if len(stem) < MIN_STEM_LENGTH:
+        return None
+    # Mirrors of the same CDN differ in the first host label only: cdn77-pic.xvideos-cdn.com, img-l3.xvideos-cdn.com
+    host = parts.netloc.lower().split(".", 1)[-1]
+    return f"{host}{stem}"
+
+
+def dedup_keys(item: dict[str, Any]) -> tuple[str, ...]:
+    """Return the keys identifying the video of a media item"""
+    keys = []
+    url = item.get("url", "")
+    if url:
+        keys.append(f"id:{item.get('provider_id', '')}:{video_id(url)}")
+    thumbnail = item.get("thumbnail", "")
+    media = media_hash(thumbnail) or media_hash(url)
+    if media:
+        keys.append(f"media:{media}")
+    else:
+        stem = thumbnail_stem(thumbnail)
+        if stem:
+            keys.append(f"thumb:{stem}")
+    return tuple(keys)
+
+
+class DedupIndex:
+    """Thread-safe bounded map of dedup keys to the page URL that first listed them"""
+
+    def __init__(self, max_keys: int = MAX_KEYS, max_urls: int = MAX_URLS):
+        self.max_keys = max_keys
+        self.max_urls = max_urls
+        self.lock = threading.Lock()
+        self.pages = OrderedDict()  # key -> page URL
+        self.keys = OrderedDict()  # page URL -> its keys, also of URLs that own none of them
+
+    def add(self, item: dict[str, Any]) -> str | None:
+        """Register a media item, returns the page URL of an earlier listing of the same video"""
+        url = item.get("url", "")
+        keys = dedup_keys(item)
+        if not url or not keys:
+            return None
+        return self._add(url, keys)
+
+    def add_items(self, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Register the media items of a listing, returns items unchanged"""
+        for item in items:
+            self.add(item)
+        return items
+
+    def add_resolved(self, page_url: str, resolved_url: str):
+        """Register the media hash of a resolved stream URL for its page URL"""
+        media = media_hash(resolved_url)
+        if media:
+            self._add(page_url, (f"media:{media}",))
+
+    def aliases(self, page_url: str) -> list[str]:
+        """Return the other page URLs of the video listed at page_url"""
+        with self.lock:
+            return list(dict.fromkeys(
+                self.pages[key] for key in self.keys.get(page_url, ())
+                if key in self.pages and self.pages[key] != page_url
+            ))
+
+    def _add(self, url: str, keys: tuple[str, ...]) -> str | None:
+        with self.lock:
+            known = self.keys.get(url, ())
+            self.keys[url] = tuple(dict.fromkeys(known + keys))
+            self.keys.move_to_end(url)
+            first = None
+            for key in keys:
+                page = self.pages.get(key)
+                if page is None:
+                    self.pages[key] = url
+                else:
+                    self.pages.move_to_end(key)
+                    if first is None and page != url:
+                        first = page
+            while len(self.pages) > self.max_keys:
+                key, page = self.pages.popitem(last=False)
+                remaining = tuple(other for other in self.keys.get(page, ()) if other != key)
+                if remaining:
+                    self.keys[page] = remaining
+                else:
+                    self.keys.pop(page, None)
+            while len(self.keys) > self.max_urls:
+                self.keys.popitem(last=False)
+            return first
+
+    def clear(self):
+        with self.lock:
+            self.pages.clear()
+            self.keys.clear()
+
+
+def collapse(items: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Drop later listings of videos already in items, e.g. of a merged feed
+
+    Args:
+        items: Media items, best first
+
+    Returns:
+        list: First item of every video, in the original order
+    """
+    seen = set()
+    unique = []
+    for item in items:
+        keys = dedup_keys(item)
+        if seen.intersection(keys):
+            continue
+        seen.update(keys)
+        unique.append(item)
+    return unique
+
+
+dedup_index = DedupIndex()
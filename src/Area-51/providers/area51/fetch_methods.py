@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Fetch Method Statistics
+
+This module remembers which page fetch method works for each site host:
+- Every resolver page fetch is recorded per host and method with its
+  success rate and latency
+- Later fetches try the best-known method first, so a site that always
+  needs the heavy anti-bot path stops paying for failing cheap attempts
+- AuthTokens.fetch_with_fallback() remains the fallback for everything else,
+  its method names are mapped to the direct methods by HOST_METHODS; an
+  unmapped name is counted as fetch result=unmapped_method and logged
+- A host without statistics probes PROBE_METHOD once, so learning does not
+  depend on the fallback reporting a mapped name
+- Statistics are written to STATE_DIR at most every SAVE_INTERVAL seconds
+  and at exit, not on every fetch
+- Direct requests can stream the page and stop reading once a scanner has
+  seen the required sources (see page_stream); fetch_full_page() reads
+  the whole page when the cut-off part held no sources
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import atexit
+import threading
+from typing import Any, Callable
+from auth_utils import get_headers
+from debug import get_logger
+from .session_pool import STATE_DIR, host_key
+from .page_stream import Scanner, stream_text
+from .metrics import count
+
+try:
+    import cloudscraper
+except ImportError:
+    cloudscraper = None
+
+logger = get_logger(__file__)
+
+# Minimum success rate for a learned method to be tried first
+MIN_SUCCESS_RATE = 0.5
+# Weight of the latest sample in the latency moving average
+LATENCY_WEIGHT = 0.3
+# Seconds between two writes of the statistics file, the rest is written at exit
+SAVE_INTERVAL = 60
+# Markers of anti-bot challenge pages that must not count as success
+CHALLENGE_MARKERS = ("Just a moment...", "cf-browser-verification", "challenge-platform", "Attention Required!")
+
+
+def _read_page(response, scanner: Scanner | None = None) -> str | None:
+    """Return the page text of a successful, non-challenge response"""
+    if response.status_code != 200:
+        response.close()
+        return None
+    text = stream_text(response, scanner) if scanner else response.text
+    if not text or any(marker in text[:4096] for marker in CHALLENGE_MARKERS):
+        return None
+    return text
+
+
+def _fetch_requests(session, url: str, _origin: str, scanner: Scanner | None = None) -> str | None:
+    """Plain request with the session defaults"""
+    return _read_page(session.get(url, timeout=30, stream=scanner is not None), scanner)
+
+
+def _fetch_browser(session, url: str, origin: str, scanner: Scanner | None = None) -> str | None:
+    """Request with full browser headers"""
+    headers = {**get_headers("browser"), "Referer": origin + "/", "Origin": origin}
+    return _read_page(session.get(url, headers=headers, timeout=30, stream=scanner is not None), scanner)
+
+
+def _fetch_cloudscraper(session, url: str, origin: str, _scanner: Scanner | None = None) -> str | None:
+    """Request through cloudscraper, sharing cookies so clearance cookies land in the session"""
+    if cloudscraper is None:
+        return None
+    scraper = cloudscraper.create_scraper(sess=session)
+    # Challenge solving needs the full body, no streaming here
+    return _read_page(scraper.get(url, headers={"Referer": origin + "/"}, timeout=30))
+
+
+# Methods that can be tried directly
+DIRECT_METHODS: dict[str, Callable[..., str | None]] = {
+    "requests": _fetch_requests,
+    "browser": _fetch_browser,
+    "cloudscraper": _fetch_cloudscraper,
+}
+
+# Cheapest direct method, tried once on hosts without statistics
+PROBE_METHOD = "requests"
+
+# AuthTokens.method values set by fetch_with_fallback() of the StreamingServer host module
+# auth_utils.py -> direct method doing the same request. The host is not part of this
+# repository; benchmarks/test_fetch_methods.py resolves the fixtures with the installed
+# AuthTokens and fails when the method it reports is missing here. Unmapped methods are
+# recorded as "fallback:<name>" and never tried directly
+HOST_METHODS = {
+    "requests": "requests",
+    "session": "requests",
+    "direct": "requests",
+    "browser": "browser",
+    "browser_headers": "browser",
+    "enhanced_headers": "browser",
+    "cloudscraper": "cloudscraper",
+    "cloudflare": "cloudscraper",
+}
+
+
+def direct_method(host_method: str | None) -> str | None:
+    """Return the direct method equivalent to an AuthTokens.method value, None if there is none"""
+    return HOST_METHODS.get((host_method or "").lower())
+
+
+# Unmapped AuthTokens.method values already logged
+unmapped_methods = set()
+
+
+class FetchStats:
+    """Per-host success rate and latency of page fetch methods"""
+
+    def __init__(self, path: str = os.path.join(STATE_DIR, "fetch_methods.json"), save_interval: float = SAVE_INTERVAL):
+        self.path = path
+        self.save_interval = save_interval
+        self.lock = threading.Lock()
+        self.hosts = self._load()
+        self.dirty = False
+        self.saved = time.monotonic()
+
+    def record(self, host: str, method: str, success: bool, latency: float):
+        """Record the outcome of one fetch, the file is written at most every save_interval seconds"""
+        with self.lock:
+            stats = self.hosts.setdefault(host, {}).setdefault(method, {"attempts": 0, "successes": 0, "latency": latency})
+            stats["attempts"] += 1
+            if success:
+                stats["successes"] += 1
+                stats["latency"] = (1 - LATENCY_WEIGHT) * stats["latency"] + LATENCY_WEIGHT * latency
+            self.dirty = True
+            due = time.monotonic() - self.saved >= self.save_interval
+        if due:
+            self.flush()
+
+    def tried(self, host: str, method: str) -> bool:
+        """Return True if method was attempted for host before"""
+        with self.lock:
+            return method in self.hosts.get(host, {})
+
+    def best_method(self, host: str) -> str | None:
+        """Return the direct method with the best success rate (then latency) for host, None if unknown"""
+        with self.lock:
+            candidates = [
+                (stats["successes"] / stats["attempts"], -stats["latency"], method)
+                for method, stats in self.hosts.get(host, {}).items()
+                if method in DIRECT_METHODS and stats["attempts"] and stats["successes"] / stats["attempts"] >= MIN_SUCCESS_RATE
+            ]
+        return max(candidates)[2] if candidates else None
+
+    def flush(self):
+        """Write the statistics if they changed since the last write"""
+        with self.lock:
+            if not self.dirty:
+                return
+            data = json.dumps(self.hosts)
+            self.dirty = False
+            self.saved = time.monotonic()
+        self._save(data)
+
+    def _load(self) -> dict[str, dict[str, dict[str, Any]]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data: str):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{threading.get_ident()}.tmp"  # Concurrent flushes must not share the file
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.info("Failed to save fetch statistics: %s", e)
+
+
+fetch_stats = FetchStats()
+atexit.register(fetch_stats.flush)
+
+
+def fetch_page(auth_tokens, url: str, origin: str, scanner: Scanner | None = None) -> str | None:
+    """
+    Fetch a video page trying the best-known method for its host first
+
+    Args:
+        auth_tokens: AuthTokens instance of the resolver
+        url: Page URL
+        origin: Site origin used for Referer/Origin headers
+        scanner: Optional scanner, lets direct requests stop reading once
+            the required sources were seen
+
+    Returns:
+        str: Page HTML or None if all methods failed
+    """
+    host = host_key(url)
+    method = fetch_stats.best_method(host)
+    if method is None and not fetch_stats.tried(host, PROBE_METHOD):
+        method = PROBE_METHOD
+
+    if method in DIRECT_METHODS:
+        start = time.monotonic()
+        try:
+            html = DIRECT_METHODS[method](auth_tokens.session, url, origin, scanner)
+        except Exception as e:
+            logger.info("Direct method %s failed for %s: %s", method, host, e)
+            html = None
+        fetch_stats.record(host, method, bool(html), time.monotonic() - start)
+        if html:
+            logger.info("Fetched %s using direct method: %s", host, method)
+            auth_tokens.method = method
+            return html
+
+    start = time.monotonic()
+    html = auth_tokens.fetch_with_fallback(url, origin)
+    host_method = getattr(auth_tokens, "method", None)
+    method = direct_method(host_method)
+    if method is None:
+        method = f"fallback:{host_method or 'unknown'}"
+        count("fetch", host=host, result="unmapped_method", method=host_method or "unknown")
+        if host_method not in unmapped_methods:
+            unmapped_methods.add(host_method)
+            logger.warning("AuthTokens method %s is missing in HOST_METHODS, %s can't learn it", host_method, host)
+    fetch_stats.record(host, method, bool(html), time.monotonic() - start)
+    return html
+
+
+def fetch_full_page(auth_tokens, url: str, origin: str, scanner: Scanner | None) -> str | None:
+    """
+    Fetch a video page again without scanner after its cut-off text held no sources
+
+    Args:
+        auth_tokens: AuthTokens instance of the resolver
+        url: Page URL
+        origin: Site origin used for Referer/Origin headers
+        scanner: Scanner of the first fetch_page() call
+
+    Returns:
+        str: Full page HTML, None if the first read was already the full page
+            or the fetch failed
+    """
+    if scanner is None or not scanner.complete:
+        return None
+    logger.info("No sources in the streamed part of %s, fetching the full page", url)
+    count("fetch", host=host_key(url), result="full_refetch")
+    return fetch_page(auth_tokens, url, origin)
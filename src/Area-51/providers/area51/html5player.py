@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+HTML5 Player Source Extraction
+
+This module contains the single-pass source extractor for the xvideos-style
+html5player pages served by XNXX and XVideos. One precompiled alternation
+finds all of these in a single scan of the page:
+- html5player.setVideoHLS/setVideoUrlLow/setVideoUrlHigh calls
+- html5player.setVideoUrl<resolution> calls
+- generic setVideoUrl/video_url/url/file/hls assignments
+- JSON-LD contentUrl entries
+
+Quality fallback rules stay with the resolvers, the extractor only reports
+what the page says. SourceScanner runs the same extraction incrementally on
+a streamed page so the download can stop once the player calls were seen.
+"""
+
+from __future__ import annotations
+
+import re
+import json
+from typing import NamedTuple
+from .page_stream import SCAN_OVERLAP
+
+
+class SourceCandidate(NamedTuple):
+    """Video source found on a player page"""
+    url: str  # Absolute URL with JavaScript escaping removed
+    kind: str  # "hls", "low", "high", "resolution", "generic", "json_ld"
+    quality: str  # Quality hint from the page ("360p", "adaptive", ...), "" if unknown
+
+
+# The leading lookahead lets the scan skip positions that can't start any branch
+SOURCE_PATTERN = re.compile(
+    r'(?=[hsv"\'<])(?:'
+    r'html5player\.setVideo(?P<call>UrlLow|UrlHigh|HLS|Url(?P<res>\d{3,4}p))\(["\'](?P<call_url>[^"\']+)["\']'
+    r'|setVideoUrl\(["\'](?P<set_url>[^"\']+)["\']'
+    r'|video_url["\']?\s*[:=]\s*["\'](?P<video_url>[^"\']+)["\']'
+    r'|["\'](?:url["\']?\s*[:=]\s*["\'](?P<media_url>[^"\']+\.(?:mp4|m3u8)[^"\']*)'
+    r'|file["\']?\s*:\s*["\'](?P<file_url>[^"\']+\.mp4[^"\']*)'
+    r'|hls["\']?\s*[:=]\s*["\'](?P<hls_url>[^"\']+\.m3u8[^"\']*))["\']'
+    r'|<script[^>]*type=["\']application/ld\+json["\'][^>]*>(?P<json_ld>[\s\S]*?)</script>'
+    r')',
+    re.IGNORECASE
+)
+
+# Quality hints of the html5player calls
+CALL_KINDS = {
+    "urllow": ("low", "360p"),
+    "urlhigh": ("high", "720p"),
+    "hls": ("hls", "adaptive"),
+}
+
+
+def clean_url(url: str) -> str:
+    """Remove JavaScript escaping and make protocol-relative URLs absolute"""
+    url = url.replace("\\/", "/").replace("\\", "")
+    return "https:" + url if url.startswith("//") else url
+
+
+def candidate_from_match(match: re.Match) -> list[SourceCandidate]:
+    """Convert one SOURCE_PATTERN match into source candidates"""
+    groups = match.groupdict()
+
+    if groups["json_ld"] is not None:
+        try:
+            data = json.loads(groups["json_ld"])
+        except ValueError:
+            return []
+        entries = data if isinstance(data, list) else [data]
+        return [
+            SourceCandidate(clean_url(entry["contentUrl"]), "json_ld", "")
+            for entry in entries
+            if isinstance(entry, dict) and isinstance(entry.get("contentUrl"), str)
+        ]
+
+    if groups["call_url"] is not None:
+        url = groups["call_url"]
+        if groups["res"]:
+            kind, quality = "resolution", groups["res"].lower()
+        else:
+            kind, quality = CALL_KINDS[groups["call"].lower()]
+    elif groups["hls_url"] is not None:
+        url, kind, quality = groups["hls_url"], "generic", "adaptive"
+    elif groups["media_url"] is not None:
+        url = groups["media_url"]
+        kind, quality = "generic", "adaptive" if ".m3u8" in url.lower() else ""
+    else:
+        url, kind, quality = groups["set_url"] or groups["video_url"] or groups["file_url"], "generic", ""
+
+    # Skip relative paths and placeholders, player URLs are always absolute
+    if "http" not in url and not url.startswith("//"):
+        return []
+    return [SourceCandidate(clean_url(url), kind, quality)]
+
+
+def extract_sources(html: str) -> list[SourceCandidate]:
+    """
+    Extract all video source candidates from a player page in a single pass
+
+    Args:
+        html: Video page HTML
+
+    Returns:
+        list: Source candidates in document order
+    """
+    candidates = []
+    for match in SOURCE_PATTERN.finditer(html):
+        candidates.extend(candidate_from_match(match))
+    return candidates
+
+
+class SourceScanner:
+    """Incremental extractor for streamed player pages, see page_stream.stream_text()"""
+
+    def __init__(self, required: tuple[str, ...] = ("high", "hls"), overlap: int = SCAN_OVERLAP):
+        """Complete once a candidate of every required kind has been seen"""
+        self.required = set(required)
+        self.overlap = overlap
+        self.found = {}
+        self.complete = False
+        self.tail = ""
+
+    def feed(self, text: str) -> bool:
+        window = self.tail + text
+        for match in SOURCE_PATTERN.finditer(window):
+            for candidate in candidate_from_match(match):
+                self.found.setdefault(candidate.kind, candidate)
+        self.tail = window[-self.overlap:]
+        self.complete = self.required <= self.found.keys()
+        return self.complete
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Media Listing Helpers
+
+This module contains helpers shared by the provider video managers for
+working with streamed media item batches:
+- sort_media_items() merges batches into one list sorted by title
+- video_id() reduces a video page URL to the site's video ID
+- ListingCursor pages through a listing that repeats videos across its
+  pages: it remembers the IDs already shown since page 1 and fetches
+  further site pages until a screen of new videos is full, within a
+  fetch budget; ListingCursors keeps one cursor per category
+- Batches are yielded without holding the cursor lock, a second request
+  for the same category waits until the first has built its screen
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Iterator
+from urllib.parse import urlsplit
+from debug import get_logger
+
+logger = get_logger(__file__)
+
+# Site pages a cursor downloads at most to fill one screen
+FETCH_BUDGET = 5
+# Categories with a cursor kept, least recently used dropped first
+MAX_CURSORS = 8
+# Seconds a request waits for another one building screens of the same cursor, then takes over
+BUILD_WAIT = 15.0
+
+# Video ID in video page URLs, e.g. /video.oheokld0b1/title, /video-1abc2/title or /video12345678/title;
+# the ID follows a separator or is all digits, so /videos/<slug> never yields the ID "s"
+VIDEO_ID_PATTERN = re.compile(r'/video(?:[.-]([A-Za-z0-9_]+)|(\d+))(?:/|$)')
+# Video ID at the end of a slug, e.g. /videos/some-title-xhAb12c, the slug changes with the title
+SLUG_ID_PATTERN = re.compile(r'/videos/[^/]*-([A-Za-z0-9]+)/?$')
+
+
+def sort_media_items(batches: Iterable[list[dict[str, Any]]], limit: int | None = None) -> list[dict[str, Any]]:
+    """
+    Merge streamed media item batches into one alphabetically sorted list
+
+    Args:
+        batches: Batches as yielded by a provider's iter_media_items()
+        limit: Optional maximum number of items to return
+
+    Returns:
+        list: All items sorted by title
+    """
+    items = [item for batch in batches for item in batch]
+    items.sort(key=lambda x: x['title'].lower())
+    return items[:limit] if limit else items
+
+
+def video_id(url: str) -> str:
+    """Return the video ID of a video page URL, its lowercased path if it has none"""
+    path = urlsplit(url).path
+    match = VIDEO_ID_PATTERN.search(path)
+    if match:
+        return match.group(1) or match.group(2)
+    match = SLUG_ID_PATTERN.search(path)
+    return match.group(1) if match else path.rstrip("/").lower()
+
+
+class ListingCursor:
+    """Position in a listing whose site pages repeat videos, see ListingCursors"""
+
+    def __init__(self, fetch_budget: int = FETCH_BUDGET):
+        self.fetch_budget = fetch_budget
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)  # Notified when no request is building a screen
+        self.builder = None  # Token of the iter_screen() call building screens
+        self.reset()
+
+    def reset(self):
+        self.next_page = 1  # Next site page to download
+        self.exhausted = False  # The last site page was downloaded
+        self.seen = set()  # Video IDs shown or buffered since page 1
+        self.buffer = []  # New videos of the last site page beyond the previous screen
+        self.screens = {}  # Screen page -> videos, for paging back
+
+    def iter_screen(self, page: int, fetch: Callable[[int], dict[str, Any]], limit: int) -> Iterator[list[dict[str, Any]]]:
+        """
+        Yield the new videos of screen page as soon as each site page is parsed
+
+        Screens are built in order from the site pages after the previous
+        screen, earlier screens are built first when the host skips ahead.
+        One call at a time builds screens, the lock is only held to update
+        the cursor, never while downloading or yielding.
+
+        Args:
+            page: Screen page, 1-based; page 1 starts a new browsing session
+            fetch: Site page number -> dict with "videos" and "pagination"
+            limit: Videos per screen
+
+        Yields:
+            list: Batches of videos not shown on an earlier screen
+        """
+        token = object()
+        with self.lock:
+            self._claim(token)
+            if page <= 1:
+                self.reset()
+        try:
+            while True:
+                with self.lock:
+                    filled = len(self.screens)
+                    if self.builder is not token or filled >= page - 1 or not self._can_fill():
+                        break
+                for _batch in self._fill(filled + 1, fetch, limit, token):
+                    pass
+                with self.lock:
+                    if len(self.screens) == filled:
+                        return  # The site page failed, nothing to skip ahead to
+            with self.lock:
+                screen = self.screens.get(page)
+                ready = self.builder is token and len(self.screens) == page - 1
+            if screen is not None:
+                yield screen
+            elif ready:
+                yield from self._fill(page, fetch, limit, token)
+        finally:
+            with self.lock:
+                if self.builder is token:
+                    self.builder = None
+                    self.idle.notify_all()
+
+    def _claim(self, token: object):
+        """Wait until no other call builds screens, then build them as token; call with the lock held"""
+        deadline = time.monotonic() + BUILD_WAIT
+        while self.builder is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.info("Listing screen still being built after %.0fs, taking over", BUILD_WAIT)
+                break
+            self.idle.wait(remaining)
+        self.builder = token
+
+    def _can_fill(self) -> bool:
+        return bool(self.buffer) or not self.exhausted
+
+    def _fill(self, page: int, fetch: Callable[[int], dict[str, Any]], limit: int, token: object) -> Iterator[list[dict[str, Any]]]:
+        screen = []
+        fetches = 0
+        try:
+            with self.lock:
+                batch = []
+                if self.builder is token and self.buffer:
+                    batch, self.buffer = self.buffer[:limit], self.buffer[limit:]
+                    screen = batch
+            if batch:
+                yield batch
+            while True:
+                with self.lock:
+                    if self.builder is not token or len(screen) >= limit or self.exhausted or fetches >= self.fetch_budget:
+                        break
+                    site_page = self.next_page
+                result = fetch(site_page)
+                fetches += 1
+                videos = result.get("videos") or []
+                if not videos:
+                    break  # Failed or empty page, retried on the next screen
+
+                with self.lock:
+                    if self.builder is not token:
+                        break  # Taken over by another call, its screens win
+                    self.next_page = site_page + 1
+                    self.exhausted = not result["pagination"].has_next
+                    fresh = []
+                    for video in videos:
+                        key = video_id(video.get("url", ""))
+                        if key not in self.seen:
+                            self.seen.add(key)
+                            fresh.append(video)
+                    batch, self.buffer = fresh[:limit - len(screen)], fresh[limit - len(screen):]
+                    screen = screen + batch
+                logger.info("Site page %d: %d of %d videos are new", site_page, len(fresh), len(videos))
+                if batch:
+                    yield batch
+        finally:
+            with self.lock:
+                if screen and self.builder is token:
+                    self.screens[page] = screen
+                seen = len(self.seen)
+            logger.info("Screen %d: %d videos from %d site page downloads, %d IDs seen", page, len(screen), fetches, seen)
+
+
+class ListingCursors:
+    """Thread-safe ListingCursor per category, keyed by category URL"""
+
+    def __init__(self, max_cursors: int = MAX_CURSORS, fetch_budget: int = FETCH_BUDGET):
+        self.max_cursors = max_cursors
+        self.fetch_budget = fetch_budget
+        self.lock = threading.Lock()
+        self.cursors = OrderedDict()  # Category URL -> ListingCursor
+
+    def get(self, key: str) -> ListingCursor:
+        with self.lock:
+            cursor = self.cursors.get(key)
+            if cursor is None:
+                cursor = self.cursors[key] = ListingCursor(self.fetch_budget)
+            self.cursors.move_to_end(key)
+            while len(self.cursors) > self.max_cursors:
+                self.cursors.popitem(last=False)
+            return cursor
+
+    def clear(self):
+        with self.lock:
+            self.cursors.clear()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Stage Metrics
+
+This module contains the timing instrumentation of the providers:
+- span(stage, **labels) times a stage of a provider or resolver call
+  (fetch, decode, parse, extract, select, template) and adds it to a
+  per-stage histogram; failed stages are counted separately
+- count(name, **labels) increments a counter, e.g. cache hits
+- Metrics are only collected when AREA51_METRICS is set, otherwise span()
+  returns a shared no-op context and count() returns immediately
+- metrics.dump_json() and metrics.dump_prometheus() return the collected
+  metrics on demand; with metrics enabled both are written to STATE_DIR
+  (metrics.json, metrics.prom) on exit
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import atexit
+import bisect
+import threading
+from contextlib import nullcontext
+from debug import get_logger
+from .session_pool import STATE_DIR
+
+logger = get_logger(__file__)
+
+# Histogram bucket upper bounds in milliseconds, slow boxes and sites need the upper end
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Shared context returned by span() while metrics are disabled
+NULL_SPAN = nullcontext()
+
+
+class Histogram:
+    """Duration distribution of one stage and label set"""
+
+    __slots__ = ("buckets", "count", "sum_ms", "max_ms")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)  # Last bucket is +Inf
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+
+class Metrics:
+    """Thread-safe registry of stage histograms and counters"""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.histograms = {}  # (stage, labels) -> Histogram
+        self.counters = {}  # (name, labels) -> int
+
+    def observe(self, stage: str, labels: tuple, ms: float):
+        with self.lock:
+            histogram = self.histograms.get((stage, labels))
+            if histogram is None:
+                histogram = self.histograms[(stage, labels)] = Histogram()
+            histogram.observe(ms)
+
+    def increment(self, name: str, labels: tuple, amount: int = 1):
+        with self.lock:
+            self.counters[(name, labels)] = self.counters.get((name, labels), 0) + amount
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def dump_json(self) -> dict:
+        """Return the collected metrics as a JSON-serializable dict"""
+        with self.lock:
+            return {
+                "stages": [
+                    {
+                        "stage": stage,
+                        "labels": dict(labels),
+                        "count": histogram.count,
+                        "sum_ms": round(histogram.sum_ms, 3),
+                        "mean_ms": round(histogram.sum_ms / histogram.count, 3),
+                        "max_ms": round(histogram.max_ms, 3),
+                        "buckets": dict(zip([str(bound) for bound in BUCKETS_MS] + ["+Inf"], histogram.buckets)),
+                    }
+                    for (stage, labels), histogram in sorted(self.histograms.items())
+                ],
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+            }
+
+    def dump_prometheus(self) -> str:
+        """Return the collected metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP area51_stage_seconds Duration of provider and resolver stages",
+            "# TYPE area51_stage_seconds histogram",
+        ]
+        with self.lock:
+            for (stage, labels), histogram in sorted(self.histograms.items()):
+                label_text = _prometheus_labels((("stage", stage),) + labels)
+                cumulative = 0
+                for bound, bucket_count in zip(BUCKETS_MS + (None,), histogram.buckets):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound is None else repr(bound / 1000)
+                    lines.append(f"area51_stage_seconds_bucket{label_text[:-1]},le=\"{le}\"}} {cumulative}")
+                lines.append(f"area51_stage_seconds_sum{label_text} {histogram.sum_ms / 1000:.6f}")
+                lines.append(f"area51_stage_seconds_count{label_text} {histogram.count}")
+            names = sorted({name for name, _labels in self.counters})
+            for name in names:
+                lines.append(f"# TYPE area51_{name}_total counter")
+                for (counter, labels), value in sorted(self.counters.items()):
+                    if counter == name:
+                        lines.append(f"area51_{name}_total{_prometheus_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def dump_files(self, directory: str = STATE_DIR):
+        """Write metrics.json and metrics.prom to directory"""
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, "metrics.json"), "w", encoding="utf-8") as f:
+                json.dump(self.dump_json(), f, indent=2)
+            with open(os.path.join(directory, "metrics.prom"), "w", encoding="utf-8") as f:
+                f.write(self.dump_prometheus())
+        except OSError as e:
+            logger.info("Failed to write metrics: %s", e)
+
+
+def _prometheus_labels(labels: tuple) -> str:
+    text = ",".join(f'{name}="{str(value)}"' for name, value in labels)
+    return "{" + text + "}"
+
+
+class Span:
+    """Context manager timing one stage, see span()"""
+
+    __slots__ = ("stage", "labels", "start")
+
+    def __init__(self, stage: str, labels: tuple):
+        self.stage = stage
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, _exc, _tb):
+        metrics.observe(self.stage, self.labels, (time.perf_counter() - self.start) * 1000)
+        if exc_type is not None:
+            metrics.increment("stage_errors", (("stage", self.stage),) + self.labels)
+        return False
+
+
+def span(stage: str, **labels):
+    """
+    Time a stage of a provider or resolver call
+
+    Args:
+        stage: Stage name: fetch, decode, parse, extract, select, template, search or index
+        **labels: Labels of the measurement, e.g. provider="xnxx", call="listing"
+
+    Returns:
+        Context manager, a shared no-op one while metrics are disabled
+    """
+    if not metrics.enabled:
+        return NULL_SPAN
+    return Span(stage, tuple(sorted(labels.items())))
+
+
+def count(name: str, amount: int = 1, **labels):
+    """Increment the counter name, e.g. count("resolve_cache", result="hit")"""
+    if metrics.enabled:
+        metrics.increment(name, tuple(sorted(labels.items())), amount)
+
+
+def _dump_at_exit():
+    if metrics.enabled:
+        metrics.dump_files()
+
+
+metrics = Metrics(os.environ.get("AREA51_METRICS", "") not in ("", "0"))
+atexit.register(_dump_at_exit)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Listing Page Cache
+
+This module contains the short-lived cache of parsed listing pages:
+- Pages are cached by URL for PAGE_TTL seconds, so asking for the same
+  page again (returning from a video, redrawing the screen) costs nothing
+- prefetch() loads a page in a background thread, e.g. page N+1 while the
+  user looks at page N
+- A request for a page that is still being prefetched waits for that
+  download instead of starting a second one
+- Only pages with videos are cached, failures are retried on next use
+"""
+
+from __future__ import annotations
+
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+from debug import get_logger
+from .metrics import count
+
+logger = get_logger(__file__)
+
+# Seconds a parsed page stays valid, listings change slowly but not never
+PAGE_TTL = 180
+# Parsed pages kept, a page is about 30-50 KB of item dicts
+MAX_PAGES = 16
+# Background downloads at the same time, one keeps the box responsive
+PREFETCH_WORKERS = 1
+
+
+class PageCache:
+    """Thread-safe TTL cache of parsed listing pages with background prefetch"""
+
+    def __init__(self, ttl: float = PAGE_TTL, max_pages: int = MAX_PAGES):
+        self.ttl = ttl
+        self.max_pages = max_pages
+        self.lock = threading.Lock()
+        self.pages = OrderedDict()  # url -> (expires, result)
+        self.pending = {}  # url -> Future of a running prefetch
+        self.prefetch_enabled = True  # Benchmarks turn it off to time single calls
+        self.executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="area51-prefetch")
+
+    def get(self, url: str, loader: Callable[[str], dict[str, Any]]) -> dict[str, Any]:
+        """
+        Return the parsed page for url, from the cache, a running prefetch or loader
+
+        Args:
+            url: Page URL
+            loader: Downloads and parses url, returns a dict with "videos"
+
+        Returns:
+            dict: Parsed page as returned by loader
+        """
+        with self.lock:
+            entry = self.pages.get(url)
+            if entry and entry[0] > time.time():
+                self.pages.move_to_end(url)
+                count("listing_cache", result="hit")
+                return entry[1]
+            future = self.pending.get(url)
+
+        if future is not None:
+            count("listing_cache", result="prefetch_wait")
+            try:
+                return future.result()
+            except Exception as e:
+                logger.info("Prefetch of %s failed, loading again: %s", url, e)
+
+        count("listing_cache", result="miss")
+        result = loader(url)
+        self._store(url, result)
+        return result
+
+    def prefetch(self, url: str, loader: Callable[[str], dict[str, Any]]):
+        """Load url in the background unless it is cached or already loading"""
+        if not self.prefetch_enabled:
+            return
+        with self.lock:
+            entry = self.pages.get(url)
+            if (entry and entry[0] > time.time()) or url in self.pending:
+                return
+            future = Future()
+            self.pending[url] = future
+        logger.info("Prefetching listing page: %s", url)
+        self.executor.submit(self._prefetch, url, loader, future)
+
+    def clear(self):
+        with self.lock:
+            self.pages.clear()
+
+    def _prefetch(self, url: str, loader: Callable[[str], dict[str, Any]], future: Future):
+        try:
+            result = loader(url)
+            self._store(url, result)
+            future.set_result(result)
+        except Exception as e:
+            logger.info("Prefetch of %s failed: %s", url, e)
+            future.set_exception(e)
+        finally:
+            with self.lock:
+                self.pending.pop(url, None)
+
+    def _store(self, url: str, result: dict[str, Any]):
+        if not result.get("videos"):
+            return
+        with self.lock:
+            self.pages[url] = (time.time() + self.ttl, result)
+            self.pages.move_to_end(url)
+            while len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+
+
+page_cache = PageCache()
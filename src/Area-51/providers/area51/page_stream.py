@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Streaming Page Download
+
+This module contains the early-abort page download used by the resolvers:
+- The response body is read and decoded in chunks
+- A scanner inspects a sliding window (previous tail + new chunk)
+- Reading stops as soon as the scanner reports that the required sources
+  have been seen; otherwise the full body is read
+- After an early stop, a remainder of up to DRAIN_LIMIT bytes is read in
+  the background without decoding, so the kept-alive connection goes back
+  to the session pool (see session_pool.py) without delaying the caller;
+  larger or unknown remainders close it, a new handshake is cheaper than
+  downloading them
+- A completed scanner marks the page as cut off, callers that find no
+  sources in it fetch the full body again (see fetch_methods.py)
+"""
+
+from __future__ import annotations
+
+import re
+import codecs
+from concurrent.futures import ThreadPoolExecutor
+from typing import Protocol
+from debug import get_logger
+from .metrics import count
+
+logger = get_logger(__file__)
+
+# Bytes read from the socket per chunk
+STREAM_CHUNK_SIZE = 16 * 1024
+# Characters kept from the previous window so matches across chunk borders are found
+SCAN_OVERLAP = 4096
+# Unread body bytes drained after an early stop to keep the connection, more are cut off by closing it
+DRAIN_LIMIT = 256 * 1024
+# Responses drained at the same time
+DRAIN_WORKERS = 2
+
+
+class Scanner(Protocol):
+    """Incremental page scanner"""
+
+    complete: bool  # True once feed() returned True, the page text is cut off
+
+    def feed(self, text: str) -> bool:
+        """Inspect the next decoded chunk, return True once the page can be cut off"""
+
+
+class PatternScanner:
+    """Scanner that completes once start_pattern and, after it, end_pattern were seen"""
+
+    def __init__(self, start_pattern: str, end_pattern: str, overlap: int = SCAN_OVERLAP):
+        self.start_pattern = re.compile(start_pattern)
+        self.end_pattern = re.compile(end_pattern)
+        self.overlap = overlap
+        self.started = False
+        self.complete = False
+        self.tail = ""
+
+    def feed(self, text: str) -> bool:
+        window = self.tail + text
+        pos = 0
+        if not self.started:
+            match = self.start_pattern.search(window)
+            if match:
+                self.started = True
+                pos = match.end()
+        if self.started and self.end_pattern.search(window, pos):
+            self.complete = True
+            return True
+        # Never keep text before the start match, an earlier end match must not count
+        self.tail = window[max(pos, len(window) - self.overlap):]
+        return False
+
+
+drain_executor = ThreadPoolExecutor(max_workers=DRAIN_WORKERS, thread_name_prefix="area51-drain")
+
+
+def unread_bytes(response) -> int | None:
+    """Return the body bytes not yet received from the socket, None if unknown (chunked, no Content-Length)"""
+    length = response.headers.get("Content-Length", "")
+    tell = getattr(response.raw, "tell", None)
+    if not length.isdigit() or tell is None:
+        return None
+    return max(0, int(length) - tell())
+
+
+def stream_text(response, scanner: Scanner, drain_limit: int = DRAIN_LIMIT) -> str:
+    """
+    Read a streamed response until scanner is satisfied
+
+    Args:
+        response: requests response opened with stream=True
+        scanner: Scanner deciding when enough of the page has been read
+        drain_limit: Unread bytes read after an early stop to keep the connection
+
+    Returns:
+        str: Decoded page text read so far (full body if the scanner never completed)
+    """
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    parts = []
+    received = 0
+    chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+    draining = False
+    try:
+        for chunk in chunks:
+            received += len(chunk)
+            text = decoder.decode(chunk)
+            parts.append(text)
+            if scanner.feed(text):
+                unread = unread_bytes(response)
+                if unread is not None and unread <= drain_limit:
+                    logger.info("Required sources found after %d bytes, draining %d bytes to keep the connection", received, unread)
+                    drain_executor.submit(_drain, response, chunks)
+                    draining = True
+                else:
+                    logger.info("Required sources found after %d bytes, closing connection early", received)
+                    count("page_stream", result="closed")
+                break
+        else:
+            parts.append(decoder.decode(b"", final=True))
+            logger.info("Read full page of %d bytes", received)
+    finally:
+        if not draining:
+            response.close()
+    return "".join(parts)
+
+
+def _drain(response, chunks):
+    """Read the rest of a response without decoding, the exhausted response releases its connection to the pool"""
+    try:
+        for _chunk in chunks:
+            pass
+        count("page_stream", result="drained")
+    except Exception as e:
+        logger.info("Draining the page failed, closing the connection: %s", e)
+        count("page_stream", result="closed")
+    finally:
+        response.close()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Listing Pagination
+
+This module contains the pager model shared by the provider video managers:
+- Pagination holds the current page, the last page and the next page URL
+  of a listing page, has_next and total_pages are derived from them
+- parse_pagination() reads them from <link rel="next">, the pager links
+  and page count JSON keys; the provider supplies how its page URLs are
+  numbered (see page_number_parser)
+- Fetch loops stop at the last page instead of requesting pages until
+  one comes back empty
+"""
+
+from __future__ import annotations
+
+import re
+from html import unescape
+from typing import Callable, NamedTuple
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Start of the pager markup, the links are searched in the PAGER_LENGTH characters after it
+PAGER_START = re.compile(r'<(?:div|nav|ul|section)\s[^>]*class=["\'][^"\']*(?:pagination|pager)', re.IGNORECASE)
+PAGER_LENGTH = 16384
+
+NEXT_LINK_PATTERN = re.compile(r'<link\s[^>]*rel=["\']next["\'][^>]*>', re.IGNORECASE)
+ANCHOR_PATTERN = re.compile(r'<a\s([^>]*)>', re.IGNORECASE)
+HREF_PATTERN = re.compile(r'href=["\']([^"\']+)["\']', re.IGNORECASE)
+NEXT_ATTR_PATTERN = re.compile(r'rel=["\']next["\']|class=["\'][^"\']*next', re.IGNORECASE)
+# Page counts in embedded state JSON
+PAGE_COUNT_PATTERN = re.compile(r'"(?:maxPages|lastPage|totalPages|pageCount|pagesCount)"\s*:\s*"?(\d+)', re.IGNORECASE)
+
+
+class Pagination(NamedTuple):
+    """Pager state of one listing page"""
+    current: int  # Page number of this page, 1-based
+    last: int | None  # Highest page number the page links to or reports, None if unknown
+    next_url: str | None  # Absolute URL of the next page, None if there is none
+
+    @property
+    def has_next(self) -> bool:
+        """True if there is a page after this one"""
+        return self.next_url is not None or (self.last is not None and self.current < self.last)
+
+    @property
+    def total_pages(self) -> int | None:
+        """Number of pages, None if unknown"""
+        return self.last
+
+
+def strip_query_param(url: str, name: str) -> str:
+    """Return url without the query parameter name"""
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != name]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def page_number_parser(base_url: str, offset: int = 0, query_param: str | None = None) -> Callable[[str], int | None]:
+    """
+    Return a function mapping page URLs of a listing to their page number
+
+    Args:
+        base_url: URL of the first page, e.g. "https://xhamster.com/newest"
+        offset: Added to the number in the URL, 1 for sites counting from 0
+        query_param: Optional query parameter holding the number, e.g. "p";
+            without it the number is the path segment after base_url
+
+    Returns:
+        Callable: URL -> page number, None for URLs of other listings
+    """
+    base = strip_query_param(base_url, query_param) if query_param else base_url.split("?")[0]
+    base = base.rstrip("/")
+    path_pattern = re.compile(re.escape(base) + r'(?:/(\d+))?/?$')
+
+    def page_number(url: str) -> int | None:
+        number = dict(parse_qsl(urlsplit(url).query)).get(query_param) if query_param else None
+        if number is not None:
+            if not number.isdigit() or strip_query_param(url, query_param).rstrip("/") != base:
+                return None
+            return int(number) + offset
+        match = path_pattern.match(url.split("?")[0])
+        if not match:
+            return None
+        return int(match.group(1)) + offset if match.group(1) else 1
+
+    return page_number
+
+
+def parse_pagination(html: str, page_url: str, current: int, page_number: Callable[[str], int | None]) -> Pagination:
+    """
+    Read the pager of a listing page
+
+    Args:
+        html: Listing page HTML
+        page_url: URL of the page, relative links are resolved against it
+        current: Page number of the page
+        page_number: URL -> page number, see page_number_parser()
+
+    Returns:
+        Pagination: Pager state, without next page if the page has no pager
+    """
+    next_url = None
+    pages = {}  # Page number -> URL
+
+    match = NEXT_LINK_PATTERN.search(html)
+    if match:
+        href = HREF_PATTERN.search(match.group(0))
+        if href:
+            next_url = urljoin(page_url, unescape(href.group(1)))
+
+    start = PAGER_START.search(html)
+    if start:
+        for anchor in ANCHOR_PATTERN.finditer(html, start.start(), start.start() + PAGER_LENGTH):
+            attrs = anchor.group(1)
+            href = HREF_PATTERN.search(attrs)
+            if not href or href.group(1).startswith(("#", "javascript")):
+                continue
+            url = urljoin(page_url, unescape(href.group(1)))
+            number = page_number(url)
+            if number is None:
+                continue
+            pages.setdefault(number, url)
+            if next_url is None and number > current and NEXT_ATTR_PATTERN.search(attrs):
+                next_url = url
+
+    if pages:
+        last = max(pages)
+    else:
+        # No pager links, e.g. pages rendered from embedded state
+        counts = [int(count) for count in PAGE_COUNT_PATTERN.findall(html)]
+        last = max(counts) if counts else None
+    if next_url is None:
+        next_url = pages.get(current + 1)
+    if next_url is not None and last is not None and (page_number(next_url) or 0) > last:
+        last = None  # The pager only shows a window of pages
+    return Pagination(current, last, next_url)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Speculative Pre-Resolve
+
+This module contains the opt-in background resolution of listed videos:
+- After a listing is returned, the first N items are resolved in the
+  background into the resolve cache, so playback of the videos the user
+  is most likely to pick starts without the page fetch and extraction
+- N comes from the "preresolve" provider arg or AREA51_PRERESOLVE, 0 (the
+  default) turns pre-resolving off
+- Videos are resolved with the quality and av1 setting of the provider's
+  last playback, nothing is pre-resolved before the first playback
+- A new listing of the same provider cancels the work still queued for the
+  previous one (the user navigated away), running resolutions finish
+- At most PER_HOST_LIMIT pre-resolutions run per site host, on worker
+  threads with lowered CPU priority
+- A playback request for a video that is being pre-resolved joins that
+  resolution (see single_flight.py)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from debug import get_logger
+from .resolve_cache import resolve_cache
+from .session_pool import host_key
+from .metrics import count
+
+logger = get_logger(__file__)
+
+# Background resolutions at the same time, over all providers
+WORKERS = 2
+# Background resolutions at the same time per site host, keeps clear of rate limits
+PER_HOST_LIMIT = 1
+# Nice increment of the worker threads, playback and listings keep the CPU
+NICE_INCREMENT = 10
+
+
+def preresolve_count(provider_id: str, args: dict | None = None) -> int:
+    """Return how many items of a listing to pre-resolve, from the "preresolve" arg or AREA51_PRERESOLVE"""
+    value = (args or {}).get("preresolve") or os.environ.get(f"AREA51_{provider_id.upper()}_PRERESOLVE") or os.environ.get("AREA51_PRERESOLVE") or 0
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        logger.info("Ignoring invalid preresolve count for %s: %s", provider_id, value)
+        return 0
+
+
+def _lower_priority():
+    """Lower the CPU priority of the calling worker thread, Linux applies nice values per thread"""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), os.getpriority(os.PRIO_PROCESS, 0) + NICE_INCREMENT)
+    except (AttributeError, OSError) as e:
+        logger.debug("Failed to lower pre-resolve thread priority: %s", e)
+
+
+class PreResolver:
+    """Background resolver of listed videos with per-provider cancellation"""
+
+    def __init__(self, workers: int = WORKERS, per_host_limit: int = PER_HOST_LIMIT):
+        self.per_host_limit = per_host_limit
+        self.lock = threading.Lock()
+        self.generations = {}  # provider_id -> number of the latest schedule() call
+        self.settings = {}  # provider_id -> (quality, av1) of the last playback
+        self.queues = {}  # host -> deque of (provider_id, generation, resolver_class, args)
+        self.running = {}  # host -> number of workers draining its queue
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="area51-preresolve", initializer=_lower_priority)
+
+    def remember(self, provider_id: str, quality: str, av1: bool):
+        """Record the quality and av1 setting of a playback, pre-resolves use the latest"""
+        with self.lock:
+            self.settings[provider_id] = (quality, bool(av1))
+
+    def schedule(self, provider_id: str, resolver_class: Callable[[dict], Any], items: list[dict[str, Any]]):
+        """
+        Pre-resolve items in the background, cancelling the queued items of the previous call
+
+        Args:
+            provider_id: Provider of the items
+            resolver_class: Resolver of the provider, called with the resolver args
+            items: Media items, most likely picked first
+        """
+        generation = self.cancel(provider_id)
+        with self.lock:
+            settings = self.settings.get(provider_id)
+        if settings is None:
+            logger.debug("No playback on %s yet, not pre-resolving", provider_id)
+            return
+
+        quality, av1 = settings
+        scheduled = 0
+        for item in items:
+            url = item.get("url", "")
+            if not url or resolve_cache.has(url, quality, av1):
+                continue
+            args = {"provider_id": provider_id, "url": url, "quality": quality, "av1": av1, "title": item.get("title", "")}
+            host = host_key(url)
+            with self.lock:
+                self.queues.setdefault(host, deque()).append((provider_id, generation, resolver_class, args))
+                start = self.running.get(host, 0) < self.per_host_limit
+                if start:
+                    self.running[host] = self.running.get(host, 0) + 1
+            if start:
+                self.executor.submit(self._drain, host)
+            scheduled += 1
+        if scheduled:
+            logger.info("Pre-resolving %d %s videos at %s%s", scheduled, provider_id, quality, " (av1)" if av1 else "")
+
+    def cancel(self, provider_id: str) -> int:
+        """Drop the queued pre-resolves of a provider, returns the new generation"""
+        with self.lock:
+            generation = self.generations[provider_id] = self.generations.get(provider_id, 0) + 1
+            for host, queue in self.queues.items():
+                kept = [task for task in queue if task[0] != provider_id]
+                if len(kept) != len(queue):
+                    count("preresolve", provider=provider_id, result="cancelled", amount=len(queue) - len(kept))
+                    self.queues[host] = deque(kept)
+            return generation
+
+    def _drain(self, host: str):
+        """Run the queued pre-resolves of host in order until its queue is empty"""
+        while True:
+            with self.lock:
+                queue = self.queues.get(host)
+                if not queue:
+                    self.running[host] -= 1
+                    return
+                provider_id, generation, resolver_class, args = queue.popleft()
+                if self.generations.get(provider_id) != generation:
+                    continue
+            self._resolve(provider_id, resolver_class, args)
+
+    def _resolve(self, provider_id: str, resolver_class: Callable[[dict], Any], args: dict):
+        url = args["url"]
+        if resolve_cache.has(url, args["quality"], args["av1"]):
+            return
+        try:
+            result = resolver_class(args).resolve_url()
+        except Exception as e:
+            result = None
+            logger.info("Pre-resolve of %s failed: %s", url, e)
+        count("preresolve", provider=provider_id, result="ok" if result else "failed")
+
+
+pre_resolver = PreResolver()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Resolve Cache
+
+This module contains the in-memory cache for resolver results shared by all
+resolvers of the StreamingServer process:
+- Entries are keyed by (page URL, requested quality, av1 flag)
+- Entry lifetime is taken from the expiry embedded in the signed CDN URL,
+  e.g. xHamster's /1761526800/media segment or the ",1761526800/" and
+  "?e=1761526800" tokens of the xvideos/xnxx CDN
+- Entries are evicted shortly before the CDN token expires
+- A miss falls back to the entries of other listings of the same video,
+  e.g. under another provider, see dedup.py; only the stream URL and the
+  recorder are taken over, the resolver adds its own session and headers
+"""
+
+from __future__ import annotations
+
+import re
+import time
+import threading
+from collections import OrderedDict
+from typing import Any
+from urllib.parse import urlparse, parse_qsl
+from debug import get_logger
+from .metrics import count
+from .dedup import dedup_index
+
+logger = get_logger(__file__)
+
+# Lifetime of entries whose URL carries no recognizable expiry
+DEFAULT_TTL = 5 * 60
+# Evict entries this many seconds before the CDN token expires
+EXPIRY_MARGIN = 60
+# Timestamps further in the future are not treated as token expiry
+MAX_TOKEN_LIFETIME = 7 * 24 * 60 * 60
+# Maximum number of cached resolve results
+MAX_ENTRIES = 256
+# Result fields served for another listing of the video, session and headers belong to the site that resolved it
+ALIAS_FIELDS = ("resolved_url", "recorder_id")
+
+# Query parameters used by CDNs to carry the token expiry
+EXPIRY_PARAMS = ("e", "exp", "expires", "expire", "expiry", "validto", "ttl_end")
+# Unix timestamps embedded in the URL path: /1761526800/ or ,1761526800/
+PATH_TIMESTAMP_PATTERN = re.compile(r'[/,](\d{10})(?=/|$)')
+
+
+def token_expiry(url: str, now: float | None = None) -> float | None:
+    """
+    Extract the expiry of a signed CDN URL
+
+    Args:
+        url: Resolved streaming URL
+        now: Reference time, defaults to time.time()
+
+    Returns:
+        float: Unix timestamp the URL expires at, None if no expiry was found
+    """
+    if not url:
+        return None
+    now = time.time() if now is None else now
+    parsed = urlparse(url)
+
+    candidates = [int(value) for value in PATH_TIMESTAMP_PATTERN.findall(parsed.path)]
+    for name, value in parse_qsl(parsed.query):
+        if name.lower() in EXPIRY_PARAMS and value.isdigit() and len(value) == 10:
+            candidates.append(int(value))
+
+    # Ignore numbers that can't be a token expiry (IDs, past timestamps)
+    candidates = [candidate for candidate in candidates if now < candidate < now + MAX_TOKEN_LIFETIME]
+    return float(min(candidates)) if candidates else None
+
+
+class ResolveCache:
+    """Thread-safe LRU cache of resolver results with token-aware expiry"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, url: str, quality: str, av1: bool) -> dict[str, Any] | None:
+        """
+        Return a copy of the cached result for url, None if missing or about to expire
+
+        A miss falls back to the results of other listings of the same
+        video. Those only hold the ALIAS_FIELDS and "alias", the page URL
+        they were resolved for; the caller adds the session and headers of
+        its own site.
+        """
+        result = self._get(url, quality, av1)
+        if result is None:
+            for alias in dedup_index.aliases(url):
+                result = self._get(alias, quality, av1, count_miss=False)
+                if result is not None:
+                    logger.info("Using resolve result of %s for duplicate %s", alias, url)
+                    count("resolve_cache", result="alias_hit")
+                    result = {field: result[field] for field in ALIAS_FIELDS if field in result}
+                    result["alias"] = alias
+                    break
+        return result
+
+    def _get(self, url: str, quality: str, av1: bool, count_miss: bool = True) -> dict[str, Any] | None:
+        key = (url, quality, bool(av1))
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry:
+                if count_miss:
+                    count("resolve_cache", result="miss")
+                return None
+            expires, result = entry
+            if time.time() >= expires:
+                del self.entries[key]
+                logger.info("Resolve cache entry expired: %s", url)
+                count("resolve_cache", result="expired")
+                return None
+            self.entries.move_to_end(key)
+            count("resolve_cache", result="hit")
+            return dict(result)
+
+    def has(self, url: str, quality: str, av1: bool) -> bool:
+        """Return True if a valid result for url is cached, without counting a hit or miss"""
+        with self.lock:
+            entry = self.entries.get((url, quality, bool(av1)))
+            return entry is not None and time.time() < entry[0]
+
+    def put(self, url: str, quality: str, av1: bool, result: dict[str, Any]):
+        """Cache result for url until shortly before its CDN token expires"""
+        now = time.time()
+        expiry = token_expiry(result.get("resolved_url", ""), now)
+        expires = expiry - EXPIRY_MARGIN if expiry else now + DEFAULT_TTL
+        if expires <= now:
+            return
+
+        key = (url, quality, bool(av1))
+        with self.lock:
+            self.entries[key] = (expires, dict(result))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        logger.info("Cached resolve result for %s (valid for %ds)", url, expires - now)
+        dedup_index.add_resolved(url, result.get("resolved_url", ""))
+
+    def clear(self):
+        """Drop all cached results"""
+        with self.lock:
+            self.entries.clear()
+
+
+resolve_cache = ResolveCache()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Multi-Provider Search
+
+This module contains the search across all installed providers:
+- search_all() runs search(query, page) of every provider at the same time
+  and waits for them up to a shared deadline
+- Whatever has arrived when the deadline passes is returned, providers that
+  are still running are left to finish in the background and their results
+  are dropped, so one slow site never holds the result screen back
+- Results are interleaved by rank: the first hit of every provider, then
+  the second, and so on, in the order the providers were passed; a video
+  listed by several providers is kept at its best rank only
+- A provider that fails or runs out of time only loses its own results;
+  on the first page its titles in the local title index (title_index.py)
+  take their place, served without a network round trip
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Iterable
+from debug import get_logger
+from .metrics import count, span
+from .dedup import collapse
+from .title_index import get_title_index
+
+logger = get_logger(__file__)
+
+# Seconds search_all() waits for the providers
+SEARCH_DEADLINE = 8.0
+# Indexed titles standing in for a provider that failed or missed the deadline
+OFFLINE_RESULTS = 20
+
+
+def interleave_by_rank(result_lists: Iterable[list[dict[str, Any]]], limit: int | None = None) -> list[dict[str, Any]]:
+    """
+    Merge ranked result lists, taking one item of each list per round
+
+    Args:
+        result_lists: Result lists, each in rank order
+        limit: Optional maximum number of items to return
+
+    Returns:
+        list: Interleaved items, later listings of the same video removed (see dedup.py)
+    """
+    result_lists = [results for results in result_lists if results]
+    rounds = max((len(results) for results in result_lists), default=0)
+    items = collapse(results[rank] for rank in range(rounds) for results in result_lists if rank < len(results))
+    return items[:limit] if limit else items
+
+
+def _search_provider(provider, query: str, page: int) -> list[dict[str, Any]]:
+    with span("search", provider=provider.provider_id, call="search"):
+        return provider.search(query, page)
+
+
+def _offline_results(provider, query: str, page: int, offline: bool) -> list[dict[str, Any]]:
+    """Return the indexed titles standing in for a provider without live results"""
+    if not offline or page != 1:
+        return []
+    results = get_title_index().search(query, OFFLINE_RESULTS, provider_id=provider.provider_id)
+    if results:
+        logger.info("Search on %s: %d indexed results instead", provider.provider_id, len(results))
+        count("search", provider=provider.provider_id, result="offline")
+    return results
+
+
+def search_all(providers: Iterable, query: str, page: int = 1, deadline: float = SEARCH_DEADLINE,
+               limit: int | None = None, offline: bool = True) -> list[dict[str, Any]]:
+    """
+    Search all providers at once and interleave their results by rank
+
+    Args:
+        providers: Provider instances with a search(query, page) method
+        query: Search term
+        page: Result page, 1-based
+        deadline: Seconds to wait for the providers
+        limit: Optional maximum number of items to return
+        offline: Fill in indexed titles for providers that failed or missed
+            the deadline, on the first page
+
+    Returns:
+        list: Results of the providers that answered in time, indexed titles
+            for the others
+    """
+    providers = [provider for provider in providers if hasattr(provider, "search")]
+    if not providers or not query.strip():
+        return []
+
+    start = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="area51-search")
+    try:
+        futures = [executor.submit(_search_provider, provider, query, page) for provider in providers]
+        done, _pending = wait(futures, timeout=deadline)
+    finally:
+        # Late providers finish in the background, nobody waits for them
+        executor.shutdown(wait=False)
+
+    result_lists = []
+    for provider, future in zip(providers, futures):
+        if future not in done:
+            logger.info("Search on %s missed the %.1fs deadline", provider.provider_id, deadline)
+            count("search", provider=provider.provider_id, result="timeout")
+            result_lists.append(_offline_results(provider, query, page, offline))
+            continue
+        try:
+            results = future.result()
+        except Exception as e:
+            logger.info("Search on %s failed: %s", provider.provider_id, e)
+            count("search", provider=provider.provider_id, result="error")
+            result_lists.append(_offline_results(provider, query, page, offline))
+            continue
+        count("search", provider=provider.provider_id, result="ok")
+        logger.info("Search on %s: %d results", provider.provider_id, len(results))
+        result_lists.append(results)
+
+    items = interleave_by_rank(result_lists, limit)
+    logger.info("Search for '%s' page %d: %d results from %d of %d providers in %.2fs",
+                query, page, len(items), sum(1 for results in result_lists if results), len(providers), time.monotonic() - start)
+    return items
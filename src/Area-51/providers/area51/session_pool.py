@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Session Pool
+
+This module contains the per-host session pool shared by provider listings
+and resolvers:
+- One requests session per site host, reused across listings and resolves
+  so connections are kept alive instead of re-handshaking TLS per playback
+- Connection pool sizes tuned for parallel page fetches
+- Cookies (including anti-bot clearance cookies) persisted to disk so they
+  survive StreamingServer restarts
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import atexit
+import threading
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import create_cookie
+from debug import get_logger
+
+logger = get_logger(__file__)
+
+# Directory for state shared by all Area-51 providers (cookies, statistics, indexes)
+STATE_DIR = os.environ.get("AREA51_STATE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "area51")
+
+# Number of per-host connection pools and connections kept alive per pool
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 8
+
+
+def host_key(url: str) -> str:
+    """Return the pool key for a URL or host name, e.g. "xnxx.com" for "https://www.xnxx.com/..." """
+    # The port is kept, local replay servers run one site per port
+    host = urlparse(url).netloc if "//" in url else url
+    host = host.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class SessionPool:
+    """Thread-safe pool of requests sessions keyed by site host"""
+
+    def __init__(self, cookie_dir: str = os.path.join(STATE_DIR, "cookies")):
+        self.cookie_dir = cookie_dir
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def get_session(self, url: str, session: requests.Session | None = None) -> requests.Session:
+        """
+        Get the pooled session for the host of url
+
+        Args:
+            url: URL or host name
+            session: Session to adopt if the pool has none for this host yet
+
+        Returns:
+            requests.Session: Pooled session
+        """
+        host = host_key(url)
+        with self.lock:
+            pooled = self.sessions.get(host)
+            if pooled is None:
+                pooled = session or requests.Session()
+                self._configure(pooled, host)
+                self.sessions[host] = pooled
+            return pooled
+
+    def adopt(self, url: str, session: requests.Session) -> requests.Session:
+        """Make session the pooled session for the host of url, keeping cookies collected so far"""
+        host = host_key(url)
+        with self.lock:
+            previous = self.sessions.get(host)
+            if previous is session:
+                return session
+            self._configure(session, host)
+            if previous is not None:
+                session.cookies.update(previous.cookies)
+            self.sessions[host] = session
+            return session
+
+    def save_cookies(self, url: str):
+        """Persist the cookies of the pooled session for the host of url"""
+        host = host_key(url)
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                return
+            cookies = [
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                    "expires": cookie.expires,
+                    "secure": cookie.secure,
+                }
+                for cookie in session.cookies
+            ]
+            path = self._cookie_path(host)
+            try:
+                os.makedirs(self.cookie_dir, exist_ok=True)
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(cookies, f)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.info("Failed to save cookies for %s: %s", host, e)
+
+    def save_all(self):
+        """Persist the cookies of all pooled sessions"""
+        for host in list(self.sessions):
+            self.save_cookies(host)
+
+    def _configure(self, session: requests.Session, host: str):
+        """Mount tuned connection pools and load persisted cookies"""
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        path = self._cookie_path(host)
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cookies = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.info("Ignoring unreadable cookie file %s: %s", path, e)
+            return
+
+        now = time.time()
+        loaded = 0
+        for cookie in cookies:
+            if cookie.get("expires") and cookie["expires"] < now:
+                continue
+            session.cookies.set_cookie(create_cookie(
+                cookie["name"], cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"),
+                expires=cookie.get("expires"),
+                secure=cookie.get("secure", False),
+            ))
+            loaded += 1
+        logger.info("Loaded %d persisted cookies for %s", loaded, host)
+
+    def _cookie_path(self, host: str) -> str:
+        return os.path.join(self.cookie_dir, f"{host}.json")
+
+
+session_pool = SessionPool()
+atexit.register(session_pool.save_all)
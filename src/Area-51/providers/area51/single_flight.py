@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Request Coalescing
+
+This module contains the single-flight layer of the providers and resolvers:
+- Concurrent identical calls (focus and select of the same category, a
+  retry after a slow response) share one in-flight call and its result
+- Calls are keyed by kind, normalized URL and the call's parameters, see
+  flight_key()
+- Only calls running at the same time are coalesced, results are not kept
+  once the call returns (see page_cache and resolve_cache for that)
+- An exception of the shared call is raised in every waiting caller
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from debug import get_logger
+from .metrics import count
+
+logger = get_logger(__file__)
+
+
+def normalize_url(url: str) -> str:
+    """Return url with lowercased scheme and host, sorted query, no fragment and no trailing slash"""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/") or "/", query, ""))
+
+
+def flight_key(kind: str, url: str, *params) -> tuple:
+    """Return the single-flight key of a call, e.g. flight_key("resolve", url, quality, av1)"""
+    return (kind, normalize_url(url)) + params
+
+
+class SingleFlight:
+    """Thread-safe registry of in-flight calls"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}  # key -> Future of the running call
+
+    def run(self, key: tuple, function: Callable[[], Any]) -> Any:
+        """
+        Run function, or wait for the running call with the same key
+
+        Args:
+            key: Call key, see flight_key()
+            function: Call to run if none with key is in flight
+
+        Returns:
+            Result of function, shared by all callers that waited for it
+        """
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+
+        if not leader:
+            logger.info("Joining in-flight call: %s", key)
+            count("single_flight", kind=key[0], result="shared")
+            return future.result()
+
+        count("single_flight", kind=key[0], result="leader")
+        try:
+            result = function()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.calls.pop(key, None)
+        future.set_result(result)
+        return result
+
+
+single_flight = SingleFlight()
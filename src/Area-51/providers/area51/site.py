@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Site Base URLs
+
+This module contains the base URL handling shared by the providers:
+- Every provider defaults to the URL of its real site
+- The "base_url" provider arg or AREA51_<PROVIDER_ID>_BASE_URL points a
+  provider at another server, e.g. the replay server of the benchmarks
+- Resolvers take Referer/Origin from the video URL, so they follow the
+  override through the video URLs of the listings
+"""
+
+from __future__ import annotations
+
+import os
+from urllib.parse import urlparse
+from debug import get_logger
+
+logger = get_logger(__file__)
+
+
+def site_base_url(provider_id: str, default: str, args: dict | None = None) -> str:
+    """
+    Return the base URL of a provider site
+
+    Args:
+        provider_id: Provider ID, e.g. "xnxx"
+        default: URL of the real site, with trailing slash
+        args: Provider args, may contain "base_url"
+
+    Returns:
+        str: Base URL with trailing slash
+    """
+    override = (args or {}).get("base_url") or os.environ.get(f"AREA51_{provider_id.upper()}_BASE_URL")
+    if not override:
+        return default
+    base_url = override.rstrip("/") + "/"
+    logger.info("Using base URL %s for %s", base_url, provider_id)
+    return base_url
+
+
+def url_origin(url: str) -> str:
+    """Return scheme and host of a URL, e.g. "https://www.xnxx.com" """
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
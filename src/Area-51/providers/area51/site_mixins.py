@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Site Mixins
+
+This module contains the wiring shared by the provider and resolver classes
+of the site packages, so a change to it happens in one place:
+- SiteProvider sets up the pooled session, the title index and the
+  pre-resolve count, and implements get_media_items(), iter_media_items()
+  and resolve_many() around the site's video manager: identical listing
+  requests are coalesced (single_flight.py), every listing goes into the
+  dedup and title indexes (dedup.py, title_index.py) and the first items
+  are pre-resolved (pre_resolve.py)
+- SiteResolver implements resolve_url() around the site's _resolve_url():
+  identical resolutions are coalesced and the playback settings are kept
+  for the pre-resolves
+- Both come first in the bases of the site classes, e.g.
+  class Provider(SiteProvider, BaseProvider)
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Any, Iterator
+from constants import MAX_VIDEOS
+from .session_pool import session_pool
+from .site import site_base_url
+from .single_flight import single_flight, flight_key
+from .title_index import get_title_index
+from .dedup import dedup_index
+from .pre_resolve import pre_resolver, preresolve_count
+from .batch_resolve import resolve_many
+
+
+class SiteProvider:
+    """Listing, indexing and batch resolve wiring of a site provider"""
+
+    # Resolver class of the site, set by the provider class
+    resolver_class = None
+    # Items per listing when the caller passes no limit
+    media_limit = MAX_VIDEOS
+
+    def setup_site(self, default_base_url: str, args: dict):
+        """Set base_url, share the session through the per-host pool and open the title index; call from __init__"""
+        self.base_url = site_base_url(self.provider_id, default_base_url, args)
+        # Share the listing session with the resolvers through the per-host pool
+        self.session = session_pool.adopt(self.base_url, self.session)
+        # Everything listed goes into the title index shared by all providers
+        self.title_index = get_title_index()
+        # Items of each listing resolved in the background, 0 = off
+        self.preresolve = preresolve_count(self.provider_id, args)
+
+    def get_media_items(self, category: dict, page: int = 1, limit: int | None = None) -> list[dict[str, Any]]:
+        """Get the media items of a category page from the video manager"""
+        limit = self.media_limit if limit is None else limit
+        # Concurrent requests for the same page (focus and select, a retry) share one download
+        key = flight_key("listing", category.get("url", ""), self.provider_id, page, limit)
+        items = list(single_flight.run(key, partial(self._get_media_items, category, page, limit)))
+        if self.preresolve:
+            # Playback of the first items then starts from the resolve cache
+            pre_resolver.schedule(self.provider_id, self.resolver_class, items[:self.preresolve])
+        return items
+
+    def iter_media_items(self, category: dict, page: int = 1, limit: int | None = None) -> Iterator[list[dict[str, Any]]]:
+        """Stream the media items of a category page in batches as soon as each site page is parsed"""
+        limit = self.media_limit if limit is None else limit
+        return self.title_index.ingest_batches(map(dedup_index.add_items, self.video_manager.iter_media_items(category, page, limit)))
+
+    def index_items(self, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Add listed items to the dedup and title indexes, returns items unchanged"""
+        return self.title_index.ingest(dedup_index.add_items(items))
+
+    def _get_media_items(self, category: dict, page: int, limit: int) -> list[dict[str, Any]]:
+        return self.index_items(self.video_manager.get_media_items(category, page, limit))
+
+    def resolve_many(self, urls: list[str], quality: str = "1080p", av1: bool = False) -> list[dict[str, Any]]:
+        """Resolve video page URLs concurrently, results in input order with per-URL errors (see batch_resolve.py)"""
+        return resolve_many(self.resolver_class, self.provider_id, urls, quality, av1)
+
+
+class SiteResolver:
+    """Coalescing wiring of a site resolver, the site implements _resolve_url()"""
+
+    def resolve_url(self) -> dict[str, Any] | None:
+        """
+        Resolve the video page URL to a streaming URL
+
+        Returns:
+            dict: resolve_result with resolved_url, session, ffmpeg_headers
+                and recorder_id, None if no playable source was found
+        """
+        # Background pre-resolves of the next listings use the settings of this playback
+        pre_resolver.remember(self.provider_id, self.quality, self.av1)
+        # Concurrent requests for the same video (focus and select, a retry) share one resolution
+        result = single_flight.run(flight_key("resolve", self.url, self.quality, bool(self.av1)), self._resolve_url)
+        if result is not None and result is not self.resolve_result:
+            self.resolve_result.update(result)
+            return self.resolve_result
+        return result
+
+    def _resolve_url(self) -> dict[str, Any] | None:
+        raise NotImplementedError
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+HTML Parser Backend
+
+This module contains the BeautifulSoup factory used by the providers:
+- lxml is used when it is installed in the StreamingServer venv, it is a
+  compiled parser and several times faster than html.parser on ARM boxes
+- html.parser (pure Python, always available) is the fallback
+- AREA51_HTML_PARSER selects a backend explicitly, e.g. for benchmarks;
+  an unavailable backend falls back to the automatic choice
+"""
+
+from __future__ import annotations
+
+import os
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
+from debug import get_logger
+
+logger = get_logger(__file__)
+
+# Backends in order of preference, names as understood by BeautifulSoup
+PREFERRED_BACKENDS = ("lxml", "html.parser")
+
+
+def available_backends() -> list[str]:
+    """Return the installed backends in order of preference"""
+    return [name for name in PREFERRED_BACKENDS if builder_registry.lookup(name) is not None]
+
+
+def select_backend(requested: str | None = None) -> str:
+    """Return requested if it is installed, otherwise the fastest installed backend"""
+    backends = available_backends()
+    if requested:
+        if requested in backends:
+            return requested
+        logger.info("HTML parser backend %s is not available, using %s", requested, backends[0])
+    return backends[0]
+
+
+PARSER_BACKEND = select_backend(os.environ.get("AREA51_HTML_PARSER"))
+logger.info("Using HTML parser backend: %s", PARSER_BACKEND)
+
+
+def make_soup(html: str, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+    """
+    Parse html with the selected backend
+
+    Args:
+        html: Page HTML
+        parse_only: Optional strainer limiting the tree to the needed elements
+
+    Returns:
+        BeautifulSoup: Parsed document
+    """
+    return BeautifulSoup(html, PARSER_BACKEND, parse_only=parse_only)
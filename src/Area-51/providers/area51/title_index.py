@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+Title Index
+
+This module contains the local full-text index of everything the providers
+have listed:
+- Listings are ingested as they are scraped, one row per video keyed by
+  "provider_id:video_id", so a video listed again only refreshes its row
+- Titles are searched with SQLite FTS5 (external content table kept in sync
+  by triggers), every word of the query matches as a prefix
+- Results can be filtered by duration and provider, and are served without
+  any network round trip; search_all() (see search.py) fills in the
+  indexed titles of providers that miss its deadline
+- One index in titles.db in STATE_DIR is shared by all providers, like the
+  cookies and fetch statistics, so a search covers everything listed; it
+  keeps the MAX_TITLES most recently listed videos
+- Without FTS5 support in the SQLite library the index is disabled and all
+  calls return immediately
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+import sqlite3
+import threading
+from typing import Any, Iterable, Iterator
+from debug import get_logger
+from .listing import video_id
+from .session_pool import STATE_DIR
+from .metrics import span
+
+logger = get_logger(__file__)
+
+# File name of the index in STATE_DIR
+INDEX_FILE = "titles.db"
+# Videos kept, least recently listed dropped first
+MAX_TITLES = 50000
+# Ingested batches between two prunes
+PRUNE_INTERVAL = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    provider_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    thumbnail TEXT NOT NULL DEFAULT '',
+    duration TEXT NOT NULL DEFAULT '',
+    seconds INTEGER,
+    listed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS videos_listed ON videos(listed);
+CREATE VIRTUAL TABLE IF NOT EXISTS titles USING fts5(
+    title, content='videos', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS videos_insert AFTER INSERT ON videos BEGIN
+    INSERT INTO titles(rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS videos_delete AFTER DELETE ON videos BEGIN
+    INSERT INTO titles(titles, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS videos_update AFTER UPDATE OF title ON videos BEGIN
+    INSERT INTO titles(titles, rowid, title) VALUES ('delete', old.id, old.title);
+    INSERT INTO titles(rowid, title) VALUES (new.id, new.title);
+END;
+"""
+
+UPSERT = """
+INSERT INTO videos (key, provider_id, title, url, thumbnail, duration, seconds, listed)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(key) DO UPDATE SET
+    title = excluded.title, url = excluded.url, thumbnail = excluded.thumbnail,
+    duration = excluded.duration, seconds = excluded.seconds, listed = excluded.listed
+"""
+
+# Words of a search query, everything else is dropped so user input can't form FTS5 syntax
+QUERY_WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+# Duration formats of the listings: "1:02:03", "12:34", "14 min", "1h 5min"
+CLOCK_DURATION_PATTERN = re.compile(r'^(?:(\d+):)?(\d{1,2}):(\d{2})$')
+HOURS_PATTERN = re.compile(r'(\d+)\s*h', re.IGNORECASE)
+MINUTES_PATTERN = re.compile(r'(\d+)\s*min', re.IGNORECASE)
+SECONDS_PATTERN = re.compile(r'(\d+)\s*s(?:ec)?\b', re.IGNORECASE)
+
+
+def parse_duration(text: str) -> int | None:
+    """Return the duration of a listing in seconds, None if it has none ("N/A", "Unknown")"""
+    text = (text or "").strip()
+    match = CLOCK_DURATION_PATTERN.match(text)
+    if match:
+        hours, minutes, seconds = match.groups()
+        return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+    parts = [(HOURS_PATTERN, 3600), (MINUTES_PATTERN, 60), (SECONDS_PATTERN, 1)]
+    found = [(pattern.search(text), factor) for pattern, factor in parts]
+    if not any(match for match, _factor in found):
+        return None
+    return sum(int(match.group(1)) * factor for match, factor in found if match)
+
+
+def fts_query(query: str) -> str:
+    """Return the FTS5 query matching every word of query as a prefix"""
+    return " ".join(f'"{word}"*' for word in QUERY_WORD_PATTERN.findall(query))
+
+
+class TitleIndex:
+    """Thread-safe FTS5 index of listed videos in one SQLite file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = None
+        self.disabled = False
+        self.batches = 0
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """Return the connection, opening the database on first use"""
+        if self.connection is None and not self.disabled:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                connection.executescript(SCHEMA)
+                self.connection = connection
+            except (OSError, sqlite3.Error) as e:
+                logger.info("Title index %s disabled: %s", self.path, e)
+                self.disabled = True
+        return self.connection
+
+    def ingest(self, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Add or refresh the videos of a listing
+
+        Args:
+            items: Media items as returned by get_media_items()
+
+        Returns:
+            list: items, unchanged
+        """
+        now = time.time()
+        rows = {}
+        for item in items:
+            url = item.get("url", "")
+            title = item.get("title", "")
+            if not url or not title:
+                continue
+            provider_id = item.get("provider_id", "")
+            duration = str(item.get("duration") or "")
+            key = f"{provider_id}:{video_id(url)}"
+            rows[key] = (key, provider_id, title, url, item.get("thumbnail") or "", duration, parse_duration(duration), now)
+        if not rows:
+            return items
+
+        with self.lock:
+            connection = self._connect()
+            if connection is None:
+                return items
+            try:
+                with span("index", call="ingest"), connection:
+                    connection.executemany(UPSERT, rows.values())
+                self.batches += 1
+                if self.batches % PRUNE_INTERVAL == 0:
+                    self._prune(connection)
+            except sqlite3.Error as e:
+                logger.info("Failed to index %d titles: %s", len(rows), e)
+        return items
+
+    def ingest_batches(self, batches: Iterable[list[dict[str, Any]]]) -> Iterator[list[dict[str, Any]]]:
+        """Ingest streamed batches of iter_media_items() as they pass through"""
+        for batch in batches:
+            yield self.ingest(batch)
+
+    def search(self, query: str, limit: int = 50, min_seconds: int | None = None, max_seconds: int | None = None,
+               provider_id: str | None = None) -> list[dict[str, Any]]:
+        """
+        Search the indexed titles
+
+        Args:
+            query: Search words, each matches as a prefix ("big ca" finds "Big Cats")
+            limit: Maximum number of results
+            min_seconds: Optional minimum duration, videos without one are excluded
+            max_seconds: Optional maximum duration, videos without one are excluded
+            provider_id: Optional provider to restrict the results to
+
+        Returns:
+            list: Media items, best match first, then most recently listed
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+
+        sql = ["SELECT v.provider_id, v.title, v.url, v.thumbnail, v.duration FROM titles"
+               " JOIN videos v ON v.id = titles.rowid WHERE titles MATCH ?"]
+        params = [match]
+        if min_seconds is not None:
+            sql.append("AND v.seconds >= ?")
+            params.append(min_seconds)
+        if max_seconds is not None:
+            sql.append("AND v.seconds <= ?")
+            params.append(max_seconds)
+        if provider_id:
+            sql.append("AND v.provider_id = ?")
+            params.append(provider_id)
+        sql.append("ORDER BY bm25(titles), v.listed DESC LIMIT ?")
+        params.append(limit)
+
+        with self.lock:
+            connection = self._connect()
+            if connection is None:
+                return []
+            try:
+                with span("index", call="search"):
+                    rows = connection.execute(" ".join(sql), params).fetchall()
+            except sqlite3.Error as e:
+                logger.info("Title search for '%s' failed: %s", query, e)
+                return []
+        return [
+            {"provider_id": row[0], "title": row[1], "url": row[2], "thumbnail": row[3], "duration": row[4]}
+            for row in rows
+        ]
+
+    def _prune(self, connection: sqlite3.Connection):
+        """Drop the least recently listed videos beyond MAX_TITLES"""
+        with connection:
+            deleted = connection.execute(
+                "DELETE FROM videos WHERE id IN (SELECT id FROM videos ORDER BY listed"
+                " LIMIT max(0, (SELECT count(*) FROM videos) - ?))", (MAX_TITLES,)).rowcount
+        if deleted:
+            logger.info("Pruned %d titles from %s", deleted, self.path)
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+
+# Open indexes by path
+indexes: dict[str, TitleIndex] = {}
+indexes_lock = threading.Lock()
+
+
+def get_title_index(path: str | None = None) -> TitleIndex:
+    """Return the title index at path, the one shared by all providers in STATE_DIR by default"""
+    path = path or os.path.join(STATE_DIR, INDEX_FILE)
+    with indexes_lock:
+        index = indexes.get(path)
+        if index is None:
+            index = indexes[path] = TitleIndex(path)
+        return index
+
+
+def close_title_indexes():
+    """Close and forget all open title indexes"""
+    with indexes_lock:
+        for index in indexes.values():
+            index.close()
+        indexes.clear()
@@ -15,10 +15,12 @@ import os
 import re
 from typing import Any
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
 from debug import get_logger
 from string_utils import sanitize_for_json
 from constants import PAGE_ENTRIES
+from ..area51.category_cache import CategoryCache, conditional_headers, response_validators
+from ..area51.soup import make_soup
+from ..area51.metrics import span
 
 logger = get_logger(__file__)
 
@@ -32,19 +34,29 @@ class Category:
         self.cache_dir = provider.data_dir / 'thumbnails' if provider.data_dir else None
         if self.cache_dir:
             os.makedirs(self.cache_dir, exist_ok=True)
+        self.category_cache = CategoryCache(provider)
 
     def get_categories(self) -> list[dict[str, Any]]:
+        """Get xHamster categories, served from the category cache when possible"""
+        return self.category_cache.get_categories(self._scrape_categories)
+
+    def _scrape_categories(self, validators: dict[str, str]) -> tuple[list[dict[str, Any]] | None, dict[str, str]]:
         """Get xHamster categories by scraping the live site with enhanced data structure"""
         try:
-            headers = self.provider.get_standard_headers("scraping")
-
             # Scrape categories from the main categories page
             categories_url = f"{self.provider.base_url}categories"
-            response = self.provider.session.get(categories_url, headers=headers, timeout=30)
+            headers = {**self.provider.get_standard_headers("scraping"), **conditional_headers(validators, categories_url)}
+            labels = {"provider": self.provider.provider_id, "call": "categories"}
+            with span("fetch", **labels):
+                response = self.provider.session.get(categories_url, headers=headers, timeout=30)
+            if response.status_code == 304:
+                return None, validators
             response.raise_for_status()
 
-            html = self.provider.get_response_text(response)
-            soup = BeautifulSoup(html, "html.parser")
+            with span("decode", **labels):
+                html = self.provider.get_response_text(response)
+            with span("parse", **labels):
+                soup = make_soup(html)
 
             logger.info("Scraping category groups from: %s", categories_url)
             all_categories = []  # Start with empty list to populate from actual page
@@ -66,111 +78,112 @@ class Category:
                 seen_urls.add(normalized_url)
                 seen_names.add(normalized_name)
 
-            # Look for category groups using the H2 headers structure we discovered
-            category_groups = soup.select('h2')
-            logger.info("Found %d category group headers", len(category_groups))
-
-            # Process each category group to find the most popular categories in each group
-            for group_header in category_groups:
-                group_name = group_header.get_text(strip=True)
-
-                # Skip generic headers
-                if not group_name or len(group_name) < 3:
-                    continue
+            with span("extract", **labels):
+                # Look for category groups using the H2 headers structure we discovered
+                category_groups = soup.select('h2')
+                logger.info("Found %d category group headers", len(category_groups))
 
-                logger.debug("Processing category group: %s", group_name)
+                # Process each category group to find the most popular categories in each group
+                for group_header in category_groups:
+                    group_name = group_header.get_text(strip=True)
 
-                # Find the next section after this header that contains category links
-                next_section = group_header.find_next_sibling()
-                group_categories = []
+                    # Skip generic headers
+                    if not group_name or len(group_name) < 3:
+                        continue
 
-                # Look for category links in the section following this header
-                if next_section:
-                    # Search within this section for category links
-                    section_links = next_section.find_all('a', href=lambda x: x and '/categories/' in x)
+                    logger.debug("Processing category group: %s", group_name)
+
+                    # Find the next section after this header that contains category links
+                    next_section = group_header.find_next_sibling()
+                    group_categories = []
+
+                    # Look for category links in the section following this header
+                    if next_section:
+                        # Search within this section for category links
+                        section_links = next_section.find_all('a', href=lambda x: x and '/categories/' in x)
+
+                        for link in section_links[:8]:  # Take top 8 from each group
+                            href = link.get('href', '').strip()
+                            link_text = link.get_text(strip=True)
+
+                            if not href or not link_text or len(link_text) < 2:
+                                continue
+
+                            # Make sure URL is absolute
+                            if not href.startswith("http"):
+                                href = urljoin(self.provider.base_url, href)
+
+                            # Skip photo categories
+                            if "/photos/" in href or "photo" in link_text.lower():
+                                continue
+
+                            # Normalize URL and name for duplicate checking
+                            normalized_url = href.rstrip('/').lower()
+                            # Normalize category name: lowercase, remove extra spaces, strip
+                            normalized_name = ' '.join(link_text.lower().split())
+
+                            # Skip if we've already added this URL or category name
+                            if normalized_url in seen_urls:
+                                logger.debug("Skipping duplicate URL: %s (from group: %s)", href, group_name)
+                                continue
+                            if normalized_name in seen_names:
+                                logger.debug("Skipping duplicate category name: '%s' (from group: %s)", link_text, group_name)
+                                continue
+
+                            group_categories.append({
+                                "name": sanitize_for_json(link_text),
+                                "url": href,
+                                "group": group_name
+                            })
+                            seen_urls.add(normalized_url)
+                            seen_names.add(normalized_name)
+
+                    # Add the best categories from this group
+                    all_categories.extend(group_categories)
+                    logger.debug("Added %d categories from group '%s'", len(group_categories), group_name)
+
+                # If we didn't get enough categories from groups, add some popular individual ones
+                if len(all_categories) < 40:
+                    logger.info("Adding popular individual categories as fallback")
+                    popular_links = soup.select('a[href*="/categories/"]')
+                    max_categories = 2 * PAGE_ENTRIES  # Define the limit here too
+
+                    # seen_urls already maintained above, no need to rebuild it
+
+                    for link in popular_links:
+                        if len(all_categories) >= max_categories:  # Stop when we reach the limit
+                            break
 
-                    for link in section_links[:8]:  # Take top 8 from each group
                         href = link.get('href', '').strip()
                         link_text = link.get_text(strip=True)
 
-                        if not href or not link_text or len(link_text) < 2:
+                        if not href or not link_text:
                             continue
 
-                        # Make sure URL is absolute
                         if not href.startswith("http"):
                             href = urljoin(self.provider.base_url, href)
 
-                        # Skip photo categories
-                        if "/photos/" in href or "photo" in link_text.lower():
-                            continue
-
                         # Normalize URL and name for duplicate checking
                         normalized_url = href.rstrip('/').lower()
                         # Normalize category name: lowercase, remove extra spaces, strip
                         normalized_name = ' '.join(link_text.lower().split())
 
-                        # Skip if we've already added this URL or category name
                         if normalized_url in seen_urls:
-                            logger.debug("Skipping duplicate URL: %s (from group: %s)", href, group_name)
                             continue
                         if normalized_name in seen_names:
-                            logger.debug("Skipping duplicate category name: '%s' (from group: %s)", link_text, group_name)
                             continue
 
-                        group_categories.append({
+                        if "/photos/" in href or "photo" in link_text.lower():
+                            continue
+
+                        all_categories.append({
                             "name": sanitize_for_json(link_text),
                             "url": href,
-                            "group": group_name
+                            "group": "Popular"
                         })
                         seen_urls.add(normalized_url)
                         seen_names.add(normalized_name)
 
-                # Add the best categories from this group
-                all_categories.extend(group_categories)
-                logger.debug("Added %d categories from group '%s'", len(group_categories), group_name)
-
-            # If we didn't get enough categories from groups, add some popular individual ones
-            if len(all_categories) < 40:
-                logger.info("Adding popular individual categories as fallback")
-                popular_links = soup.select('a[href*="/categories/"]')
-                max_categories = 2 * PAGE_ENTRIES  # Define the limit here too
-
-                # seen_urls already maintained above, no need to rebuild it
-
-                for link in popular_links:
-                    if len(all_categories) >= max_categories:  # Stop when we reach the limit
-                        break
-
-                    href = link.get('href', '').strip()
-                    link_text = link.get_text(strip=True)
-
-                    if not href or not link_text:
-                        continue
-
-                    if not href.startswith("http"):
-                        href = urljoin(self.provider.base_url, href)
-
-                    # Normalize URL and name for duplicate checking
-                    normalized_url = href.rstrip('/').lower()
-                    # Normalize category name: lowercase, remove extra spaces, strip
-                    normalized_name = ' '.join(link_text.lower().split())
-
-                    if normalized_url in seen_urls:
-                        continue
-                    if normalized_name in seen_names:
-                        continue
-
-                    if "/photos/" in href or "photo" in link_text.lower():
-                        continue
-
-                    all_categories.append({
-                        "name": sanitize_for_json(link_text),
-                        "url": href,
-                        "group": "Popular"
-                    })
-                    seen_urls.add(normalized_url)
-                    seen_names.add(normalized_name)
-
             logger.info("Found %d total categories from groups", len(all_categories))
 
             # Create enhanced category data structure
@@ -201,11 +214,11 @@ class Category:
             enhanced_categories.sort(key=lambda cat: cat['name'].lower())
 
             logger.info("Returning %d enhanced categories from groups (no capping applied)", len(enhanced_categories))
-            return enhanced_categories
+            return enhanced_categories, response_validators(categories_url, response)
 
         except Exception as e:
             logger.info("Error getting xHamster categories: %s", e)
-            return []
+            return [], {}
 
     def _extract_category_id(self, url: str) -> str:
         """Extract category ID from URL"""
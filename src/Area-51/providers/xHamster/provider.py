@@ -14,26 +14,32 @@ from __future__ import annotations
 from typing import Any
 from base_provider import BaseProvider
 from debug import get_logger
+from ..area51.site import url_origin
+from ..area51.site_mixins import SiteProvider
 from .category import Category
+from .resolver import Resolver
 from .video import Video
 
 logger = get_logger(__file__)
 
 
-class Provider(BaseProvider):
-    """xHamster provider class with modular architecture"""
+class Provider(SiteProvider, BaseProvider):
+    """xHamster provider class with modular architecture, listing wiring in SiteProvider"""
+
+    resolver_class = Resolver
+    media_limit = 28
 
     def __init__(self, args: dict):
         """Initialize the xHamster provider with modular components"""
         super().__init__(args)
 
         # Provider properties
-        self.base_url = "https://xhamster.com/"
+        self.setup_site("https://xhamster.com/", args)
 
         # Ensure xHamster-specific headers are set
         self.session.headers.update({
-            "Referer": "https://xhamster.com/",
-            "Origin": "https://xhamster.com"
+            "Referer": self.base_url,
+            "Origin": url_origin(self.base_url)
         })
 
         # Initialize modular components
@@ -44,6 +50,6 @@ class Provider(BaseProvider):
         """Get xHamster categories using the category manager"""
         return self.category_manager.get_categories()
 
-    def get_media_items(self, category: dict, page: int = 1, limit: int = 28) -> list[dict[str, Any]]:
-        """Get videos from specific category using the video manager"""
-        return self.video_manager.get_media_items(category, page, limit)
+    def search(self, query: str, page: int = 1, limit: int = 28) -> list[dict[str, Any]]:
+        """Search videos, returns one result page in the site's rank order"""
+        return self.index_items(self.video_manager.search(query, page, limit))
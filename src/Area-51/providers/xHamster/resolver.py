@@ -22,45 +22,77 @@ from base_resolver import BaseResolver
 from auth_utils import AuthTokens
 from quality_utils import select_best_source, extract_metadata_from_url
 from debug import get_logger
+from ..area51.resolve_cache import resolve_cache
+from ..area51.session_pool import session_pool
+from ..area51.fetch_methods import fetch_page, fetch_full_page
+from ..area51.site import url_origin
+from ..area51.page_stream import PatternScanner
+from ..area51.metrics import span
+from ..area51.site_mixins import SiteResolver
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 logger = get_logger(__file__)
 
+# Labels of the stage metrics of this resolver
+METRIC_LABELS = {"provider": "xhamster", "call": "resolve"}
 
-class Resolver(BaseResolver):
+
+class Resolver(SiteResolver, BaseResolver):
     """xHamster URL resolver with anti-403 protection"""
 
     def __init__(self, args: dict):
         super().__init__(args)
         self.auth_tokens = AuthTokens()
+        # Share the pooled per-host session: kept-alive connections and persisted cookies
+        self.auth_tokens.session = session_pool.get_session(self.url, self.auth_tokens.session)
 
-    def resolve_url(self) -> dict[str, Any] | None:
-        """
-        Resolve xHamster video URL to streaming sources using centralized auth utilities.
-        """
-
+    def _resolve_url(self) -> dict[str, Any] | None:
+        """Resolve xHamster video URL to streaming sources, coalesced by SiteResolver.resolve_url()"""
         logger.info("=== xHamster Resolver START ===")
         logger.info("Resolving xHamster URL: %s", self.url)
         logger.info("Video title from args: %s", self.resolve_result.get("title", "N/A"))
         logger.info("Provider ID: %s", self.provider_id)
 
-        # Use centralized authentication with fallback methods
-        html = self.auth_tokens.fetch_with_fallback(self.url, "https://xhamster.com")
+        cached = resolve_cache.get(self.url, self.quality, self.av1)
+        if cached:
+            if cached.pop("alias", None):
+                # Resolved for another listing of the video, its session and headers belong to that site
+                cached.update(self._playback_auth())
+            logger.info("=== xHamster Resolver END (CACHED) ===")
+            logger.info("Final resolved URL: %s", cached["resolved_url"][:100] + "..." if len(cached["resolved_url"]) > 100 else cached["resolved_url"])
+            self.resolve_result.update(cached)
+            return self.resolve_result
+
+        # Try the best-known fetch method for this host, then centralized authentication with fallback methods
+        # Stream the page and stop reading at the end of the window.initials script holding the player JSON
+        scanner = PatternScanner(r'window\.initials\s*=', r'</script>')
+        with span("fetch", **METRIC_LABELS):
+            html = fetch_page(self.auth_tokens, self.url, url_origin(self.url), scanner)
 
         if html:
-            sources = self._parse_html_for_sources(html)
+            with span("extract", **METRIC_LABELS):
+                sources = self._parse_html_for_sources(html)
+            if not sources:
+                # Player JSON moved or renamed, the sources may be further down the page
+                with span("fetch", **METRIC_LABELS):
+                    full_html = fetch_full_page(self.auth_tokens, self.url, url_origin(self.url), scanner)
+                if full_html:
+                    with span("extract", **METRIC_LABELS):
+                        sources = self._parse_html_for_sources(full_html)
             if sources:
                 logger.info("URL resolution successful using method: %s", self.auth_tokens.method)
 
                 # Select the optimal quality URL from available sources using quality preference
-                best_source = select_best_source(sources, self.quality, codec_aware=True, av1=self.av1)
+                with span("select", **METRIC_LABELS):
+                    best_source = select_best_source(sources, self.quality, codec_aware=True, av1=self.av1)
                 resolved_url = best_source["url"] if best_source else self.url
 
                 # Check if the resolved URL is a template URL and use base resolver template resolution
                 if self._is_template_url(resolved_url):
                     logger.info("Detected template URL, using base resolver template resolution")
-                    template_resolved_url = self._resolve_template_url(resolved_url, self.quality)
+                    with span("template", **METRIC_LABELS):
+                        template_resolved_url = self._resolve_template_url(resolved_url, self.quality)
                     if template_resolved_url and template_resolved_url != resolved_url:
                         resolved_url = template_resolved_url
                         logger.info("Template resolved: %s", resolved_url[:100] + "..." if len(resolved_url) > 100 else resolved_url)
@@ -79,24 +111,14 @@ class Resolver(BaseResolver):
                 # Determine recorder type based on URL characteristics
                 recorder_id = self.determine_recorder_id(resolved_url)
 
-                # Convert to FFmpeg format
-                ffmpeg_headers = self.auth_tokens.get_ffmpeg_headers()
-
-                # Ensure the session has the updated headers
-                session = self.auth_tokens.session
-                if session:
-                    # Ensure critical headers are set for xHamster CDN access
-                    # xHamster CDN requires proper Referer header
-                    session.headers["Referer"] = "https://xhamster.com/"
-                    session.headers["Origin"] = "https://xhamster.com"
-                    logger.info("Updated session headers for xHamster CDN access")
-
-                self.resolve_result.update({
+                resolved = {
                     "resolved_url": resolved_url,
-                    "session": session,
-                    "ffmpeg_headers": ffmpeg_headers,
                     "recorder_id": recorder_id,
-                })
+                }
+                resolved.update(self._playback_auth())
+                resolve_cache.put(self.url, self.quality, self.av1, resolved)
+                session_pool.save_cookies(self.url)
+                self.resolve_result.update(resolved)
                 logger.info("=== xHamster Resolver END (SUCCESS) ===")
                 logger.info("Final resolved URL: %s", resolved_url[:100] + "..." if len(resolved_url) > 100 else resolved_url)
                 logger.info("Final video title: %s", self.resolve_result.get("title", "N/A"))
@@ -106,6 +128,21 @@ class Resolver(BaseResolver):
         logger.error("All resolution methods failed for xHamster URL")
         return None
 
+    def _playback_auth(self) -> dict[str, Any]:
+        """Return the session and FFmpeg headers the player needs for the xHamster CDN"""
+        # Convert to FFmpeg format
+        ffmpeg_headers = self.auth_tokens.get_ffmpeg_headers()
+
+        # Ensure the session has the updated headers
+        session = self.auth_tokens.session
+        if session:
+            # Ensure critical headers are set for xHamster CDN access
+            # xHamster CDN requires proper Referer header
+            session.headers["Referer"] = url_origin(self.url) + "/"
+            session.headers["Origin"] = url_origin(self.url)
+            logger.info("Updated session headers for xHamster CDN access")
+        return {"session": session, "ffmpeg_headers": ffmpeg_headers}
+
     def _get_video_id(self) -> str:
         """Extract video ID from URL for caching purposes"""
         match = re.search(r'xhamster\.com/videos/([^/]+)-(\d+)', self.url)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# Copyright (C) 2018-2026 by dream-alpha
+# License: GNU General Public License v3.0 (see LICENSE file for details)
+
+"""
+xHamster Thumb Parser
+
+This module contains the single-pass extractor for xHamster listing pages:
+- One regex scan finds the start tags of the thumb items (thumb-list__item,
+  video-thumb or thumb-list-item class); the page chrome, inline state
+  scripts included, is never looked at again
+- Each item spans from its start tag to the next one, so the title link
+  and the duration box after the first </div> belong to it
+- url, title, thumbnail and duration are searched inside that span only,
+  each pattern runs once per item and can't backtrack into the rest of
+  the page
+
+Only the standard library is used, filtering (duplicates, previews, short
+videos) stays with the video manager.
+"""
+
+from __future__ import annotations
+
+import re
+from html import unescape
+
+# Start tag of a thumb item; the class must hold one of the item classes as a whole
+# word, so the image and info boxes inside an item (video-thumb__image-container,
+# video-thumb-info) and the list wrapper (thumb-list) never start an item
+ITEM_START_PATTERN = re.compile(
+    r'<(?:div|article)\s[^>]*?class=["\'](?:[^"\']*\s)?(?:thumb-list__item|video-thumb|thumb-list-item)[\s"\']',
+    re.IGNORECASE
+)
+# Characters searched after the start tag of the last item on the page
+MAX_ITEM_LENGTH = 8192
+
+# First link to a video page: the image link or the title link of the item
+URL_PATTERN = re.compile(r'\shref=["\']([^"\'\s]*/videos/[^"\'\s]+)["\']', re.IGNORECASE)
+# Title sources in order of preference, shorter values ("Video", "HD") are not titles
+TITLE_PATTERNS = (
+    re.compile(r'\stitle=["\']([^"\']{6,})["\']', re.IGNORECASE),
+    re.compile(r'\salt=["\']([^"\']{6,})["\']', re.IGNORECASE),
+    re.compile(r'\sdata-title=["\']([^"\']{6,})["\']', re.IGNORECASE),
+)
+# Thumbnail in src or, for lazy-loaded images, data-src, whichever comes first in the item
+THUMBNAIL_PATTERN = re.compile(r'\s(?:data-src|src)=["\'](https?://[^"\'\s]+\.(?:jpe?g|png|webp)[^"\'\s]*)["\']', re.IGNORECASE)
+# Duration box text, possibly wrapped in inner elements, or a data-duration attribute
+DURATION_PATTERN = re.compile(r'duration[^>]*>(?:\s*<[^>/]*>)*\s*(\d+:[\d:]+)|\sdata-duration=["\']([^"\']+)["\']', re.IGNORECASE)
+
+
+def _title(html: str, start: int, end: int) -> str:
+    for pattern in TITLE_PATTERNS:
+        match = pattern.search(html, start, end)
+        if match:
+            return unescape(match.group(1)).strip()
+    return ""
+
+
+def parse_thumbs(html: str) -> list[dict[str, str]]:
+    """
+    Extract the thumb items of an xHamster listing page
+
+    Args:
+        html: Listing page HTML
+
+    Returns:
+        list: Items with url, title, thumbnail and duration in page order
+    """
+    starts = [match.start() for match in ITEM_START_PATTERN.finditer(html)]
+    ends = starts[1:] + [min(starts[-1] + MAX_ITEM_LENGTH, len(html))] if starts else []
+
+    items = []
+    for start, end in zip(starts, ends):
+        url = URL_PATTERN.search(html, start, end)
+        if not url:
+            continue
+        thumbnail = THUMBNAIL_PATTERN.search(html, start, end)
+        duration = DURATION_PATTERN.search(html, start, end)
+        items.append({
+            "url": unescape(url.group(1)),
+            "title": _title(html, start, end),
+            "thumbnail": unescape(thumbnail.group(1)) if thumbnail else "",
+            "duration": (duration.group(1) or duration.group(2).strip()) if duration else "",
+        })
+    return items
@@ -13,14 +13,23 @@ from __future__ import annotations
 
 import re
 import html as html_parser
-from typing import Any
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator
+from urllib.parse import urljoin, quote_plus
 from debug import get_logger
 from string_utils import clean_text, sanitize_for_json
 from constants import PAGE_ENTRIES, MAX_VIDEOS
+from ..area51.listing import sort_media_items
+from ..area51.dedup import dedup_keys
+from ..area51.metrics import span
+from ..area51.pagination import parse_pagination, page_number_parser
+from .thumbs import parse_thumbs
 
 logger = get_logger(__file__)
 
+# Upper bound for listing pages fetched at the same time per category
+MAX_PAGE_WORKERS = 4
+
 
 class Video:
     """Handles xHamster video processing and extraction"""
@@ -30,55 +39,32 @@ class Video:
         self.provider = provider
 
     def get_media_items(self, category: dict, page: int = 1, limit: int = PAGE_ENTRIES) -> list[dict[str, Any]]:
-        """Get videos from specific category on xHamster - optimized for performance"""
+        """Get videos from specific category on xHamster sorted alphabetically by title"""
+        return sort_media_items(self.iter_media_items(category, page, limit))
+
+    def iter_media_items(self, category: dict, page: int = 1, limit: int = PAGE_ENTRIES) -> Iterator[list[dict[str, Any]]]:
+        """Yield batches of videos from specific category on xHamster as soon as each page is parsed"""
         category_url = category.get("url", "none")
         try:
             logger.info("Fetching videos from category: %s", category_url)
 
-            # Fetch videos until we run out OR reach MAX_VIDEOS limit
-            all_videos = []
-            current_page = page
-
-            while len(all_videos) < MAX_VIDEOS:
-                url = f"{category_url}/{current_page}"
-                site_result = self._get_video_list(url, current_page, PAGE_ENTRIES)  # Always fetch full page
-                site_videos = site_result.get("videos", []) if site_result else []
-
-                if not site_videos:
-                    logger.info("No more videos found on page %d, stopping", current_page)
-                    break
-
-                all_videos.extend(site_videos)
-                logger.info("Page %d: Found %d videos, total so far: %d", current_page, len(site_videos), len(all_videos))
-
-                # Check if page indicates no more pages available
-                if not site_result.get("has_next_page", True):
-                    logger.info("No more pages available, stopping")
-                    break
-
-                current_page += 1
-
-            if all_videos:
-                # Cap at MAX_VIDEOS but don't force it - return what we actually found
-                final_count = min(len(all_videos), MAX_VIDEOS)
-                all_videos = all_videos[:final_count]
-
-                logger.info("Found %d total videos from %d pages (capped at MAX_VIDEOS=%d)",
-                            len(all_videos), current_page - page, MAX_VIDEOS)
-
+            # Fetch pages in parallel until we run out OR reach MAX_VIDEOS limit
+            category_name = self.provider.category_manager.extract_category_from_url(category_url)
+            total_videos = 0
+            for site_videos in self._iter_pages(category_url, page):
                 # Return site data with enhanced structure (no resolution yet)
                 enhanced_videos = []
-                category_name = self.provider.category_manager.extract_category_from_url(category_url)
-                for video in all_videos:
+                for video in site_videos:
                     enhanced_video = self._create_enhanced_video(video, category_name)
-                    logger.info("Prepared video: %s", enhanced_video)
+                    logger.debug("Prepared video: %s", enhanced_video)
                     enhanced_videos.append(enhanced_video)
 
-                # Sort videos alphabetically by title
-                enhanced_videos.sort(key=lambda x: x['title'].lower())
+                total_videos += len(enhanced_videos)
+                yield enhanced_videos
 
-                logger.info("Performance Summary: %d videos prepared (no resolution performed)", len(enhanced_videos))
-                return enhanced_videos
+            if total_videos:
+                logger.info("Performance Summary: %d videos prepared (no resolution performed)", total_videos)
+                return
 
             logger.info("Site scraping returned: 0 videos")
             # Try direct scraping as fallback
@@ -86,16 +72,83 @@ class Video:
             direct_videos = self._scrape_category_direct_optimized(category_url, limit)
             if direct_videos:
                 logger.info("Direct scraping returned: %d videos", len(direct_videos))
-                # Sort videos alphabetically by title
-                direct_videos.sort(key=lambda x: x['title'].lower())
-                return direct_videos
+                yield direct_videos
+                return
 
             logger.info("All scraping methods failed - no videos available")
-            return []
 
         except Exception as e:
             logger.info("Error getting xHamster videos: %s", e)
-            return []
+
+    def search(self, query: str, page: int = 1, limit: int = PAGE_ENTRIES) -> list[dict[str, Any]]:
+        """Search videos on xHamster, returns one result page in the site's rank order"""
+        search_url = f"{self.provider.base_url}search/{quote_plus(query.strip())}"
+        page_url = search_url if page <= 1 else f"{search_url}?page={page}"
+        result = self._get_video_list(page_url, page, PAGE_ENTRIES, search_url, query_param="page")
+        return [self._create_enhanced_video(video, "Search") for video in result.get("videos", [])[:limit]]
+
+    def _iter_pages(self, category_url: str, first_page: int) -> Iterator[list[dict[str, Any]]]:
+        """Fetch the first page, then the following ones with a bounded worker pool, and yield new videos per page in page order"""
+        seen_video_ids = set()  # Track dedup keys across pages, neighbouring pages may overlap
+        total_videos = 0
+        pages_fetched = 0
+
+        def fetch(page_number: int) -> dict[str, Any]:
+            return self._get_video_list(f"{category_url}/{page_number}", page_number, PAGE_ENTRIES, category_url)  # Always fetch full page
+
+        executor = ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS)
+        try:
+            # The first page tells how many pages there are
+            batch = [first_page]
+            results = iter([fetch(first_page)])
+            while True:
+                for page_number, site_result in zip(batch, results):
+                    site_videos = site_result.get("videos", []) if site_result else []
+
+                    if not site_videos:
+                        logger.info("No more videos found on page %d, stopping", page_number)
+                        return
+
+                    pages_fetched += 1
+                    new_videos = []
+                    for video in site_videos:
+                        # Video ID, slug independent, and thumbnail stem: the same video may be listed under another slug
+                        keys = dedup_keys(video)
+                        if seen_video_ids.intersection(keys):
+                            logger.debug("Skipping video already listed on an earlier page: %s", video.get("url", ""))
+                            continue
+                        seen_video_ids.update(keys)
+                        new_videos.append(video)
+
+                    # Cap at MAX_VIDEOS but don't force it - return what we actually found
+                    new_videos = new_videos[:MAX_VIDEOS - total_videos]
+                    total_videos += len(new_videos)
+                    pagination = site_result["pagination"]
+                    logger.info("Page %d of %s: Found %d videos, total so far: %d",
+                                page_number, pagination.total_pages or "?", len(site_videos), total_videos)
+                    if new_videos:
+                        yield new_videos
+
+                    # Check if page indicates no more pages available
+                    if not pagination.has_next:
+                        logger.info("No more pages available, stopping")
+                        return
+                    if total_videos >= MAX_VIDEOS:
+                        return
+
+                # Only request as many pages as are still needed to reach MAX_VIDEOS, and never past the last page
+                current_page = batch[-1] + 1
+                pages_needed = -(-(MAX_VIDEOS - total_videos) // PAGE_ENTRIES)
+                end_page = current_page + min(pages_needed, MAX_PAGE_WORKERS)
+                if pagination.total_pages:
+                    end_page = max(min(end_page, pagination.total_pages + 1), current_page + 1)
+                batch = list(range(current_page, end_page))
+                results = executor.map(fetch, batch)
+        finally:
+            logger.info("Found %d total videos from %d pages (capped at MAX_VIDEOS=%d)",
+                        total_videos, pages_fetched, MAX_VIDEOS)
+            # Don't block on pages that are no longer needed
+            executor.shutdown(wait=False)
 
     def _create_enhanced_video(self, video: dict[str, Any], _category: str = "Unknown") -> dict[str, Any]:
         """Create standardized enhanced video structure from raw video data"""
@@ -147,17 +200,22 @@ class Video:
             logger.info("Error getting xHamster videos from %s: %s", url, e)
             return []
 
-    def _get_video_list(self, url: str, page: int, _limit: int = PAGE_ENTRIES) -> dict[str, Any]:
-        """Parse video list from xHamster page with enhanced title extraction"""
+    def _get_video_list(self, url: str, page: int, _limit: int = PAGE_ENTRIES, category_url: str | None = None,
+                        query_param: str | None = None) -> dict[str, Any]:
+        """Parse video list from xHamster page with enhanced title extraction, category_url is the URL of page 1, query_param the page number parameter of its pager (None: path segment)"""
         try:
             headers = self.provider.get_standard_headers("scraping")
 
+            labels = {"provider": self.provider.provider_id, "call": "listing"}
+
             logger.info("Fetching URL: %s", url)
-            response = self.provider.session.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
+            with span("fetch", **labels):
+                response = self.provider.session.get(url, headers=headers, timeout=30)
+                response.raise_for_status()
 
             # Get properly decoded text
-            html = self.provider.get_response_text(response)
+            with span("decode", **labels):
+                html = self.provider.get_response_text(response)
 
             logger.info("Received %d bytes of HTML", len(html))
 
@@ -169,160 +227,81 @@ class Video:
             seen_urls = set()  # Track URLs to avoid duplicates
             seen_video_ids = set()  # Track video IDs to catch same video with different URLs
 
-            # xHamster video patterns - updated for current structure
-            video_patterns = [
-                r'<div[^>]*class="[^"]*thumb-list__item[^"]*"[^>]*>(.*?)</div>',
-                r'<div[^>]*class="[^"]*thumb[^"]*"[^>]*>(.*?)</div>',
-                r'<article[^>]*class="[^"]*thumb[^"]*"[^>]*>(.*?)</article>',
-                r'<div[^>]*class="[^"]*video-thumb[^"]*"[^>]*>(.*?)</div>',
-                r'<div[^>]*class="[^"]*thumb-list-item[^"]*"[^>]*>(.*?)</div>',
-            ]
-
-            for i, pattern in enumerate(video_patterns):
-                video_matches = list(re.finditer(pattern, html, re.DOTALL | re.IGNORECASE))
-                logger.info("Pattern %d matched %d elements", i, len(video_matches))
-
-                for match in video_matches:
-                    video_html = match.group(1)
-
-                    # Extract video URL - improved patterns
-                    video_url_match = re.search(
-                        r'<a[^>]*href=[\'"]((?:https?://)?[^\'"\s]*(?:xhamster\.com)?[^\'"\s]*/videos/[^\'"\s]+)[\'"][^>]*>',
-                        video_html, re.IGNORECASE
-                    )
-
-                    # Fallback patterns if main pattern fails
-                    if not video_url_match:
-                        fallback_patterns = [
-                            r'href=[\'"](/videos/[^\'"\s]+)[\'"]',
-                            r'href=[\'"](https?://[^\'"\s]*xhamster[^\'"\s]*/videos/[^\'"\s]+)[\'"]',
-                            r'data-video-url=[\'"](.*?)[\'"]',
-                        ]
-                        for fallback_pattern in fallback_patterns:
-                            video_url_match = re.search(fallback_pattern, video_html, re.IGNORECASE)
-                            if video_url_match:
-                                break
-
-                    # Enhanced title extraction - multiple patterns for better accuracy
-                    title = "Unknown Video"
-                    title_patterns = [
-                        # Title attribute (most reliable)
-                        r'title=[\'"](.*?)[\'"]',
-                        # Alt attribute on images
-                        r'alt=[\'"](.*?)[\'"]',
-                        # Link text content
-                        r'<a[^>]*>[^<]*<[^>]*>[^<]*</[^>]*>([^<]+)</a>',
-                        r'<a[^>]*>([^<]+)</a>',
-                        # Span or div with title/video text
-                        r'<(?:span|div)[^>]*(?:class="[^"]*title[^"]*"|title)[^>]*>([^<]+)</(?:span|div)>',
-                        # Video title in data attributes
-                        r'data-title=[\'"](.*?)[\'"]',
-                    ]
-
-                    for title_pattern in title_patterns:
-                        title_match = re.search(title_pattern, video_html, re.IGNORECASE)
-                        if title_match:
-                            raw_title = title_match.group(1).strip()
-                            try:
-                                potential_title = html_parser.unescape(raw_title)
-                            except (AttributeError, TypeError):
-                                potential_title = raw_title
-                            # Skip very short or generic titles
-                            if len(potential_title) > 5 and potential_title.lower() not in ['video', 'watch', 'click']:
-                                title = potential_title
-                                break
-
-                    # Extract thumbnail
-                    img_match = re.search(
-                        r'(?:data-src|src)=[\'"](https?://[^\'"\s]+\.(?:jpg|jpeg|png|webp)[^\'"\s]*)[\'"]',
-                        video_html, re.IGNORECASE
-                    )
-
-                    # Extract duration with better patterns
-                    duration = ""
-                    duration_patterns = [
-                        r'(?:duration[\'"][^>]*>|<span[^>]*duration[^>]*>)([0-9:]+)',
-                        r'<(?:span|div)[^>]*class="[^"]*duration[^"]*"[^>]*>([0-9:]+)',
-                        r'data-duration=[\'"](.*?)[\'"]',
-                        r'([0-9]+:[0-9:]+)',  # Generic time format
-                    ]
-
-                    for duration_pattern in duration_patterns:
-                        duration_match = re.search(duration_pattern, video_html, re.IGNORECASE)
-                        if duration_match:
-                            duration = duration_match.group(1).strip()
-                            break
+            # One pass over the page collects url, title, thumbnail and duration of every thumb container
+            with span("extract", **labels):
+                thumbs = parse_thumbs(html)
+            logger.info("Found %d thumb containers", len(thumbs))
 
-                    if video_url_match:
-                        video_url = video_url_match.group(1)
-                        if not video_url.startswith("http"):
-                            video_url = urljoin(self.provider.base_url, video_url)
+            for item in thumbs:
+                title = item["title"] or "Unknown Video"
+                duration = item["duration"]
 
-                        # Extract video ID to detect true duplicates (same video, different URL)
-                        video_id = self.provider.extract_video_id(video_url)
+                video_url = item["url"]
+                if not video_url.startswith("http"):
+                    video_url = urljoin(self.provider.base_url, video_url)
 
-                        # Skip if we've already seen this URL or video ID
-                        if video_url in seen_urls or video_id in seen_video_ids:
-                            logger.debug("Skipping duplicate video: %s (ID: %s)", video_url, video_id)
-                            continue
-                        seen_urls.add(video_url)
-                        seen_video_ids.add(video_id)
-
-                        # Clean and validate title
-                        title = clean_text(title)
-                        if not title or title.lower() in {'unknown video', 'video', 'untitled'}:
-                            # Generate title from URL if needed
-                            title = f"xHamster Video {self.provider.extract_video_id(video_url)[:8]}"
-
-                        # Skip preview/trailer videos
-                        skip_keywords = ['preview', 'trailer', 'sample', 'promo', 'teaser', 'clip']
-                        video_url_lower = video_url.lower()
-                        title_lower = title.lower()
-
-                        if any(keyword in video_url_lower for keyword in skip_keywords):
-                            logger.info("Skipping preview/trailer URL: %s", video_url)
-                            continue
+                # Extract video ID to detect true duplicates (same video, different URL)
+                video_id = self.provider.extract_video_id(video_url)
 
-                        if any(keyword in title_lower for keyword in skip_keywords):
-                            logger.info("Skipping preview/trailer by title: %s", title)
-                            continue
+                # Skip if we've already seen this URL or video ID
+                if video_url in seen_urls or video_id in seen_video_ids:
+                    logger.debug("Skipping duplicate video: %s (ID: %s)", video_url, video_id)
+                    continue
+                seen_urls.add(video_url)
+                seen_video_ids.add(video_id)
+
+                # Clean and validate title
+                title = clean_text(title)
+                if not title or title.lower() in {'unknown video', 'video', 'untitled'}:
+                    # Generate title from URL if needed
+                    title = f"xHamster Video {self.provider.extract_video_id(video_url)[:8]}"
+
+                # Skip preview/trailer videos
+                skip_keywords = ['preview', 'trailer', 'sample', 'promo', 'teaser', 'clip']
+                video_url_lower = video_url.lower()
+                title_lower = title.lower()
+
+                if any(keyword in video_url_lower for keyword in skip_keywords):
+                    logger.info("Skipping preview/trailer URL: %s", video_url)
+                    continue
 
-                        # Skip videos with very short durations (< 2 minutes)
-                        if duration:
-                            duration_parts = duration.split(':')
-                            try:
-                                if len(duration_parts) == 2:  # MM:SS format
-                                    minutes = int(duration_parts[0])
-                                    if minutes < 2:
-                                        logger.info("Skipping short video (< 2 min): %s - %s", title, duration)
-                                        continue
-                                elif len(duration_parts) == 3:  # HH:MM:SS format
-                                    hours = int(duration_parts[0])
-                                    if hours == 0:
-                                        minutes = int(duration_parts[1])
-                                        if minutes < 2:
-                                            logger.info("Skipping short video (< 2 min): %s - %s", title, duration)
-                                            continue
-                            except (ValueError, IndexError):
-                                pass
-
-                        # Sanitize data to prevent JSON issues
-                        clean_title = sanitize_for_json(title)
-                        clean_url = video_url.strip()
-                        clean_thumbnail = (img_match.group(1) if img_match else "").strip()
-                        clean_duration = duration.strip()
-
-                        video_data = {
-                            "title": clean_title,
-                            "duration": clean_duration,
-                            "url": clean_url,
-                            "thumbnail": clean_thumbnail,
-                        }
-                        videos.append(video_data)
-                        logger.debug("Added video %d: %s - %s", len(videos), clean_title[:50], video_id)
-
-                if videos:  # If we found videos with this pattern, stop trying others
-                    break
+                if any(keyword in title_lower for keyword in skip_keywords):
+                    logger.info("Skipping preview/trailer by title: %s", title)
+                    continue
+
+                # Skip videos with very short durations (< 2 minutes)
+                if duration:
+                    duration_parts = duration.split(':')
+                    try:
+                        if len(duration_parts) == 2:  # MM:SS format
+                            minutes = int(duration_parts[0])
+                            if minutes < 2:
+                                logger.info("Skipping short video (< 2 min): %s - %s", title, duration)
+                                continue
+                        elif len(duration_parts) == 3:  # HH:MM:SS format
+                            hours = int(duration_parts[0])
+                            if hours == 0:
+                                minutes = int(duration_parts[1])
+                                if minutes < 2:
+                                    logger.info("Skipping short video (< 2 min): %s - %s", title, duration)
+                                    continue
+                    except (ValueError, IndexError):
+                        pass
+
+                # Sanitize data to prevent JSON issues
+                clean_title = sanitize_for_json(title)
+                clean_url = video_url.strip()
+                clean_thumbnail = item["thumbnail"].strip()
+                clean_duration = duration.strip()
+
+                video_data = {
+                    "title": clean_title,
+                    "duration": clean_duration,
+                    "url": clean_url,
+                    "thumbnail": clean_thumbnail,
+                }
+                videos.append(video_data)
+                logger.debug("Added video %d: %s - %s", len(videos), clean_title[:50], video_id)
 
             logger.info("Found %d videos after filtering (before limit)", len(videos))
             logger.info("Unique video IDs found: %d", len(seen_video_ids))
@@ -331,13 +310,14 @@ class Video:
                             videos[0]['url'][-30:] if videos[0]['url'] else 'None',
                             videos[-1]['url'][-30:] if videos[-1]['url'] else 'None')
 
-            # Check for next page
-            has_next = bool(re.search(r'(?:next|>)[\'"][^>]*>', html, re.IGNORECASE))
+            # Read the pager: xHamster numbers category pages as {category_url}/{page}, search pages as ?page={page}
+            pagination = parse_pagination(html, url, page, page_number_parser(category_url or url, query_param=query_param))
 
             return {
                 "videos": videos,  # Return all videos without limiting
                 "page": page,
-                "has_next_page": has_next,
+                "has_next_page": pagination.has_next,
+                "pagination": pagination,
                 "total_results": len(videos),
             }
 
@@ -356,9 +336,13 @@ class Video:
         try:
             headers = self.provider.get_standard_headers("scraping")
 
-            response = self.provider.session.get(category_url, headers=headers, timeout=15)
-            response.raise_for_status()
-            html = response.text
+            labels = {"provider": self.provider.provider_id, "call": "listing"}
+
+            with span("fetch", **labels):
+                response = self.provider.session.get(category_url, headers=headers, timeout=15)
+                response.raise_for_status()
+            with span("decode", **labels):
+                html = response.text
 
             # Extract video data with titles (improved extraction)
             video_data_list = []
@@ -378,7 +362,7 @@ class Video:
 
                 video_url = url_match.group(1)
                 if not video_url.startswith('http'):
-                    video_url = f"https://xhamster.com{video_url}"
+                    video_url = urljoin(self.provider.base_url, video_url)
 
                 # Extract title - try multiple patterns
                 title = ""
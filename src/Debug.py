@@ -18,30 +18,164 @@
 # <http://www.gnu.org/licenses/>.
 
 
+import io
 import sys
+import time
+import atexit
 import logging
+import threading
+from collections import deque
+try:
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+except ImportError:  # Python 2: no QueueHandler, records are written synchronously
+    queue = QueueHandler = QueueListener = None
 from Components.config import config, ConfigSubsection, ConfigDirectory, ConfigSelection  # noqa: F401, pylint: disable=W0611
 from .Version import ID, PLUGIN
 
 
 logger = None
 streamer = None
+ring_buffer = None
+listener = None
 format_string = ID + ": " + "%(levelname)s: %(filename)s: %(funcName)s: %(message)s"
 log_levels = {"ERROR": logging.ERROR, "INFO": logging.INFO, "DEBUG": logging.DEBUG}
 plugin = PLUGIN.lower()
 exec("config.plugins." + plugin + " = ConfigSubsection()")  # noqa: F401, pylint: disable=W0122
 exec("config.plugins." + plugin + ".debug_log_level = ConfigSelection(default='INFO', choices=log_levels.keys())")  # noqa: F401, pylint: disable=W0122
 
+# records waiting for the listener thread, further records are dropped
+QUEUE_SIZE = 1000
+# recent records kept in memory for dumpLogBuffer()
+RING_BUFFER_SIZE = 2000
+# repeats of the same message passed per window, the rest is counted and reported once
+RATE_LIMIT_BURST = 5
+RATE_LIMIT_WINDOW = 10.0
+# messages tracked by the rate limit, beyond that all are reported and forgotten
+RATE_LIMIT_KEYS = 1000
+monotonic = getattr(time, "monotonic", time.time)
+
+
+if QueueHandler:
+    class DroppingQueueHandler(QueueHandler):
+        """QueueHandler that drops records instead of blocking when the queue is full"""
+
+        def __init__(self, log_queue):
+            QueueHandler.__init__(self, log_queue)
+            self.dropped = 0
+
+        def enqueue(self, record):
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the most recent formatted records in memory"""
+
+    def __init__(self, size):
+        logging.Handler.__init__(self)
+        self.records = deque(maxlen=size)
+
+    def emit(self, record):
+        self.records.append(self.format(record))
+
+
+class RateLimitFilter(logging.Filter):
+    """Passes RATE_LIMIT_BURST repeats of a message per RATE_LIMIT_WINDOW seconds
+
+    Suppressed repeats are reported on the next repeat of the message, or in one
+    summary record to handler when the message stays silent and its entry expires.
+    """
+
+    def __init__(self, handler=None, burst=RATE_LIMIT_BURST, window=RATE_LIMIT_WINDOW):
+        logging.Filter.__init__(self)
+        self.handler = handler
+        self.burst = burst
+        self.window = window
+        self.lock = threading.Lock()
+        self.messages = {}  # (pathname, lineno, message with its arguments) -> [window start, count]
+        self.expired = monotonic()  # last expiry of the messages
+
+    def filter(self, record):
+        key = (record.pathname, record.lineno, record.getMessage())
+        now = monotonic()
+        with self.lock:
+            expired = []
+            if now - self.expired >= self.window or len(self.messages) >= RATE_LIMIT_KEYS:
+                expired = self.expire(now, key)
+            entry = self.messages.get(key)
+            if entry is None or now - entry[0] >= self.window:
+                suppressed = entry[1] - self.burst if entry else 0
+                self.messages[key] = [now, 1]
+                if suppressed > 0:
+                    record.msg = str(record.msg) + " (%d repeats suppressed)" % suppressed
+                passed = True
+            else:
+                entry[1] += 1
+                passed = entry[1] <= self.burst
+        if expired:
+            self.report(expired, record)
+        return passed
+
+    def expire(self, now, current):
+        # removes the messages whose window has passed, all others but current at RATE_LIMIT_KEYS
+        self.expired = now
+        keys = [key for key, entry in self.messages.items() if now - entry[0] >= self.window and key != current]
+        if len(self.messages) - len(keys) >= RATE_LIMIT_KEYS:
+            keys = [key for key in self.messages if key != current]
+        expired = []
+        for key in keys:
+            suppressed = self.messages.pop(key)[1] - self.burst
+            if suppressed > 0:
+                expired.append((suppressed, key))
+        return expired
+
+    def report(self, expired, record):
+        # one record for all suppressed repeats, written past the filters of the handler
+        if self.handler is None:
+            return
+        repeats = sum(suppressed for suppressed, _key in expired)
+        _suppressed, (pathname, lineno, message) = max(expired)
+        summary = logging.LogRecord(
+            record.name, logging.WARNING, pathname, lineno,
+            "%d repeats of %d messages suppressed, most often: %s", (repeats, len(expired), message), None, "filter"
+        )
+        summary.msg = summary.getMessage()
+        summary.args = None
+        self.handler.acquire()
+        try:
+            self.handler.emit(summary)
+        finally:
+            self.handler.release()
+
 
 def initLogging():
     global logger
     global streamer
+    global ring_buffer
+    global listener
     if not logger:
         logger = logging.getLogger(ID)
         formatter = logging.Formatter(format_string)
         streamer = logging.StreamHandler(sys.stdout)
         streamer.setFormatter(formatter)
-        logger.addHandler(streamer)
+        # only stdout is rate limited, the ring buffer keeps every record for dumpLogBuffer()
+        streamer.addFilter(RateLimitFilter(streamer))
+        ring_buffer = RingBufferHandler(RING_BUFFER_SIZE)
+        ring_buffer.setFormatter(formatter)
+        # the ring buffer comes first: it has formatted a record before the rate limit may annotate it
+        if QueueHandler:
+            # stdout is written by the listener thread, logging callers only enqueue
+            log_queue = queue.Queue(QUEUE_SIZE)
+            listener = QueueListener(log_queue, ring_buffer, streamer, respect_handler_level=True)
+            listener.start()
+            atexit.register(listener.stop)
+            logger.addHandler(DroppingQueueHandler(log_queue))
+        else:
+            logger.addHandler(ring_buffer)
+            logger.addHandler(streamer)
         logger.propagate = False
         setLogLevel(log_levels[eval("config.plugins." + plugin + ".debug_log_level").value])
 
@@ -50,3 +184,18 @@ def setLogLevel(level):
     logger.setLevel(level)
     streamer.setLevel(level)
     logger.info("level: %s", level)
+
+
+def dumpLogBuffer(path=None):
+    lines = list(ring_buffer.records) if ring_buffer else []
+    dropped = sum(getattr(handler, "dropped", 0) for handler in logger.handlers) if logger else 0
+    if dropped:
+        lines.append("%s: WARNING: %d records dropped, log queue was full" % (ID, dropped))
+    if path:
+        text = "\n".join(lines) + "\n"
+        if isinstance(text, bytes):  # Python 2: records are byte strings
+            text = text.decode("utf-8", "replace")
+        with io.open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        logger.info("dumped %d log lines to %s", len(lines), path)
+    return lines